@@ -0,0 +1,237 @@
+# The Blender frontend's connection to the backend's flow runner.
+# Blender runs operators, panels and timers on its single UI thread, so a
+# flow call must never block there: FlowClient.call() only queues the call.
+# A background thread sends it over one persistent keep-alive connection,
+# and the result comes back through a queue that a bpy timer drains on the
+# UI thread, which is the only place a callback may touch the scene.
+
+import http.client
+import json
+import queue
+import select
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+FLOW_ENDPOINT = "/___flow___"
+
+# How often the bpy timer drains finished calls (seconds).
+POLL_INTERVAL = 0.05
+
+# Errors that mean an idle keep-alive socket was closed by the server.
+_STALE_CONNECTION_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+
+def _dropped(sock) -> bool:
+    """True if the server closed an idle connection: nothing else should arrive on it between calls."""
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class FlowError(Exception):
+    """A flow call the backend answered with an error status, or could not be reached for."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class FlowResult:
+    __slots__ = ("flow_action", "status", "body")
+
+    def __init__(self, flow_action: str, status: int, body: str):
+        self.flow_action = flow_action
+        self.status = status
+        self.body = body  # The flow's response (an HTML fragment for most flows)
+
+    def __repr__(self) -> str:
+        return f"FlowResult({self.flow_action!r}, {self.status})"
+
+
+class _PendingCall:
+    __slots__ = ("flow_action", "params", "callbacks")
+
+    def __init__(self, flow_action: str, params: dict, callback):
+        self.flow_action = flow_action
+        self.params = params
+        self.callbacks = [callback] if callback is not None else []
+
+
+class FlowClient:
+    """
+    Runs flow calls off Blender's UI thread.
+
+    Calls are sent one at a time, in order, by a single worker thread over
+    one keep-alive connection (reopened once if the server dropped it while
+    idle). A call identical to one that is still waiting to be sent (same
+    action, same params) is not queued again: it joins the waiting call and
+    its callback receives the same result. Five rapid clicks on a button
+    send one request while the previous one is in flight.
+
+    Callbacks run as `callback(result, error)` from `drain()`, on the thread
+    that calls it. Call `register_timer()` once inside Blender to drain from
+    a bpy timer.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: float = 10.0, headers: dict | None = None):
+        parts = urlsplit(base_url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._https = parts.scheme == "https"
+        self._path = parts.path.rstrip("/") + FLOW_ENDPOINT
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+        self._pending: OrderedDict[str, _PendingCall] = OrderedDict()  # coalescing key -> call
+        self._wakeup = threading.Condition()
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._conn: http.client.HTTPConnection | None = None  # Only used by the worker
+        self._closed = False
+        self._timer = None
+        self.sent = 0
+        self.coalesced = 0
+        self._worker = threading.Thread(target=self._run, name="flow-client", daemon=True)
+        self._worker.start()
+
+    # --- UI thread ---
+
+    def call(self, flow_action: str, params: dict | None = None, callback=None) -> None:
+        """Queues a flow call ("fleet.vehicles.create") and returns immediately."""
+        params = params or {}
+        key = f"{flow_action}|{json.dumps(params, sort_keys=True, default=str)}"
+        with self._wakeup:
+            if self._closed:
+                raise FlowError("FlowClient is closed")
+            pending = self._pending.get(key)
+            if pending is not None:
+                if callback is not None:
+                    pending.callbacks.append(callback)
+                self.coalesced += 1
+                return
+            self._pending[key] = _PendingCall(flow_action, params, callback)
+            self._wakeup.notify()
+
+    def drain(self, limit: int | None = None) -> int:
+        """Runs the callbacks of finished calls; returns how many calls were handled."""
+        handled = 0
+        while limit is None or handled < limit:
+            try:
+                call, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            for callback in call.callbacks:
+                try:
+                    callback(result, error)
+                except Exception as e:  # A broken callback must not stop the timer
+                    print(f"FlowClient: callback for {call.flow_action} failed: {e}")
+        return handled
+
+    def register_timer(self, bpy_module, interval: float = POLL_INTERVAL) -> None:
+        """Drains from a bpy.app.timers callback every `interval` seconds."""
+        def tick():
+            self.drain()
+            return None if self._closed else interval
+
+        self._timer = tick
+        bpy_module.app.timers.register(tick, first_interval=interval, persistent=True)
+
+    def unregister_timer(self, bpy_module) -> None:
+        if self._timer is not None and bpy_module.app.timers.is_registered(self._timer):
+            bpy_module.app.timers.unregister(self._timer)
+        self._timer = None
+
+    def close(self) -> None:
+        """Stops the worker after the call in flight; calls still waiting are dropped."""
+        with self._wakeup:
+            self._closed = True
+            self._pending.clear()
+            self._wakeup.notify()
+        self._worker.join(self.timeout)
+
+    # --- Worker thread ---
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    break
+                _, call = self._pending.popitem(last=False)
+            try:
+                result, error = self._send(call), None
+            except FlowError as e:
+                result, error = None, e
+            self._results.put((call, result, error))
+        if self._conn is not None:
+            self._conn.close()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._conn = conn_cls(self._host, self._port, timeout=self.timeout)
+        return self._conn
+
+    def _send(self, call: _PendingCall) -> FlowResult:
+        body = json.dumps({"flow": call.flow_action, "params": call.params}, default=str).encode()
+        for attempt in range(2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            if reused and _dropped(conn.sock):
+                # Closed by the server while idle: reopen before sending anything.
+                self._reset_connection()
+                conn, reused = self._connection(), False
+            try:
+                conn.request("POST", self._path, body=body, headers=self.headers)
+            except _STALE_CONNECTION_ERRORS as e:
+                self._reset_connection()
+                # The server closed the idle connection before taking the request,
+                # so it cannot have run the flow: retry once on a fresh connection.
+                if reused and not attempt:
+                    continue
+                raise FlowError(f"Connection to the backend lost: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                self._reset_connection()
+                raise FlowError(f"Backend unreachable: {e}") from e
+            try:
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                # The request was sent and may have run: sending it again could
+                # run the flow twice.
+                self._reset_connection()
+                raise FlowError(f"Connection to the backend lost: {e}") from e
+            if response.will_close:
+                self._reset_connection()
+            self.sent += 1
+            text = data.decode("utf-8", "replace")
+            if not 200 <= response.status < 300:
+                raise FlowError(text, response.status)
+            return FlowResult(call.flow_action, response.status, text)
+
+    def _reset_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# One client per Blender session, shared by every operator.
+_client: FlowClient | None = None
+
+
+def get_client() -> FlowClient:
+    global _client
+    if _client is None:
+        _client = FlowClient()
+    return _client
+
+
+def shutdown_client() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -9,6 +9,12 @@ print("Initializing Blender Project Frontend Target...")
 # the renderer and the UI panels.
 # from .rendering import object_renderer
 # from .ui import scene_panel
+# from . import flow_client
 
 # scene_panel.register()
 # object_renderer.setup_scene()
+# flow_client.get_client().register_timer(bpy)  # Drains flow results on the UI thread
+#
+# On unregister:
+# flow_client.get_client().unregister_timer(bpy)
+# flow_client.shutdown_client()
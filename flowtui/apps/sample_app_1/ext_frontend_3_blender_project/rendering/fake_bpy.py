@@ -0,0 +1,150 @@
+# An in-memory stand-in for the parts of `bpy` ObjectRenderer and FlowClient
+# use. It lets them run outside Blender, e.g. to try a layout, time an update
+# or exercise flow calls against a local backend. It records what a real scene
+# would contain; nothing is drawn.
+
+
+class FakeObject:
+    def __init__(self, name: str, data=None):
+        self.name = name
+        self.data = data
+        self.location = (0.0, 0.0, 0.0)
+        self.scale = (1.0, 1.0, 1.0)
+        self._props: dict = {}
+
+    # Custom properties (obj["label"] = ...), like bpy ID blocks.
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __delitem__(self, key):
+        del self._props[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._props
+
+    def get(self, key, default=None):
+        return self._props.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"FakeObject({self.name!r})"
+
+
+class FakeMesh:
+    def __init__(self, name: str):
+        self.name = name
+        self.vertices: list = []
+        self.faces: list = []
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices = list(vertices)
+        self.faces = list(faces)
+
+    def update(self):
+        pass
+
+
+class _Collection:
+    """bpy.data.objects / bpy.data.meshes: a name-keyed collection."""
+
+    def __init__(self, factory, on_remove=None):
+        self._factory = factory
+        self._on_remove = on_remove
+        self._items: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __contains__(self, name) -> bool:
+        return name in self._items
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def new(self, name: str, *args):
+        # Blender renames on collision ("Cube.001"); do the same.
+        unique, n = name, 0
+        while unique in self._items:
+            n += 1
+            unique = f"{name}.{n:03d}"
+        item = self._factory(unique, *args)
+        self._items[unique] = item
+        return item
+
+    def remove(self, item, do_unlink: bool = True):
+        self._items.pop(item.name, None)
+        if do_unlink and self._on_remove is not None:
+            self._on_remove(item)
+
+
+class _SceneObjects:
+    """scene.collection.objects: link/unlink only."""
+
+    def __init__(self):
+        self._linked: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._linked)
+
+    def __iter__(self):
+        return iter(self._linked.values())
+
+    def link(self, obj):
+        self._linked[id(obj)] = obj
+
+    def unlink(self, obj):
+        self._linked.pop(id(obj), None)
+
+
+class _Timers:
+    """bpy.app.timers. Nothing fires on its own; call run_due() to advance."""
+
+    def __init__(self):
+        self._intervals: dict = {}  # function -> seconds until it is due
+
+    def register(self, function, first_interval: float = 0.0, persistent: bool = False):
+        self._intervals[function] = first_interval
+
+    def unregister(self, function):
+        del self._intervals[function]
+
+    def is_registered(self, function) -> bool:
+        return function in self._intervals
+
+    def run_due(self, elapsed: float) -> None:
+        """Runs every timer due within `elapsed` seconds, once, the way Blender would."""
+        for function, remaining in list(self._intervals.items()):
+            if remaining > elapsed:
+                self._intervals[function] = remaining - elapsed
+                continue
+            interval = function()
+            if interval is None:
+                self._intervals.pop(function, None)
+            else:
+                self._intervals[function] = interval
+
+
+class _Namespace:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class FakeBpy:
+    """
+    Exposes bpy.data.objects, bpy.data.meshes, bpy.context.scene.collection.objects
+    and bpy.app.timers.
+    """
+
+    def __init__(self):
+        scene_objects = _SceneObjects()
+        self.data = _Namespace(
+            objects=_Collection(FakeObject, on_remove=scene_objects.unlink),
+            meshes=_Collection(FakeMesh),
+        )
+        self.context = _Namespace(scene=_Namespace(collection=_Namespace(objects=scene_objects)))
+        self.app = _Namespace(timers=_Timers())
@@ -2,7 +2,21 @@
 # It contains the logic for taking data models (e.g., from a Flow)
 # and converting them into actual Blender objects (meshes, lights, etc.).
 
-# import bpy
+from .scene_reconciler import CREATE, DELETE, RELABEL, TRANSFORM, SceneReconciler
+
+# A cube like bpy.ops.mesh.primitive_cube_add() makes (size 2, centered).
+CUBE_VERTICES = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def _load_bpy():
+    try:
+        import bpy
+        return bpy
+    except ImportError:  # Outside Blender
+        from .fake_bpy import FakeBpy
+        return FakeBpy()
+
 
 class ObjectRenderer:
     """
@@ -10,6 +24,12 @@ class ObjectRenderer:
     This module is the only one that should perform `bpy` operations
     to manipulate scene objects.
     """
+    def __init__(self, bpy_module=None):
+        self.bpy = bpy_module or _load_bpy()
+        self.reconciler = SceneReconciler()
+        self._objects: dict = {}  # id_name -> Blender object
+        self._meshes: dict = {}   # element_type -> shared mesh
+
     def render_product(self, product_model):
         """
         Consumes a 'Product' data model and creates a corresponding
@@ -18,3 +38,69 @@ class ObjectRenderer:
         print(f"Rendering product: {product_model['name']}")
         # bpy.ops.mesh.primitive_cube_add(...)
         pass
+
+    def render_layout(self, elements) -> list:
+        """
+        Brings the scene in line with a list of UIElements (anything with
+        id_name, element_type, location, scale, label and flow_action).
+        Only the objects that changed since the last call are touched.
+        Returns the applied ops.
+        """
+        ops = self.reconciler.reconcile(elements)
+        for op in ops:
+            if op.kind == DELETE:
+                self._delete(op.id_name)
+            elif op.kind == CREATE:
+                self._create(op.element)
+            elif op.kind == TRANSFORM:
+                self._transform(self._objects[op.id_name], op.element)
+            elif op.kind == RELABEL:
+                self._relabel(self._objects[op.id_name], op.element)
+        return ops
+
+    def clear_layout(self) -> None:
+        """Removes every object render_layout() created."""
+        self.render_layout([])
+
+    # --- bpy operations ---
+    # bpy.data is used instead of bpy.ops: operators depend on the context
+    # (active object, mode) and refresh the view layer on every call, which
+    # makes creating many objects slow.
+
+    def _mesh_for(self, element_type: str):
+        mesh = self._meshes.get(element_type)
+        if mesh is None:
+            mesh = self.bpy.data.meshes.new(f"flow_{element_type}")
+            mesh.from_pydata(CUBE_VERTICES, [], CUBE_FACES)
+            mesh.update()
+            self._meshes[element_type] = mesh
+        return mesh
+
+    def _create(self, element) -> None:
+        objects = self.bpy.data.objects
+        existing = objects.get(element.id_name)
+        if existing is not None:
+            # Left over from an earlier session (e.g. a saved .blend file)
+            objects.remove(existing, do_unlink=True)
+        obj = objects.new(element.id_name, self._mesh_for(element.element_type))
+        self.bpy.context.scene.collection.objects.link(obj)
+        obj["element_type"] = element.element_type
+        self._transform(obj, element)
+        self._relabel(obj, element)
+        self._objects[element.id_name] = obj
+
+    def _transform(self, obj, element) -> None:
+        obj.location = element.location
+        obj.scale = element.scale
+
+    def _relabel(self, obj, element) -> None:
+        obj["label"] = element.label
+        if element.flow_action:
+            obj["flow_action"] = element.flow_action
+        elif "flow_action" in obj:
+            del obj["flow_action"]
+
+    def _delete(self, id_name: str) -> None:
+        obj = self._objects.pop(id_name, None)
+        if obj is not None:
+            self.bpy.data.objects.remove(obj, do_unlink=True)
@@ -0,0 +1,101 @@
+# Scene reconciliation: the Blender equivalent of a DOM diff.
+# A Flow returns the full list of UIElements the scene should contain. Instead
+# of recreating every object on each render, the reconciler compares that list
+# with what was applied last time (keyed by `id_name`) and emits the minimal
+# list of operations to get there. It never touches `bpy`; ObjectRenderer
+# applies the operations.
+
+CREATE = "create"        # New element: create the object, then set everything
+TRANSFORM = "transform"  # Location and/or scale changed
+RELABEL = "relabel"      # Label and/or flow_action changed (custom properties)
+DELETE = "delete"        # Element is gone (or changed type and is recreated)
+
+# Order the renderer applies a batch in: removals first, so a recreated
+# element's name is free again before its replacement is created.
+APPLY_ORDER = (DELETE, CREATE, TRANSFORM, RELABEL)
+
+
+class SceneOp:
+    __slots__ = ("kind", "id_name", "element")
+
+    def __init__(self, kind: str, id_name: str, element=None):
+        self.kind = kind
+        self.id_name = id_name
+        self.element = element  # The new UIElement (None for DELETE)
+
+    def __repr__(self) -> str:
+        return f"SceneOp({self.kind}, {self.id_name!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SceneOp) and (self.kind, self.id_name) == (other.kind, other.id_name)
+
+
+def _snapshot(element) -> tuple:
+    """The parts of an element the scene reflects, as an immutable, comparable value."""
+    return (
+        element.element_type,
+        tuple(element.location),
+        tuple(element.scale),
+        element.label,
+        element.flow_action,
+    )
+
+
+class SceneReconciler:
+    """
+    Remembers the last applied state of every element and turns a new layout
+    into a batch of SceneOps. Comparing an unchanged element is one tuple
+    comparison, so a 10k-element layout with a few changes diffs in a few
+    milliseconds and yields only the ops for those changes.
+    """
+
+    def __init__(self):
+        self._applied: dict[str, tuple] = {}  # id_name -> snapshot
+
+    def __len__(self) -> int:
+        return len(self._applied)
+
+    def reconcile(self, elements) -> list[SceneOp]:
+        """
+        Diffs `elements` against the last applied state and returns the ops,
+        grouped in APPLY_ORDER. The new state is recorded, so the caller must
+        apply every returned op.
+        """
+        applied = self._applied
+        current: dict[str, tuple] = {}
+        batches = {kind: [] for kind in APPLY_ORDER}
+
+        for element in elements:
+            id_name = element.id_name
+            if id_name in current:
+                raise ValueError(f"Duplicate element id '{id_name}' in layout")
+            snapshot = _snapshot(element)
+            current[id_name] = snapshot
+            previous = applied.get(id_name)
+            if previous == snapshot:
+                continue
+            if previous is None:
+                batches[CREATE].append(SceneOp(CREATE, id_name, element))
+            elif previous[0] != snapshot[0]:
+                # Another kind of object: recreate it.
+                batches[DELETE].append(SceneOp(DELETE, id_name))
+                batches[CREATE].append(SceneOp(CREATE, id_name, element))
+            else:
+                if previous[1:3] != snapshot[1:3]:
+                    batches[TRANSFORM].append(SceneOp(TRANSFORM, id_name, element))
+                if previous[3:] != snapshot[3:]:
+                    batches[RELABEL].append(SceneOp(RELABEL, id_name, element))
+
+        # Every new element that was not created existed before; if that is
+        # fewer than before, some were removed.
+        created = sum(1 for op in batches[CREATE] if op.id_name not in applied)
+        if len(current) - created < len(applied):
+            for id_name in applied.keys() - current.keys():
+                batches[DELETE].append(SceneOp(DELETE, id_name))
+
+        self._applied = current
+        return [op for kind in APPLY_ORDER for op in batches[kind]]
+
+    def reset(self) -> None:
+        """Forgets the applied state (for instance after the scene was cleared by hand)."""
+        self._applied = {}
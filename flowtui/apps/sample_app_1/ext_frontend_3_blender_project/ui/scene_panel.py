@@ -3,6 +3,8 @@
 
 # import bpy
 
+from ..flow_client import get_client
+
 class MainScenePanel(): # (bpy.types.Panel)
     """
     Creates a new panel in the 3D View's sidebar.
@@ -20,7 +22,39 @@ class MainScenePanel(): # (bpy.types.Panel)
         """
         layout = self.layout
         # This button is declaratively wired to a backend flow.
-        # An operator would read this `flow_action` property and
-        # make an API call to the backend.
+        # FlowTriggerOperator reads this `flow_action` property and
+        # queues the call on the shared FlowClient.
         op = layout.operator("wm.flow_trigger", text="Spawn Vehicle")
         op.flow_action = "fleet.vehicles.create"
+
+
+class FlowTriggerOperator(): # (bpy.types.Operator)
+    """
+    `wm.flow_trigger`: runs the flow named in `flow_action`.
+    The call is queued and the operator finishes at once; Blender's UI
+    never waits for the backend. The result arrives in `on_result`, on
+    the UI thread, when the client's timer drains it. By then Blender may
+    have freed this operator, so the callback holds only a copy of
+    `flow_action`, never `self`.
+    """
+    # --- MOCK ---
+    # bl_idname = "wm.flow_trigger"
+    # bl_label = "Trigger Flow"
+    # flow_action: bpy.props.StringProperty()
+    flow_action = ""
+
+    def execute(self, context):
+        flow_action = self.flow_action
+
+        def on_result(result, error):
+            FlowTriggerOperator.on_result(flow_action, result, error)
+
+        get_client().call(flow_action, callback=on_result)
+        return {"FINISHED"}
+
+    @staticmethod
+    def on_result(flow_action, result, error):
+        if error is not None:
+            print(f"Flow {flow_action} failed: {error}")
+            return
+        print(f"Flow {flow_action} answered {result.status}")
@@ -9,10 +9,13 @@ class VehicleSearchInput(BaseModel):
     """
     query: Optional[str] = None
     limit: int = 10
-    offset: int = 0
+    offset: int = 0 # Deprecated: prefer `cursor`, which stays fast on deep pages.
+    # Opaque keyset cursor taken from a previous result's `next_cursor`.
+    cursor: Optional[str] = None
 
 class VehicleListResult(BaseModel):
     """
     Output schema for a list of vehicles.
     """
     vehicles: List[Vehicle]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class ProductInput(BaseModel):
     """
@@ -22,7 +22,11 @@ class ProductItem(BaseModel):
 
 class ProductSearchInput(BaseModel):
     query: str = ""
+    limit: int = Field(50, ge=1, le=500)
+    # Opaque keyset cursor taken from a previous result's `next_cursor`.
+    cursor: Optional[str] = None
 
 class ProductListResult(BaseModel):
     products: List[ProductItem]
+    next_cursor: Optional[str] = None
 
@@ -1,10 +1,30 @@
 from flow_system import BaseFlow
+from flow_system.pagination import decode_cursor, keyset_start, take_page
 from backend.models.fleet.vehicle import Vehicle
 from backend.contracts.fleet import (
     VehicleSearchInput,
     VehicleListResult
 )
 
+# Placeholder data: In a real app, this would query a database or service.
+# Kept sorted by id so pages can seek into it by key.
+_VEHICLES = [
+    Vehicle(id="drone-05", status="running_mission", battery_percent=30.2, location=(30.5, 15.0)),
+    Vehicle(id="rover-01", status="idle", battery_percent=85.5, location=(10.0, 20.0)),
+]
+
+
+def _iter_vehicles(input: VehicleSearchInput):
+    """
+    Matching vehicles in id order, starting after the input's cursor (or
+    offset). The cursor is checked right away, not on the first item.
+    """
+    after = decode_cursor(input.cursor, key_type=str)
+    start = keyset_start(_VEHICLES, key=lambda v: v.id, after=after) if after is not None else input.offset
+    q = (input.query or "").lower()
+    return (_VEHICLES[i] for i in range(start, len(_VEHICLES)) if not q or q in _VEHICLES[i].id)
+
+
 class Vehicles:
     """
     Manages the vehicles in the fleet.
@@ -17,15 +37,16 @@ class Vehicles:
         consumes = VehicleSearchInput
         produces = VehicleListResult
         template = "fragments/vehicles/list.html"
+        item_template = "fragments/vehicles/_item.html"
 
         # GET default verb controller
         def get(self, input: VehicleSearchInput) -> VehicleListResult:
-            # Placeholder logic: In a real app, this would query a database or service
-            # For now, return a dummy list of vehicles.
-            return VehicleListResult(vehicles=[
-                Vehicle(id="rover-01", status="idle", battery_percent=85.5, location=(10.0, 20.0)),
-                Vehicle(id="drone-05", status="running_mission", battery_percent=30.2, location=(30.5, 15.0)),
-            ])
+            vehicles, next_cursor = take_page(_iter_vehicles(input), key=lambda v: v.id, limit=input.limit)
+            return VehicleListResult(vehicles=vehicles, next_cursor=next_cursor)
+
+        # Streaming mode: every match, serialized item by item
+        def stream(self, input: VehicleSearchInput):
+            return _iter_vehicles(input)
 
     # FLOW: status_synch
     class status_synch(BaseFlow):
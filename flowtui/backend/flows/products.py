@@ -1,19 +1,14 @@
 from flow_system import BaseFlow
-from backend.models.product import Product
-from contracts.products import (
+from flow_system.pagination import decode_cursor, take_page
+from backend.contracts.products import (
     ProductSearchInput,
     ProductListResult
 )
-from services.product_service import ProductService
+from backend.services.product_service import ProductService
 
 
-# This acts as our in-memory database for the example.
-# In a real app, this would be a database connection.
-db_products = {
-    1: Product(id=1, name="Laptop"),
-    2: Product(id=2, name="Keyboard"),
-    3: Product(id=3, name="Mouse"),
-}
+# Products live in the shared store behind ProductService, not in a module
+# global: with several server workers, each would hold its own copy.
 
 
 # TODO: ROUTES
@@ -37,8 +32,13 @@ class Products:
 
         # GET default verb controller 
         def get(self, input: ProductSearchInput) -> ProductListResult:
-            products = ProductService.search(input.query)
-            return ProductListResult(products=products)
+            rows = ProductService.iter_search(input.query, after_id=decode_cursor(input.cursor, key_type=int))
+            products, next_cursor = take_page(rows, key=lambda p: p.id, limit=input.limit)
+            return ProductListResult(products=products, next_cursor=next_cursor)
+
+        # Streaming mode: every match, serialized item by item
+        def stream(self, input: ProductSearchInput):
+            return ProductService.iter_search(input.query, after_id=decode_cursor(input.cursor, key_type=int))
 
     # FLOW: htmx_blocks
     class htmx_blocks(BaseFlow):
@@ -0,0 +1,9 @@
+"""
+Shared HTTP layer for providers: keep-alive pooling, response caching,
+single-flight deduplication and rate limiting.
+"""
+from backend.providers.http.cache import ResponseCache
+from backend.providers.http.client import ConnectionPool, HttpError, ProviderHttpClient
+from backend.providers.http.rate_limit import TokenBucket
+
+__all__ = ["ConnectionPool", "HttpError", "ProviderHttpClient", "ResponseCache", "TokenBucket"]
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CachedResponse:
+    """A response body kept in the cache, with what is needed to revalidate it."""
+    status: int
+    headers: dict
+    body: bytes
+    expires_at: float
+    etag: str | None = None
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.body)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    A TTL + LRU cache of GET responses, shared by all providers.
+
+    Expired entries are not dropped right away if they carry an ETag: the
+    client revalidates them with `If-None-Match`, and a 304 answer simply
+    renews the entry without transferring the body again. Responses with an
+    ETag but `max-age=0` are stored already expired, for that reason alone.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Returns the entry (fresh or stale) and marks it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get_fresh(self, key: str) -> CachedResponse | None:
+        """Returns the entry if it has not expired, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_fresh:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def renew(self, key: str, ttl: float) -> CachedResponse | None:
+        """Extends a revalidated entry (after a 304 Not Modified)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + ttl
+                self.revalidated += 1
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,264 @@
+import hashlib
+import http.client
+import json
+import re
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlencode, urlsplit
+
+from backend.providers.http.cache import CachedResponse, ResponseCache
+from backend.providers.http.rate_limit import TokenBucket
+
+
+class HttpError(Exception):
+    """Raised for non-2xx answers from a provider."""
+
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.body = body
+
+
+# -------------------------------------------------
+# Connection Pool
+# -------------------------------------------------
+
+class ConnectionPool:
+    """
+    Keeps idle keep-alive connections per (scheme, host, port).
+
+    Shared by every provider, so two providers talking to the same host
+    reuse the same sockets and TLS sessions instead of reconnecting.
+    """
+
+    def __init__(self, max_idle_per_host: int = 8, timeout: float = 10.0):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: tuple) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_cls(host, port, timeout=self.timeout)
+
+    def release(self, key: tuple, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+# -------------------------------------------------
+# Single-Flight
+# -------------------------------------------------
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one.
+
+    The first caller for a key does the work; callers arriving while it is in
+    flight wait for and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._calls[key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# Shared by all providers unless a client is given its own.
+default_pool = ConnectionPool()
+default_cache = ResponseCache()
+# Cache keys include the URL and credentials, so one instance serves every client.
+default_single_flight = SingleFlight()
+
+# One rate limiter per (scheme, host, port): a provider's limit applies to all
+# its clients together. The first client created for a host sets rate and burst.
+_rate_limiters: dict[tuple, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(key: tuple, rate: float, burst: int | None = None) -> TokenBucket:
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = _rate_limiters[key] = TokenBucket(rate, burst)
+        return limiter
+
+# Errors that mean an idle keep-alive socket was closed by the server.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+# -------------------------------------------------
+# Provider HTTP Client
+# -------------------------------------------------
+
+class ProviderHttpClient:
+    """
+    The HTTP layer every provider talks through.
+
+    GET responses are cached (TTL + LRU, revalidated by ETag), identical
+    concurrent GETs are fetched once, and every request that goes out on the
+    wire first takes a token from the provider's rate limiter. Like the pool
+    and the cache, the limiter and the deduplication are shared by every
+    client of the same host.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: dict | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        ttl: float = 60.0,
+        pool: ConnectionPool | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        parts = urlsplit(base_url)
+        default_port = 443 if parts.scheme == "https" else 80
+        self._pool_key = (parts.scheme, parts.hostname, parts.port or default_port)
+        self.base_url = base_url.rstrip("/")
+        self._base_path = parts.path.rstrip("/")
+        self.headers = headers or {}
+        self.ttl = ttl
+        self.pool = pool or default_pool
+        self.cache = cache if cache is not None else default_cache  # An empty cache is falsy
+        self.rate_limiter = shared_rate_limiter(self._pool_key, rate, burst) if rate else None
+        self._single_flight = default_single_flight
+
+    # --- Public API ---
+
+    def get_json(self, path: str, params: dict | None = None):
+        """GETs a JSON resource, served from the cache when possible."""
+        return json.loads(self.get(path, params))
+
+    def get(self, path: str, params: dict | None = None) -> bytes:
+        target = self._target(path, params)
+        key = self._cache_key(target)
+
+        entry = self.cache.get_fresh(key)
+        if entry is not None:
+            return entry.body
+        return self._single_flight.do(key, lambda: self._fetch(key, target))
+
+    def post_json(self, path: str, payload, params: dict | None = None):
+        """POSTs a JSON body. Never cached or deduplicated."""
+        body = json.dumps(payload).encode()
+        status, _, data = self._send("POST", self._target(path, params), body, {"Content-Type": "application/json"})
+        if not 200 <= status < 300:
+            raise HttpError(status, data)
+        return json.loads(data) if data else None
+
+    def ping(self, timeout: float = 2.0) -> None:
+        """Opens a TCP connection to the provider host; raises OSError if unreachable."""
+        _, host, port = self._pool_key
+        socket.create_connection((host, port), timeout=timeout).close()
+
+    # --- Internals ---
+
+    def _target(self, path: str, params: dict | None) -> str:
+        target = f"{self._base_path}/{path.lstrip('/')}"
+        if params:
+            target += "?" + urlencode(sorted(params.items()))
+        return target
+
+    def _cache_key(self, target: str) -> str:
+        # Responses depend on credentials, so they are part of the key.
+        auth = self.headers.get("Authorization", "")
+        auth_hash = hashlib.sha1(auth.encode()).hexdigest()[:12] if auth else "-"
+        return f"{self.base_url}{target}|{auth_hash}"
+
+    def _fetch(self, key: str, target: str) -> bytes:
+        entry = self.cache.get(key)
+        extra = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        status, headers, body = self._send("GET", target, None, extra)
+
+        if status == 304 and entry is not None:
+            renewed = self.cache.renew(key, self._ttl_for(headers))
+            if renewed is not None:
+                return renewed.body
+            # Evicted while we were revalidating it: fetch the body again.
+            status, headers, body = self._send("GET", target, None, {})
+        if not 200 <= status < 300:
+            raise HttpError(status, body)
+
+        ttl = self._ttl_for(headers)
+        etag = headers.get("etag")
+        # With an ETag even max-age=0 is worth keeping: it is revalidated with a 304.
+        if "no-store" not in headers.get("cache-control", "") and (ttl > 0 or etag):
+            self.cache.put(key, CachedResponse(
+                status=status,
+                headers=headers,
+                body=body,
+                expires_at=time.monotonic() + ttl,
+                etag=etag,
+            ))
+        return body
+
+    def _ttl_for(self, headers: dict) -> float:
+        """Honors Cache-Control from the provider, else the client's default TTL."""
+        cache_control = headers.get("cache-control", "")
+        if "no-store" in cache_control:
+            return 0.0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return float(match.group(1)) if match else self.ttl
+
+    def _send(self, method: str, target: str, body: bytes | None, extra_headers: dict) -> tuple[int, dict, bytes]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        headers = {**self.headers, **extra_headers}
+
+        # A pooled connection may have been closed by the server while idle;
+        # in that case retry once on a fresh connection.
+        for attempt in range(2):
+            conn = self.pool.acquire(self._pool_key)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            self.pool.release(self._pool_key, conn, reusable=not response.will_close)
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, data
@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token-bucket rate limiter.
+
+    Holds up to `capacity` tokens and refills `rate` tokens per second.
+    Each request takes one token; when the bucket is empty, callers wait
+    just long enough for the next token instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Takes a token if one is available. Returns 0, or the seconds to wait otherwise."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Blocks until a token is available. Returns False if `timeout` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
@@ -1,5 +1,7 @@
 import os
 
+from backend.providers.http import ProviderHttpClient
+
 class SpotifyApi:
     """
     A client for interacting with the Spotify Web API.
@@ -7,10 +9,31 @@ class SpotifyApi:
     # Convention: The STATUS is determined by checking an environment variable.
     STATUS = "API Key Loaded" if os.environ.get("SPOTIFY_API_KEY") else "⚠️ No API Key"
 
+    BASE_URL = "https://api.spotify.com/v1"
+
+    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+        # `base_url` can point at a local stub server for tests.
+        api_key = api_key or os.environ.get("SPOTIFY_API_KEY", "")
+        self.has_api_key = bool(api_key)
+        self.http = ProviderHttpClient(
+            base_url or self.BASE_URL,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
+            rate=10,   # Stay well under Spotify's rolling rate limit
+            burst=20,
+            ttl=300,   # Playlists and search results change slowly
+        )
+
     def get_playlist(self, user_id: str, playlist_id: str):
-        """Fetches a specific playlist for a user."""
-        pass
+        """Fetches a specific playlist for a user (playlist ids are global; the API needs no user)."""
+        return self.http.get_json(f"/playlists/{playlist_id}")
 
     def search_track(self, track_name: str):
         """Searches for a track."""
-        pass
+        return self.http.get_json("/search", {"q": track_name, "type": "track", "limit": 10})
+
+    def health_check(self) -> str:
+        """Cheap liveness probe used by the TUI's Utilities panel."""
+        if not self.has_api_key:
+            raise PermissionError("No API Key")
+        self.http.ping()
+        return "API Reachable"
@@ -1,15 +1,56 @@
+from backend.services.query_cache import QueryCache
+
+
 class Database:
     """
     Defines the contract for database operations.
     The actual connection is managed by the main application runtime.
+
+    Every statement goes through `query()`. With a QueryCache (opt-in, see
+    `enable_cache()`), identical reads are answered from memory until a
+    write touches one of the tables they read.
     """
     # This static status is a fallback in case the manifest isn't found.
     STATUS = "Not Connected"
 
-    def query(self, sql: str):
-        """Executes a raw SQL query."""
-        pass
+    def __init__(self, connection=None, cache: QueryCache | None = None):
+        # Injected by the application runtime; None until it connects.
+        self.connection = connection
+        self.cache = cache
+
+    def enable_cache(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024) -> QueryCache:
+        """Turns on the read-through result cache."""
+        if self.cache is None:
+            self.cache = QueryCache(max_entries, max_bytes)
+        return self.cache
+
+    def query(self, sql: str, params=()):
+        """Executes a raw SQL query and returns its rows (an empty list for writes)."""
+        if self.connection is None:
+            raise ConnectionError(self.STATUS)
+        if self.cache is None:
+            return self._execute(sql, params)
+        return self.cache.execute(sql, params, self._execute)
+
+    def _execute(self, sql: str, params) -> list:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params or ())
+            return cursor.fetchall() if cursor.description else []
+        finally:
+            cursor.close()
+
+    def cache_stats(self) -> dict | None:
+        """Hit/miss counters of the result cache, or None when caching is off."""
+        return self.cache.stats() if self.cache is not None else None
 
     def find_user(self, user_id: int):
         """Fetches a user by their ID."""
         pass
+
+    def health_check(self) -> str:
+        """Cheap liveness probe used by the TUI's Utilities panel."""
+        if self.connection is None:
+            raise ConnectionError(self.STATUS)
+        self.query("SELECT 1")
+        return "Connected"
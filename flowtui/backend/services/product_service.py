@@ -1,16 +1,72 @@
-from contracts.products import ProductItem
+import threading
 
-_FAKE_DB = [
+from backend.contracts.products import ProductItem
+from backend.services.shared_store import default_store
+
+# Seed rows for a new store. The products live in the shared store rather
+# than in a module global, so every worker process sees the same data.
+_SEED = [
     ProductItem(id=1, name="Keyboard", price=99.99),
     ProductItem(id=2, name="Mouse", price=49.99),
     ProductItem(id=3, name="Monitor", price=299.99),
 ]
+_SCHEMA = "CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL)"
+# Rows fetched per query while iterating a search.
+_BATCH_SIZE = 256
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _db():
+    global _schema_ready
+    db = default_store().database()
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                db.query(_SCHEMA)
+                for p in _SEED:
+                    db.query("INSERT OR IGNORE INTO products (id, name, price) VALUES (?, ?, ?)", (p.id, p.name, p.price))
+                _schema_ready = True
+    return db
+
 
 class ProductService:
+    # Convention: The STATUS attribute provides a human-readable state for the TUI.
+    STATUS = "Shared Store"
+
     @staticmethod
     def search(query: str):
-        if not query:
-            return _FAKE_DB
+        return list(ProductService.iter_search(query or ""))
+
+    @staticmethod
+    def iter_search(query: str = "", after_id: int | None = None):
+        """
+        Lazily yields matching products in id order, starting after `after_id`.
+        Rows are fetched in batches by keyset (id > last id), so deep pages
+        are as cheap as the first.
+        """
+        q = (query or "").lower()
+        last_id = -1 if after_id is None else after_id
+        while True:
+            rows = _db().query(
+                "SELECT id, name, price FROM products WHERE id > ? AND instr(lower(name), ?) > 0 ORDER BY id LIMIT ?",
+                (last_id, q, _BATCH_SIZE),
+            )
+            for id, name, price in rows:
+                yield ProductItem(id=id, name=name, price=price)
+            if len(rows) < _BATCH_SIZE:
+                return
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def create(name: str, price: float) -> ProductItem:
+        db = _db()
+        db.query("INSERT INTO products (name, price) VALUES (?, ?)", (name, price))
+        id = db.query("SELECT last_insert_rowid()")[0][0]
+        return ProductItem(id=id, name=name, price=price)
 
-        q = query.lower()
-        return [p for p in _FAKE_DB if q in p.name.lower()]
+    def health_check(self) -> str:
+        """Cheap liveness probe used by the TUI's Utilities panel."""
+        count = _db().query("SELECT count(*) FROM products")[0][0]
+        return f"{count} products"
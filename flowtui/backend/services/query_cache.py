@@ -0,0 +1,240 @@
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+# Leading keywords of statements that only read.
+_READ_KEYWORDS = ("select", "with", "values")
+# Keywords that make a statement a write wherever they appear (a WITH ... INSERT,
+# a SELECT ... INTO). replace() the function is not one.
+_WRITE_KEYWORDS = re.compile(
+    r"\b(?:insert|update|delete|merge|upsert|create|drop|alter|truncate|into)\b|\breplace\b(?!\s*\()"
+)
+# Statements after which nothing cached can be trusted (a rolled-back
+# transaction undoes writes whose results reads may already have seen).
+_CLEAR_KEYWORDS = ("rollback", "attach", "detach", "vacuum")
+# Statements that change no table.
+_NEUTRAL_KEYWORDS = ("begin", "commit", "end", "savepoint", "release", "explain", "analyze")
+
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])""")
+_NAME = r"""(?:"(?:[^"]|"")+"|`[^`]+`|\[[^\]]+\]|[\w$]+)"""
+_IDENT = re.compile(rf"{_NAME}(?:\s?\.\s?{_NAME})*")
+_FROM = re.compile(r"\b(?:from|join) ")
+# Where the table list after a FROM ends.
+_FROM_END = re.compile(
+    r"\b(?:where|join|on|using|group|order|limit|having|union|intersect|except|window"
+    r"|inner|left|right|full|cross|natural|outer)\b|[()]"
+)
+_WRITE_TABLE = re.compile(
+    r"\b(?:insert(?: or \w+)? into|replace into|update(?: or \w+)?|delete from|truncate(?: table)?"
+    r"|(?:create|drop|alter) (?:temp\w* )?(?:table|view|index)(?: if(?: not)? exists)?) "
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Lower-cases and collapses whitespace outside quoted strings and
+    identifiers, so formatting differences map to the same cache key.
+    """
+    # The split keeps the quoted pieces, at the odd positions.
+    parts = _QUOTED.split(sql)
+    normalized = "".join(part if i % 2 else re.sub(r"\s+", " ", part.lower()) for i, part in enumerate(parts))
+    return normalized.strip().rstrip(";").rstrip()
+
+
+def _table_name(ident: str) -> str:
+    name = _IDENT.match(ident).group(0).rsplit(".", 1)[-1].strip()
+    if name[:1] in "\"`[":
+        name = name[1:-1]
+    return name.lower()
+
+
+def _read_tables(sql: str) -> set[str]:
+    """Tables after every FROM and JOIN, including comma lists ("from a x, b y")."""
+    tables = set()
+    for match in _FROM.finditer(sql):
+        rest = sql[match.end():]
+        end = _FROM_END.search(rest)
+        for item in (rest[:end.start()] if end else rest).split(","):
+            item = item.strip()
+            if _IDENT.match(item):
+                tables.add(_table_name(item))
+    return tables
+
+
+def _write_tables(sql: str) -> set[str]:
+    tables = set()
+    for match in _WRITE_TABLE.finditer(sql):
+        if _IDENT.match(sql, match.end()):
+            tables.add(_table_name(sql[match.end():]))
+    return tables
+
+
+def classify(sql: str) -> tuple[str, set[str]]:
+    """
+    Returns ("read", tables read), ("write", tables written) or
+    ("clear", set()) for a normalized statement. Writes whose tables cannot
+    be determined come back as "clear".
+    """
+    # String literals cannot hold keywords or table names.
+    bare = _QUOTED.sub(lambda m: m.group(0) if m.group(0)[0] in "\"`[" else "''", sql)
+    keyword = bare.split(" ", 1)[0]
+    if keyword in _CLEAR_KEYWORDS:
+        return "clear", set()
+    if keyword in _READ_KEYWORDS and not _WRITE_KEYWORDS.search(bare):
+        return "read", _read_tables(bare)
+    if keyword in _NEUTRAL_KEYWORDS or (keyword == "pragma" and "=" not in bare):
+        return "read", set()
+    tables = _write_tables(bare)
+    return ("write", tables) if tables else ("clear", set())
+
+
+@lru_cache(maxsize=4096)
+def _parse(sql: str) -> tuple[str, str, frozenset]:
+    """normalize_sql() and classify() for a statement, memoized: flows send the same strings."""
+    normalized = normalize_sql(sql)
+    kind, tables = classify(normalized)
+    return normalized, kind, frozenset(tables)
+
+
+def _result_size(rows: list) -> int:
+    """Approximate bytes held by a result."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        if isinstance(row, (tuple, list)):
+            size += sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class QueryCache:
+    """
+    An LRU cache of read query results, bounded by entry count and size.
+
+    Keys are the normalized SQL plus the params. Each entry remembers the
+    tables its query read; a write to one of those tables drops every entry
+    that read it. A read that overlaps a write to one of its tables is not
+    cached, since it may have seen the old rows.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[list, frozenset, int]] = OrderedDict()  # key -> (rows, tables, size)
+        self._by_table: dict[str, set[tuple]] = {}
+        self._versions: dict[str, int] = {}  # table -> writes seen, to spot overlapping writes
+        self._clears = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Read-through ---
+
+    def execute(self, sql: str, params, run):
+        """
+        Answers a statement from the cache, or through `run(sql, params)`.
+        Reads are cached; writes invalidate the tables they touch.
+        """
+        normalized, kind, tables = _parse(sql)
+        if kind != "read":
+            self._invalidate(tables)
+            try:
+                return run(sql, params)
+            finally:
+                self._invalidate(tables)  # Also drops reads cached while the write ran
+        if not tables:
+            return run(sql, params)  # No table to invalidate by ("SELECT 1"): never cached
+
+        key = (normalized, _params_key(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[0])
+            self.misses += 1
+            versions = self._snapshot(tables)
+        rows = run(sql, params)
+        self._put(key, list(rows), tables, versions)
+        return rows
+
+    def _snapshot(self, tables) -> tuple:
+        return (self._clears, *(self._versions.get(table, 0) for table in sorted(tables)))
+
+    def _put(self, key: tuple, rows: list, tables: frozenset, versions: tuple) -> None:
+        size = _result_size(rows)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._snapshot(tables) != versions:
+                return  # A write to one of the tables overlapped the read
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (rows, tables, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: tuple) -> None:
+        rows, tables, size = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    # --- Invalidation ---
+
+    def _invalidate(self, tables: set[str]) -> None:
+        """Drops the entries reading `tables`; an empty set means everything."""
+        with self._lock:
+            if not tables:
+                self._clears += 1
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._by_table.clear()
+                self._bytes = 0
+                return
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def invalidate_table(self, table: str) -> None:
+        """For changes made behind the cache's back (another process, a migration)."""
+        self._invalidate({table.lower()})
+
+    def clear(self) -> None:
+        self._invalidate(set())
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+def _params_key(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
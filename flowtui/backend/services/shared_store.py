@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import threading
+
+from backend.services.database import Database
+from backend.services.query_cache import QueryCache
+
+SHARED_DB_PATH = os.environ.get("FLOWTUI_SHARED_DB", os.path.join(".flowtui", "shared.db"))
+
+
+class SharedStore:
+    """
+    State shared by every worker process of the flow server: one SQLite file
+    in WAL mode, so readers in all workers run concurrently with a writer.
+
+    Each thread gets its own autocommit connection wrapped in a Database.
+    Reads go through one QueryCache per process. A write in this process
+    invalidates the tables it touches as usual. A commit from any other
+    connection, including other workers, bumps SQLite's `data_version`,
+    which is checked on every `database()` call and clears the cache. A
+    thread's first call clears it too, since its new connection cannot tell
+    what was committed before it opened.
+    """
+
+    def __init__(self, path: str = SHARED_DB_PATH, cache: bool = True):
+        self.path = path
+        self.cache = QueryCache() if cache else None
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def database(self) -> Database:
+        """This thread's Database, with the cache cleared if another connection committed."""
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            # Connections must not cross a fork.
+            local.pid = os.getpid()
+            local.db = None
+        if local.db is None:
+            local.db = Database(self._connect(), cache=self.cache)
+            local.data_version = None
+        if self.cache is not None:
+            version = local.db.connection.execute("PRAGMA data_version").fetchone()[0]
+            if version != local.data_version:
+                # Also on a new connection: it has no earlier version to compare
+                # with, and rows committed elsewhere since the cache was filled
+                # would otherwise be served stale.
+                self.cache.clear()
+            local.data_version = version
+        return local.db
+
+
+# The store the backend services share, created on first use.
+_default_store: SharedStore | None = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> SharedStore:
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = SharedStore()
+        return _default_store
@@ -1,3 +1,6 @@
+import errno
+import socket
+
 class UdpManager:
     """
     Manages UDP communication for real-time messages, like with RC cars.
@@ -18,3 +21,19 @@ class UdpManager:
     def receive_telemetry(self):
         """Listens for incoming telemetry data."""
         pass
+
+    def health_check(self) -> str:
+        """
+        Cheap liveness probe used by the TUI's Utilities panel.
+        If the port can still be bound, nothing is listening on it.
+        """
+        probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            probe.bind((self.host, self.port))
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE:
+                return f"Listening on Port {self.port}"
+            raise
+        finally:
+            probe.close()
+        raise ConnectionError(f"Nothing listening on Port {self.port}")
@@ -0,0 +1,103 @@
+"""
+Checks the code viewer's incremental highlighting against a full Pygments lex.
+
+Applies random line edits (replacements, insertions, deletions, unterminated
+docstrings) to source files, feeding each new version to the same
+LineHighlighter the way CodeViewer.reload() does, and compares the tokens of
+every line with those of the whole new text lexed from scratch.
+
+    python benchmarks/check_highlighter.py [FILE ...] [--edits N] [--seed S]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pygments.lexers import get_lexer_for_filename  # noqa: E402
+
+from tui_panels.code_viewer import TAB_SIZE, LineHighlighter, LineSource  # noqa: E402
+
+DEFAULT_FILES = ["flow_tui.py", "tui_panels/code_viewer.py"]
+SNIPPETS = ['x = 1', '"""', 'def f():', '    return "a"', '', '# comment', "s = '''", "'''", 'class C:']
+
+
+def expected_lines(lexer, lines: list[str]) -> list[list]:
+    """Tokens of each line from lexing the whole text at once, merged per token type."""
+    text = "".join(line.expandtabs(TAB_SIZE) + "\n" for line in lines)
+    result, current = [], []
+    for _, token, value in lexer.get_tokens_unprocessed(text):
+        while "\n" in value:
+            head, _, value = value.partition("\n")
+            if head:
+                current.append((token, head))
+            result.append(current)
+            current = []
+        if value:
+            current.append((token, value))
+    return [_merged(tokens) for tokens in result[:len(lines)]]
+
+
+def _merged(tokens: list) -> list:
+    merged = []
+    for token, value in tokens:
+        if merged and merged[-1][0] is token:
+            merged[-1] = (token, merged[-1][1] + value)
+        else:
+            merged.append((token, value))
+    return merged
+
+
+def _random_edit(rng: random.Random, lines: list[str]) -> list[str]:
+    start = rng.randrange(len(lines) + 1)
+    removed = rng.choice([0, 0, 1, 1, 2, 5]) if start < len(lines) else 0
+    inserted = [rng.choice(SNIPPETS) for _ in range(rng.choice([0, 1, 1, 2, 3]))]
+    new = lines[:start] + inserted + lines[start + removed:]
+    return new or [""]
+
+
+def check_file(file_path: str, edits: int, rng: random.Random) -> int:
+    with open(file_path, encoding="utf-8") as f:
+        lines = f.read().splitlines() or [""]
+    lexer = get_lexer_for_filename(file_path)
+    source = LineSource.from_text("\n".join(lines) + "\n")
+    highlighter = LineHighlighter(lexer, source)
+    failures = 0
+    for step in range(edits):
+        # Look at part of the file first, as scrolling would, so the edit meets cached states.
+        for index in range(0, rng.randrange(len(lines) + 1)):
+            highlighter.tokens(index)
+        lines = _random_edit(rng, lines)
+        new_source = LineSource.from_text("\n".join(lines) + "\n")
+        changed = source.changed_range(new_source)
+        if changed is not None:
+            highlighter.edit(new_source, *changed)
+        source = new_source
+        expected = expected_lines(lexer, lines)
+        order = list(range(len(lines)))
+        if rng.random() < 0.5:
+            rng.shuffle(order)
+        for index in order:
+            if _merged(highlighter.tokens(index)) != expected[index]:
+                print(f"{file_path}: edit {step} {changed}: line {index + 1} differs")
+                failures += 1
+                break
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = sum(check_file(path, args.edits, rng) for path in args.files)
+    print(f"{len(args.files)} files, {args.edits} edits each: {failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Checks that flows keep working after the hot reloader reloads a contract.
+
+Calls each flow once, touches the contract module it consumes or produces so
+HotReloader reloads it (and everything importing it), then calls the flow
+again. A service still building the old contract classes makes the second
+call fail validation.
+
+    python benchmarks/check_reload.py [FLOW ...]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+from flow_system.reloader import HotReloader  # noqa: E402
+from flow_system.runtime import FlowRuntime  # noqa: E402
+
+DEFAULT_CALLS = [("products.index", "get", {"query": ""})]
+
+
+def _contract_files(flow_cls) -> list[str]:
+    modules = {model.__module__ for model in (flow_cls.consumes, flow_cls.produces) if model is not None}
+    return sorted(sys.modules[name].__file__ for name in modules if name.startswith("backend.contracts"))
+
+
+def check_flow(runtime: FlowRuntime, reloader: HotReloader, flow_name: str, verb: str, params: dict) -> int:
+    try:
+        asyncio.run(runtime.call(flow_name, verb, params))
+    except Exception as e:
+        print(f"{flow_name}.{verb} failed before reloading: {e}")
+        return 1
+    files = _contract_files(runtime.registry.resolve(flow_name))
+    for path in files:
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    result = reloader.check()
+    if result is None or result.errors:
+        print(f"{flow_name}: reload of {', '.join(files)} failed: {result}")
+        return 1
+    try:
+        asyncio.run(runtime.call(flow_name, verb, params))
+    except Exception as e:
+        print(f"{flow_name}.{verb} failed after reloading {', '.join(result.modules)}: {e}")
+        return 1
+    print(f"{flow_name}.{verb}: ok after reloading {', '.join(result.modules)}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("flows", nargs="*", help="Flows to call with GET and no params (default: products.index)")
+    args = parser.parse_args()
+
+    calls = [(name, "get", {}) for name in args.flows] or DEFAULT_CALLS
+    runtime = FlowRuntime()
+    reloader = HotReloader(runtime)
+    failures = sum(check_flow(runtime, reloader, *call) for call in calls)
+    runtime.process_pool.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import os
+
+FLOW_TEMPLATE = '''from flow_system import BaseFlow
+
+
+class {domain_class}:
+    """
+    Synthetic domain {domain}.
+    """
+{flows}
+'''
+
+FLOW_CLASS_TEMPLATE = '''
+    # FLOW: {name}
+    class {name}(BaseFlow):
+        """
+        Routes: {route}
+        """
+        template = "fragments/{domain}/{name}.html"
+
+        def get(self, input):
+            return {{"items": []}}
+
+        def post(self, input):
+            return {{"items": []}}
+'''
+
+SERVICE_TEMPLATE = '''class {class_name}:
+    """
+    Synthetic service {index}.
+    """
+    STATUS = "Idle"
+
+{methods}
+'''
+
+
+def _html_tree(depth: int, width: int, indent: int = 0) -> list[str]:
+    """Nested divs `depth` levels deep, `width` children per level, with flow bindings at the leaves."""
+    pad = " " * indent
+    if depth == 0:
+        return [f'{pad}<button id="b{indent}" class="btn" flow:click="domain_0.flow_0">Go</button>']
+    lines = [f'{pad}<div class="level-{depth}">']
+    for _ in range(width):
+        lines.extend(_html_tree(depth - 1, width, indent + 2))
+    lines.append(f"{pad}</div>")
+    return lines
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def generate_project(
+    root: str,
+    apps: int = 5,
+    frontends: int = 3,
+    domains: int = 20,
+    flows_per_file: int = 10,
+    templates_per_frontend: int = 20,
+    template_depth: int = 4,
+    template_width: int = 3,
+    services: int = 20,
+) -> dict:
+    """
+    Writes a synthetic FlowTUI project under `root` following the repo layout
+    (backend/{flows,contracts,models,services,providers}, apps/*/ext_frontend_*).
+    Returns counts of what was generated.
+    """
+    backend = os.path.join(root, "backend")
+    for package in ("", "flows", "contracts", "models", "services", "providers"):
+        _write(os.path.join(backend, package, "__init__.py"), "")
+
+    for d in range(domains):
+        domain = f"domain_{d}"
+        flows = "".join(
+            FLOW_CLASS_TEMPLATE.format(name=f"flow_{i}", route=f"ROUTE_{i}", domain=domain)
+            for i in range(flows_per_file)
+        )
+        _write(os.path.join(backend, "flows", f"{domain}.py"),
+               FLOW_TEMPLATE.format(domain=domain, domain_class=domain.capitalize(), flows=flows))
+        _write(os.path.join(backend, "contracts", f"{domain}.py"),
+               f"from pydantic import BaseModel\n\nclass {domain.capitalize()}Input(BaseModel):\n    query: str = ''\n")
+        _write(os.path.join(backend, "models", f"{domain}.py"),
+               f"from pydantic import BaseModel\n\nclass {domain.capitalize()}(BaseModel):\n    id: int\n")
+
+    for s in range(services):
+        methods = "\n".join(f"    def method_{m}(self):\n        pass\n" for m in range(8))
+        target = "services" if s % 2 == 0 else "providers"
+        _write(os.path.join(backend, target, f"component_{s}.py"),
+               SERVICE_TEMPLATE.format(class_name=f"Component{s}", index=s, methods=methods))
+
+    html = "\n".join(_html_tree(template_depth, template_width)) + "\n"
+    for a in range(apps):
+        for f in range(frontends):
+            views = os.path.join(root, "apps", f"app_{a}", f"ext_frontend_{f}_web", "views")
+            for t in range(templates_per_frontend):
+                _write(os.path.join(views, f"page_{t}.html"), html)
+
+    return {
+        "flow_files": domains,
+        "flows": domains * flows_per_file,
+        "templates": apps * frontends * templates_per_frontend,
+        "template_lines": html.count("\n"),
+        "services": services,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic FlowTUI project.")
+    parser.add_argument("root", help="Output directory.")
+    parser.add_argument("--apps", type=int, default=5)
+    parser.add_argument("--frontends", type=int, default=3)
+    parser.add_argument("--domains", type=int, default=20, help="Flow files in backend/flows.")
+    parser.add_argument("--flows-per-file", type=int, default=10)
+    parser.add_argument("--templates", type=int, default=20, help="Templates per frontend.")
+    parser.add_argument("--template-depth", type=int, default=4)
+    parser.add_argument("--template-width", type=int, default=3)
+    parser.add_argument("--services", type=int, default=20)
+    args = parser.parse_args()
+
+    counts = generate_project(
+        args.root, args.apps, args.frontends, args.domains, args.flows_per_file,
+        args.templates, args.template_depth, args.template_width, args.services,
+    )
+    print(f"Generated project in {args.root}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from textual.widgets import Tree
+
+from benchmarks.generate_project import generate_project
+from services.code_scanner import CodeScannerService
+from tui_panels.component_overview_content import ComponentOverviewContent
+from tui_panels.explorer_content import ExplorerContent
+from tui_panels.utilities_content import UtilitiesContent
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Differences below these are timer/allocator noise, whatever the percentage.
+NOISE_FLOOR = {"seconds": 0.005, "peak_kb": 64.0}
+
+
+def _files(root: str, subdir: str, suffix: str) -> list[str]:
+    found = []
+    for dirpath, _, filenames in os.walk(os.path.join(root, subdir)):
+        found.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(suffix) and not f.startswith("__"))
+    return sorted(found)
+
+
+# -------------------------------------------------
+# Stages
+# -------------------------------------------------
+# Each stage gets the prepared context and runs the code under test once.
+
+def stage_scan_project(ctx: dict) -> None:
+    with contextlib.chdir(ctx["root"]):
+        CodeScannerService().scan_project()
+
+
+def stage_scan_graph(ctx: dict) -> None:
+    with contextlib.chdir(ctx["root"]):
+        CodeScannerService().scan_graph()
+
+
+def stage_explorer_tree(ctx: dict) -> None:
+    explorer = ExplorerContent()
+    explorer.app_graphs = {".": ctx["project_graph"]}
+    explorer._populate_unified_tree(Tree("Project").root)
+
+
+def stage_flow_parser(ctx: dict) -> None:
+    overview = ComponentOverviewContent()
+    for path in ctx["flow_files"]:
+        overview._get_flow_structure(path)
+
+
+def stage_html_parser(ctx: dict) -> None:
+    overview = ComponentOverviewContent()
+    root = Tree("View").root
+    for path in ctx["templates"]:
+        overview._populate_html_tree(root, path)
+
+
+def stage_service_parser(ctx: dict) -> None:
+    utilities = UtilitiesContent()
+    for source in ctx["service_sources"]:
+        utilities._parse_service_file(source)
+
+
+STAGES = {
+    "scan_project": stage_scan_project,
+    "scan_graph": stage_scan_graph,
+    "explorer_tree": stage_explorer_tree,
+    "flow_parser": stage_flow_parser,
+    "html_parser": stage_html_parser,
+    "service_parser": stage_service_parser,
+}
+
+
+def prepare_context(root: str) -> dict:
+    """Loads the inputs of every stage up front so only the code under test is timed."""
+    with contextlib.chdir(root):
+        project_graph = CodeScannerService().scan_graph()
+    service_sources = []
+    for path in _files(root, "backend/services", ".py") + _files(root, "backend/providers", ".py"):
+        with open(path) as f:
+            service_sources.append(f.read())
+    return {
+        "root": root,
+        "project_graph": project_graph,
+        "flow_files": _files(root, "backend/flows", ".py"),
+        "templates": _files(root, "apps", ".html"),
+        "service_sources": service_sources,
+    }
+
+
+def measure(stage, ctx: dict, repeat: int) -> dict:
+    """Best-of-`repeat` wall time, then one extra traced run for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stage(ctx)
+        best = min(best, time.perf_counter() - started)
+
+    # Traced separately: tracemalloc slows the code down and would skew timings.
+    tracemalloc.start()
+    stage(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_kb": round(peak / 1024, 1)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns a message for every stage slower or hungrier than the baseline allows."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_kb"):
+            limit = max(base[metric] * (1 + threshold), base[metric] + NOISE_FLOOR[metric])
+            if current[metric] > limit:
+                change = 100 * (current[metric] / base[metric] - 1)
+                regressions.append(f"{name}.{metric}: {current[metric]} > {base[metric]} (+{change:.0f}%)")
+    return regressions
+
+
+def main():
+    """
+    Times each FlowTUI stage on a synthetic project and checks for regressions.
+    Run from the flowtui directory: python -m benchmarks.run_benchmarks
+    """
+    parser = argparse.ArgumentParser(description="Benchmark FlowTUI internals.")
+    parser.add_argument("--project", help="Use an existing project instead of generating one.")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier for the generated project size.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="Only run these stages.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    config = {"scale": args.scale}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.project
+        if root is None:
+            root = tmp
+            config["project"] = generate_project(
+                root, apps=5 * args.scale, domains=20 * args.scale, services=20 * args.scale,
+            )
+        ctx = prepare_context(os.path.abspath(root))
+        results = {name: measure(STAGES[name], ctx, args.repeat) for name in (args.stage or STAGES)}
+
+    if args.json:
+        print(json.dumps({"config": config, "stages": results}, indent=2))
+    else:
+        for name, result in results.items():
+            print(f"{name:<16} {result['seconds'] * 1000:10.2f} ms {result['peak_kb']:12.1f} KiB peak")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "stages": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config", {}).get("scale") != args.scale or args.project:
+            print("Baseline was recorded for a different project; skipping comparison.")
+            return
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions against baseline:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+The Flow runtime: resolves flow names, executes verbs and renders fragments.
+
+Flows only need `BaseFlow`; the web layer lives in `flow_system.server` so
+importing a flow module never pulls in FastAPI.
+"""
+from flow_system.base import BaseFlow
+from flow_system.registry import FlowNotFound, FlowRegistry, VerbNotImplemented
+
+__all__ = ["BaseFlow", "FlowNotFound", "FlowRegistry", "VerbNotImplemented"]
@@ -0,0 +1,44 @@
+import argparse
+
+import uvicorn
+
+
+def main():
+    """
+    Runs the flow server from the project root.
+
+    Example: python -m flow_system --templates apps/sample_app_1/ext_frontend_4_htmx_spa/views
+
+    With --workers N (N > 1) a supervisor runs N worker processes on the
+    same port; `kill -HUP <supervisor pid>` restarts them one at a time.
+    """
+    parser = argparse.ArgumentParser(description="Run the Flow runtime server.")
+    parser.add_argument("--templates", action="append", default=[], help="Template directory (repeatable).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload", action="store_true",
+                        help="Reload edited flows, contracts and templates without restarting.")
+    parser.add_argument("--process-workers", type=int, default=None,
+                        help="Worker processes for CPU-bound flows (default: one per CPU).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes serving the port (see flow_system.supervisor).")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        if args.reload:
+            parser.error("--reload reloads one process in place; it cannot be combined with --workers")
+        # Imported only here: the supervisor must fork before anything starts threads.
+        from flow_system.supervisor import Supervisor
+        options = {"template_dirs": args.templates}
+        if args.process_workers is not None:
+            options["process_workers"] = args.process_workers
+        Supervisor(args.workers, args.host, args.port, options).run()
+        return
+
+    from flow_system.server import create_app
+    app = create_app(args.templates, reload=args.reload, process_workers=args.process_workers)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
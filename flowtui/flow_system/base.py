@@ -0,0 +1,32 @@
+class BaseFlow:
+    """
+    Base class for every Flow.
+
+    A Flow is an inner class of a domain class (e.g. `Products.index`) whose
+    public methods are the HTTP-like verbs it answers (`get`, `post`, ...).
+    The class attributes describe its contract and how its output is rendered.
+    """
+    VERBS = ("get", "post", "put", "delete")
+
+    # List flows may also define `stream(self, input)` returning an iterator
+    # of items; the runtime serializes it incrementally (see FlowRuntime.stream).
+
+    # Pydantic model used to validate the incoming params.
+    consumes = None
+    # Pydantic model returned by the verb methods.
+    produces = None
+    # Fragment template (relative to the template dirs) rendered from the output.
+    template = None
+    # Template for a single item, used when a list flow is streamed as HTML.
+    item_template = None
+    # Topics whose changes make this flow's output stale. Clients subscribed to
+    # the flow get a freshly rendered fragment pushed when one is notified.
+    # An empty tuple means "the flow's own domain" (e.g. "fleet.vehicles").
+    watches: tuple[str, ...] = ()
+    # Where sync verbs run: "thread" (the event loop's thread pool) or
+    # "process" (a warm worker process, for CPU-bound flows; see
+    # flow_system.process_pool). Process flows must be importable by name and
+    # take and return picklable values.
+    executor = "thread"
+    # Most pool workers a process flow may occupy at once (None: all but one).
+    max_concurrency: int | None = None
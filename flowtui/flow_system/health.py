@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import importlib
+import inspect
+import os
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class ProbeResult:
+    """The outcome of one health probe run."""
+    status: str  # "ok", "down" or "timeout"
+    detail: str
+    latency_ms: float
+    checked_at: float
+
+
+class HealthMonitor:
+    """
+    Runs health probes concurrently and caches their latest results.
+
+    A probe is any callable (sync or async) returning a short status string;
+    raising means the component is down. Convention: services and providers
+    expose it as a `health_check()` method. Sync probes run in worker threads,
+    so a slow check never blocks the caller's event loop, and a probe that is
+    still running is not started again until it finishes.
+    """
+
+    def __init__(self, timeout: float = 2.0):
+        self.timeout = timeout
+        self.probes: dict[str, object] = {}
+        self.results: dict[str, ProbeResult] = {}
+        self._in_flight: set[str] = set()
+
+    def register(self, name: str, probe) -> None:
+        self.probes[name] = probe
+
+    async def _run_probe(self, name: str, probe) -> None:
+        self._in_flight.add(name)
+        started = time.perf_counter()
+        is_async = inspect.iscoroutinefunction(probe)
+        try:
+            if is_async:
+                call = probe()
+            else:
+                call = asyncio.to_thread(self._run_sync_probe, name, probe, asyncio.get_running_loop())
+            detail = await asyncio.wait_for(call, self.timeout)
+            status = "ok"
+        except asyncio.TimeoutError:
+            status, detail = "timeout", f"No answer in {self.timeout:.1f}s"
+        except Exception as e:
+            status, detail = "down", str(e) or type(e).__name__
+        finally:
+            if is_async:
+                self._in_flight.discard(name)  # Cancelled by wait_for on timeout, so it is over
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.results[name] = ProbeResult(status, str(detail), latency_ms, time.time())
+
+    def _run_sync_probe(self, name: str, probe, loop: asyncio.AbstractEventLoop):
+        # A timeout cannot stop the thread: the probe stays in flight until it returns.
+        try:
+            return probe()
+        finally:
+            with contextlib.suppress(RuntimeError):  # The loop is gone
+                loop.call_soon_threadsafe(self._in_flight.discard, name)
+
+    async def run_once(self) -> dict[str, ProbeResult]:
+        """Runs every idle probe concurrently and returns the cached results."""
+        await asyncio.gather(*(
+            self._run_probe(name, probe)
+            for name, probe in self.probes.items()
+            if name not in self._in_flight
+        ))
+        return self.results
+
+    async def run_forever(self, interval: float = 10.0) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(interval)
+
+
+def discover_components(package_dir: str) -> dict[str, list[type]]:
+    """
+    Imports every module in a backend package directory (e.g. "backend/services")
+    and returns the component classes each one defines, keyed by module file
+    stem. Components follow the panel convention: a `STATUS` attribute or a
+    `health_check()` method. Modules defining none (helpers such as a cache)
+    are left out.
+
+    Modules that fail to import are mapped to an empty list so callers can
+    fall back to static analysis.
+    """
+    package = package_dir.replace(os.sep, ".").strip(".")
+    components = {}
+    for filename in sorted(os.listdir(package_dir)):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        stem = filename[:-3]
+        try:
+            module = importlib.import_module(f"{package}.{stem}")
+        except Exception:
+            components[stem] = []
+            continue
+        classes = [
+            obj for obj in vars(module).values()
+            if inspect.isclass(obj) and obj.__module__ == module.__name__
+            and (hasattr(obj, "STATUS") or hasattr(obj, "health_check"))
+        ]
+        if classes:
+            components[stem] = classes
+    return components
@@ -0,0 +1,389 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from flow_system.metrics import LatencyHistogram
+from flow_system.registry import split_flow_name
+
+# Used when no --call / --mix is given. Both flows render templates, so the
+# server needs the sample app's views (the --serve default).
+DEFAULT_MIX = [
+    {"flow": "fleet.vehicles.index", "verb": "get", "params": {"limit": 10}, "weight": 3},
+    {"flow": "fleet.vehicles.status_synch", "verb": "post", "params": {}, "weight": 1},
+]
+PERCENTILES = (50, 90, 95, 99, 99.9)
+SAMPLE_TEMPLATES = os.path.join("apps", "sample_app_1", "ext_frontend_4_htmx_spa", "views")
+
+
+# -------------------------------------------------
+# HTTP
+# -------------------------------------------------
+
+class FlowConnection:
+    """
+    One keep-alive HTTP/1.1 connection posting to `/___flow___`.
+
+    Written on asyncio streams rather than a client library so the harness
+    adds as little overhead as possible to what it measures.
+    """
+
+    def __init__(self, host: str, port: int, path: str = "/___flow___"):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, body: bytes) -> tuple[int, int]:
+        """Sends one call and returns (status, response bytes)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        try:
+            return await self._read_response()
+        except Exception:
+            self.close()  # Never reuse a connection left mid-response
+            raise
+
+    async def _read_response(self) -> tuple[int, int]:
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        length, chunked, keep_alive = 0, False, True
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                keep_alive = value != "close"
+
+        if chunked:
+            size = 0
+            while True:
+                chunk_size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+                if chunk_size == 0:
+                    break
+        else:
+            await self.reader.readexactly(length)
+            size = length
+        if not keep_alive:
+            self.close()
+        return status, size
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+# -------------------------------------------------
+# Workload
+# -------------------------------------------------
+
+def parse_call(spec: str) -> dict:
+    """
+    Parses a --call spec: "flow[.verb][*weight][=params-json]".
+    Example: 'products.index.get*3={"query": "shoe"}'
+    """
+    name, _, params = spec.partition("=")
+    name, _, weight = name.partition("*")
+    flow_name, verb = split_flow_name(name.strip())
+    return {
+        "flow": flow_name,
+        "verb": verb or "get",
+        "params": json.loads(params) if params else {},
+        "weight": float(weight or 1),
+    }
+
+
+class Workload:
+    """A weighted mix of flow calls with their request bodies pre-encoded."""
+
+    def __init__(self, calls: list[dict], seed: int | None = None):
+        if not calls:
+            raise ValueError("The workload needs at least one call")
+        self.calls = calls
+        self.labels = [f"{c['flow']}.{c['verb']}" for c in calls]
+        self.bodies = [
+            json.dumps({"flow": c["flow"], "verb": c["verb"], "params": c.get("params", {})}).encode()
+            for c in calls
+        ]
+        self.weights = [float(c.get("weight", 1)) for c in calls]
+        self.random = random.Random(seed)
+
+    def pick(self) -> int:
+        return self.random.choices(range(len(self.calls)), self.weights)[0]
+
+
+class StepResult:
+    """Latencies, status codes and errors collected during one load step."""
+
+    def __init__(self, labels: list[str]):
+        self.labels = labels
+        self.histogram = LatencyHistogram()
+        self.by_call = [LatencyHistogram() for _ in labels]
+        self.errors_by_call = [0] * len(labels)
+        self.statuses: dict[str, int] = {}
+        self.errors = 0
+        self.bytes = 0
+        self.max_us = 0
+
+    def record(self, index: int, latency: float, status: int | None, size: int = 0) -> None:
+        latency_us = latency * 1_000_000
+        self.histogram.record(latency_us)
+        self.by_call[index].record(latency_us)
+        self.max_us = max(self.max_us, latency_us)
+        self.bytes += size
+        key = str(status) if status is not None else "connection_error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+            self.errors_by_call[index] += 1
+
+    def to_dict(self, elapsed: float) -> dict:
+        requests = self.histogram.total
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "throughput_rps": round(requests / elapsed, 1) if elapsed > 0 else 0.0,
+            "bytes_per_second": round(self.bytes / elapsed) if elapsed > 0 else 0,
+            "latency_ms": _latency_summary(self.histogram, self.max_us),
+            "statuses": self.statuses,
+            "calls": {
+                label: {
+                    "requests": hist.total,
+                    "errors": errors,
+                    "latency_ms": _latency_summary(hist),
+                }
+                for label, hist, errors in zip(self.labels, self.by_call, self.errors_by_call)
+            },
+        }
+
+
+def _latency_summary(histogram: LatencyHistogram, max_us: float | None = None) -> dict:
+    summary = {f"p{p:g}": round(histogram.percentile(p) / 1000, 3) for p in PERCENTILES}
+    if max_us is not None:
+        summary["max"] = round(max_us / 1000, 3)
+    return summary
+
+
+# -------------------------------------------------
+# Load models
+# -------------------------------------------------
+
+async def _send(conn: FlowConnection, workload: Workload, result: StepResult | None, started: float) -> None:
+    """Issues one call; latency is measured from `started` (the intended send time in open loop)."""
+    index = workload.pick()
+    try:
+        status, size = await conn.request(workload.bodies[index])
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        status, size = None, 0
+    if result is not None:
+        result.record(index, time.perf_counter() - started, status, size)
+
+
+async def run_closed(target: tuple[str, int], workload: Workload, concurrency: int,
+                     duration: float, warmup: float) -> dict:
+    """
+    Closed loop: `concurrency` clients each send their next call as soon as
+    the previous one answers. Measures the throughput the server sustains.
+    """
+    result = StepResult(workload.labels)
+    measuring = {"on": False}
+    deadline = time.perf_counter() + warmup + duration
+
+    async def client():
+        conn = FlowConnection(*target)
+        try:
+            while time.perf_counter() < deadline:
+                await _send(conn, workload, result if measuring["on"] else None, time.perf_counter())
+        finally:
+            conn.close()
+
+    tasks = [asyncio.create_task(client()) for _ in range(concurrency)]
+    await asyncio.sleep(warmup)
+    measuring["on"] = True
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return {"mode": "closed", "concurrency": concurrency,
+            **result.to_dict(time.perf_counter() - started)}
+
+
+async def run_open(target: tuple[str, int], workload: Workload, rate: float, duration: float,
+                   warmup: float, max_in_flight: int = 1000) -> dict:
+    """
+    Open loop: calls arrive as a Poisson process at `rate` per second whether
+    or not earlier ones have answered. Latency counts from the scheduled
+    arrival, so a stalled server shows up as queueing instead of being hidden
+    by clients that politely wait (coordinated omission).
+    """
+    result = StepResult(workload.labels)
+    idle: list[FlowConnection] = []
+    in_flight: set[asyncio.Task] = set()
+    dropped = 0
+    arrivals = random.Random(workload.random.random())
+
+    async def fire(scheduled: float, measure: bool):
+        conn = idle.pop() if idle else FlowConnection(*target)
+        try:
+            await _send(conn, workload, result if measure else None, scheduled)
+        finally:
+            idle.append(conn)
+
+    begin = time.perf_counter()
+    measure_from = begin + warmup
+    deadline = measure_from + duration
+    next_at = begin
+    while next_at < deadline:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        measure = next_at >= measure_from
+        if len(in_flight) >= max_in_flight:
+            dropped += measure
+        else:
+            task = asyncio.create_task(fire(next_at, measure))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_at += arrivals.expovariate(rate)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    for conn in idle:
+        conn.close()
+    report = result.to_dict(duration)
+    report["dropped"] = dropped
+    return {"mode": "open", "rate": rate, "max_in_flight": max_in_flight, **report}
+
+
+# -------------------------------------------------
+# Local server
+# -------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_server(templates: list[str], port: int, timeout: float = 15.0, workers: int = 1) -> subprocess.Popen:
+    """Starts `python -m flow_system` in a subprocess and waits until it accepts connections."""
+    cmd = [sys.executable, "-m", "flow_system", "--port", str(port), "--workers", str(workers)]
+    for directory in templates:
+        cmd += ["--templates", directory]
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Flow server exited: {process.stderr.read().decode(errors='replace')}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"Flow server did not start on port {port} within {timeout:g}s")
+
+
+def _parse_list(raw: str, cast) -> list:
+    return [cast(v) for v in raw.split(",") if v.strip()]
+
+
+def main():
+    """
+    Drives the flow runtime with a weighted mix of calls and prints a JSON report.
+
+    Examples:
+        python -m flow_system.loadtest --serve --concurrency 1,8,32,128
+        python -m flow_system.loadtest --url http://127.0.0.1:8000 --mode open --rate 200,400,800
+        python -m flow_system.loadtest --serve --call 'products.index.get*3={"query": "shoe"}' \\
+            --call fleet.vehicles.status_synch.post -o report.json
+    """
+    parser = argparse.ArgumentParser(description="Load-test the /___flow___ endpoint.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to test.")
+    parser.add_argument("--serve", action="store_true", help="Start a local flow server for the run.")
+    parser.add_argument("--templates", action="append", default=[],
+                        help=f"Template directory for --serve (default: {SAMPLE_TEMPLATES}).")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes for --serve.")
+    parser.add_argument("--call", action="append", default=[],
+                        help="flow[.verb][*weight][=params-json] (repeatable).")
+    parser.add_argument("--mix", help="JSON file with a list of {flow, verb, params, weight}.")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Closed loop sweep, comma separated.")
+    parser.add_argument("--rate", default="100,200,400", help="Open loop arrivals/s sweep, comma separated.")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open loop cap on outstanding calls.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per step.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each step.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", help="Write the report here instead of stdout.")
+    args = parser.parse_args()
+
+    if args.mix:
+        with open(args.mix) as f:
+            calls = json.load(f)
+    else:
+        calls = [parse_call(spec) for spec in args.call] or DEFAULT_MIX
+    workload = Workload(calls, args.seed)
+
+    server = None
+    if args.serve:
+        port = _free_port()
+        server = start_local_server(args.templates or [SAMPLE_TEMPLATES], port, workers=args.workers)
+        target = ("127.0.0.1", port)
+    else:
+        url = urlsplit(args.url)
+        target = (url.hostname or "127.0.0.1", url.port or 80)
+
+    steps = []
+    try:
+        if args.mode == "closed":
+            for concurrency in _parse_list(args.concurrency, int):
+                steps.append(asyncio.run(run_closed(target, workload, concurrency, args.duration, args.warmup)))
+                print(f"closed c={concurrency}: {steps[-1]['throughput_rps']} req/s", file=sys.stderr)
+        else:
+            for rate in _parse_list(args.rate, float):
+                steps.append(asyncio.run(
+                    run_open(target, workload, rate, args.duration, args.warmup, args.max_in_flight)
+                ))
+                print(f"open r={rate:g}: p99 {steps[-1]['latency_ms']['p99']} ms", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "target": f"{target[0]}:{target[1]}",
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": {"cpus": os.cpu_count(), "python": sys.version.split()[0]},
+        "config": {"mode": args.mode, "duration": args.duration, "warmup": args.warmup,
+                   "mix": workload.calls},
+        "steps": steps,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
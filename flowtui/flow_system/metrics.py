@@ -0,0 +1,192 @@
+import glob
+import json
+import math
+import os
+import time
+
+# Where runtimes persist their stats and where the TUI reads them from.
+METRICS_DIR = os.environ.get("FLOWTUI_METRICS_DIR", os.path.join(".flowtui", "metrics"))
+# Key of the calls naming a flow or verb that does not exist. Those names come
+# from clients, so they share one entry instead of adding one each.
+UNRESOLVED = ("(unresolved)", "*")
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies in microseconds.
+
+    Values are bucketed log-linearly: below 2*SUB_BUCKETS every value has its
+    own bucket, above it each power-of-two range is split into SUB_BUCKETS
+    linear slots. The relative error stays under 1/SUB_BUCKETS (~3%) over the
+    whole range, recording is O(1), and only non-empty buckets are stored.
+    """
+
+    SUB_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BITS
+
+    def __init__(self, counts: dict[int, int] | None = None):
+        self.counts: dict[int, int] = counts or {}
+        self.total = sum(self.counts.values())
+
+    @classmethod
+    def bucket_of(cls, value_us: int) -> int:
+        exp = value_us.bit_length() - cls.SUB_BITS - 1
+        if exp <= 0:
+            return value_us
+        top = value_us >> exp  # Always in [SUB_BUCKETS, 2 * SUB_BUCKETS)
+        return 2 * cls.SUB_BUCKETS + (exp - 1) * cls.SUB_BUCKETS + (top - cls.SUB_BUCKETS)
+
+    @classmethod
+    def bucket_value(cls, index: int) -> float:
+        """Midpoint of a bucket's value range."""
+        if index < 2 * cls.SUB_BUCKETS:
+            return float(index)
+        exp, offset = divmod(index - 2 * cls.SUB_BUCKETS, cls.SUB_BUCKETS)
+        exp += 1
+        top = cls.SUB_BUCKETS + offset
+        return ((top << exp) + ((top + 1) << exp) - 1) / 2
+
+    def record(self, value_us: int) -> None:
+        index = self.bucket_of(max(0, int(value_us)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+
+    def percentile(self, p: float) -> float:
+        """Latency (µs) below which `p` percent of the recorded calls fall."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return self.bucket_value(index)
+        return self.bucket_value(max(self.counts))
+
+
+class FlowStats:
+    """Counters and latency histogram for one (flow, verb) pair."""
+
+    def __init__(self, calls: int = 0, errors: int = 0, started_at: float | None = None,
+                 updated_at: float | None = None, histogram: LatencyHistogram | None = None):
+        self.calls = calls
+        self.errors = errors
+        self.started_at = started_at or time.time()
+        self.updated_at = updated_at or self.started_at
+        self.histogram = histogram or LatencyHistogram()
+
+    @property
+    def throughput(self) -> float:
+        """Average calls per second since the first recorded call."""
+        elapsed = self.updated_at - self.started_at
+        return self.calls / elapsed if elapsed > 0 else float(self.calls)
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "histogram": {str(k): v for k, v in self.histogram.counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FlowStats":
+        histogram = LatencyHistogram({int(k): v for k, v in data.get("histogram", {}).items()})
+        return cls(data["calls"], data["errors"], data["started_at"], data["updated_at"], histogram)
+
+    def merge(self, other: "FlowStats") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.started_at = min(self.started_at, other.started_at)
+        self.updated_at = max(self.updated_at, other.updated_at)
+        self.histogram.merge(other.histogram)
+
+
+class FlowMetrics:
+    """
+    Records per-(flow, verb) call counts, errors and latencies.
+
+    Recording is a couple of dict operations. Stats are flushed to a JSON file
+    per process (so several workers never clobber each other) at most every
+    `flush_interval` seconds, from the recording path itself.
+    """
+
+    def __init__(self, metrics_dir: str = METRICS_DIR, flush_interval: float = 5.0):
+        self.metrics_dir = metrics_dir
+        self.flush_interval = flush_interval
+        self.stats: dict[tuple[str, str], FlowStats] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, flow_name: str, verb: str, seconds: float, error: bool = False) -> None:
+        """Records a call of a resolved flow; see record_unresolved() for the others."""
+        self._record((flow_name, verb.lower()), seconds, error)
+
+    def record_unresolved(self, seconds: float) -> None:
+        self._record(UNRESOLVED, seconds, True)
+
+    def _record(self, key: tuple[str, str], seconds: float, error: bool) -> None:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = FlowStats()
+        stats.calls += 1
+        stats.errors += error
+        stats.updated_at = time.time()
+        stats.histogram.record(seconds * 1_000_000)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Atomically rewrites this process's metrics file."""
+        self._last_flush = time.monotonic()
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        path = os.path.join(self.metrics_dir, f"flows-{os.getpid()}.json")
+        data = {f"{flow}:{verb}": stats.to_dict() for (flow, verb), stats in self.stats.items()}
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Someone else's process
+    return True
+
+
+def load_flow_stats(metrics_dir: str = METRICS_DIR) -> dict[tuple[str, str], FlowStats]:
+    """
+    Reads and merges the metrics files of every running runtime process.
+    Files left by processes that have exited are deleted.
+    """
+    merged: dict[tuple[str, str], FlowStats] = {}
+    for path in glob.glob(os.path.join(metrics_dir, "flows-*.json")):
+        pid = os.path.basename(path)[len("flows-"):-len(".json")]
+        if pid.isdigit() and not _process_alive(int(pid)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for key, raw in data.items():
+            flow, _, verb = key.rpartition(":")
+            stats = FlowStats.from_dict(raw)
+            if (flow, verb) in merged:
+                merged[(flow, verb)].merge(stats)
+            else:
+                merged[(flow, verb)] = stats
+    return merged
@@ -0,0 +1,67 @@
+import base64
+import bisect
+import json
+from itertools import islice
+from typing import Any, Callable, Iterable, Sequence
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that was not issued by us."""
+
+
+def encode_cursor(key: Any) -> str:
+    """
+    Encodes the sort key of the last item of a page into an opaque cursor.
+
+    Clients must treat cursors as opaque strings; only `decode_cursor` may
+    look inside them.
+    """
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str | None, key_type: type | tuple[type, ...] | None = None) -> Any:
+    """
+    Returns the sort key stored in a cursor, or None for the first page.
+    With `key_type`, a key of any other type is rejected too: comparing it
+    with the real keys would fail (or silently match nothing).
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor '{cursor}'") from e
+    # JSON turns tuples into lists; keys must compare like the originals.
+    key = tuple(key) if isinstance(key, list) else key
+    if key_type is not None and not isinstance(key, key_type):
+        raise InvalidCursor(f"Malformed cursor '{cursor}'")
+    return key
+
+
+def keyset_start(rows: Sequence, key: Callable, after: Any) -> int:
+    """
+    Index of the first row strictly after `after` in `rows` sorted by `key`.
+
+    This is a binary search, so deep pages cost the same as the first one,
+    unlike offset pagination which has to walk past every skipped row.
+    """
+    if after is None:
+        return 0
+    return bisect.bisect_right(rows, after, key=key)
+
+
+def take_page(rows: Iterable, key: Callable, limit: int) -> tuple[list, str | None]:
+    """
+    Takes one page from an iterator of rows already positioned by `keyset_start`.
+
+    Only `limit + 1` rows are pulled (the extra one tells us whether a next
+    page exists), so filtered scans stop as soon as the page is full.
+    Returns the page and the cursor for the next one (None on the last page).
+    """
+    page = list(islice(rows, limit + 1))
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(key(page[-1]))
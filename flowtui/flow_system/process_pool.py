@@ -0,0 +1,195 @@
+"""
+Process-pool execution for CPU-bound flows.
+
+Sync verbs normally run in the event loop's thread pool, which is fine for
+flows that wait on I/O but serializes CPU-bound ones on the GIL. A flow
+that declares `executor = "process"` runs in a pool of worker processes
+instead, started with the first such call and kept warm.
+
+Arguments and results cross the process boundary pickled, except for large
+NumPy arrays (the usual output of analytics flows): a worker copies those
+into a `multiprocessing.shared_memory` segment and sends only its name,
+shape and dtype; the runtime copies the array out and frees the segment.
+That avoids pickling the data and pushing it through the pool's pipe.
+
+Each process flow may use at most `max_concurrency` workers at a time
+(default: all but one), so one busy flow cannot starve the others.
+"""
+import asyncio
+import inspect
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from pydantic import BaseModel
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; without it results are simply pickled
+    numpy = None
+
+# Arrays smaller than this are cheaper to pickle than to set up a segment for.
+SHARED_MEMORY_MIN_BYTES = 256 * 1024
+
+
+class SharedArray:
+    """Stands in for an array placed in shared memory by a worker."""
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name: str, shape: tuple, dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    @classmethod
+    def publish(cls, array) -> "SharedArray":
+        """Copies `array` into a new segment. The receiving side unlinks it."""
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        try:
+            numpy.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+            return cls(segment.name, array.shape, array.dtype.str)
+        finally:
+            segment.close()
+
+    def collect(self):
+        """Copies the array out of its segment and frees the segment."""
+        segment = shared_memory.SharedMemory(name=self.name)
+        try:
+            return numpy.ndarray(self.shape, numpy.dtype(self.dtype), buffer=segment.buf).copy()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def discard(self) -> None:
+        """Frees the segment without reading it."""
+        try:
+            segment = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+
+def _map_arrays(value, convert):
+    """Applies `convert` to the arrays / SharedArrays inside dicts, lists, tuples and models."""
+    if isinstance(value, dict):
+        return {key: _map_arrays(item, convert) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_map_arrays(item, convert) for item in value)
+    if isinstance(value, BaseModel):
+        updates = {}
+        for name in type(value).model_fields:
+            field = getattr(value, name)
+            converted = _map_arrays(field, convert)
+            if converted is not field:
+                updates[name] = converted
+        return value.model_copy(update=updates) if updates else value
+    return convert(value)
+
+
+def export_arrays(result):
+    """Worker side: moves large arrays in a result to shared memory."""
+    if numpy is None:
+        return result
+
+    def convert(value):
+        if isinstance(value, numpy.ndarray) and value.nbytes >= SHARED_MEMORY_MIN_BYTES and not value.dtype.hasobject:
+            return SharedArray.publish(value)
+        return value
+
+    return _map_arrays(result, convert)
+
+
+def import_arrays(result):
+    """Runtime side: replaces SharedArrays with the arrays they hold."""
+    return _map_arrays(result, lambda value: value.collect() if isinstance(value, SharedArray) else value)
+
+
+def discard_arrays(future) -> None:
+    """Frees the segments of a finished call whose result nobody collects."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _map_arrays(future.result(), lambda value: value.discard() if isinstance(value, SharedArray) else value)
+
+
+def run_flow(flow_cls, verb: str, flow_input):
+    """Runs a flow verb in a worker process (flow classes pickle by reference)."""
+    result = getattr(flow_cls(), verb)(flow_input)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return export_arrays(result)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+class ProcessFlowPool:
+    """The worker processes behind `executor = "process"` flows."""
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._warming: asyncio.Future | None = None  # Warm-up started by run(), once per pool
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # "spawn": the server runs threads, which makes forking unsafe.
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._pool
+
+    def warm(self) -> None:
+        """Starts every worker now rather than on the first calls (blocks until they are up)."""
+        pool = self._executor()
+        for future in [pool.submit(_warm_up) for _ in range(self.max_workers)]:
+            future.result()
+
+    def limit_for(self, flow_name: str, max_concurrency: int | None) -> asyncio.Semaphore:
+        semaphore = self._limits.get(flow_name)
+        if semaphore is None:
+            limit = max_concurrency or max(1, self.max_workers - 1)
+            semaphore = self._limits[flow_name] = asyncio.Semaphore(min(limit, self.max_workers))
+        return semaphore
+
+    async def run(self, flow_name: str, flow_cls, verb: str, flow_input):
+        if self._pool is None and self._warming is None:
+            # Started with the first process flow call rather than with the
+            # server, which may serve none; the other workers start alongside.
+            self._warming = asyncio.get_running_loop().run_in_executor(None, self.warm)
+            self._warming.add_done_callback(self._warmed)
+        async with self.limit_for(flow_name, flow_cls.max_concurrency):
+            future = self._executor().submit(run_flow, flow_cls, verb, flow_input)
+            try:
+                result = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # A running call cannot be stopped: free its arrays once it returns.
+                future.add_done_callback(discard_arrays)
+                raise
+        return import_arrays(result)
+
+    @staticmethod
+    def _warmed(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            # The calls themselves report a broken pool; this only keeps the reason.
+            print(f"Process pool warm-up failed: {future.exception()!r}")
+
+    def restart(self) -> None:
+        """Replaces the workers, e.g. after flow modules were reloaded in this process."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._warming = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=False)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._warming = None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,203 @@
+import argparse
+import fcntl
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+PROFILE_DIR = os.environ.get("FLOWTUI_PROFILE_DIR", os.path.join(".flowtui", "profiles"))
+# Written by `python -m flow_system.profiler` and watched by running runtimes.
+CONTROL_FILE = os.path.join(PROFILE_DIR, "control.json")
+
+
+def profile_path(flow_name: str, verb: str, profile_dir: str = PROFILE_DIR) -> str:
+    """Collapsed-stack file for one flow verb, e.g. "products.index.get.folded"."""
+    return os.path.join(profile_dir, f"{flow_name}.{verb.lower()}.folded")
+
+
+def load_folded(path: str) -> dict[str, int]:
+    """Reads a collapsed-stack file ("frame;frame;frame count" per line)."""
+    stacks = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack and count.isdigit():
+                    stacks[stack] = stacks.get(stack, 0) + int(count)
+    except OSError:
+        pass
+    return stacks
+
+
+class SamplingProfiler:
+    """
+    A low-overhead sampling profiler for one flow at a time.
+
+    The target is read from a small control file, re-checked at most once per
+    second, so profiling can be switched on and off in a running process.
+    Selected calls register the thread running the verb; a single background
+    thread samples those threads' stacks every `interval` seconds and
+    aggregates them into collapsed stacks, which are merged into a
+    `.folded` file (the input format of flamegraph tools). Only sync verbs,
+    which have a worker thread to themselves, can be profiled: the event loop
+    thread of an async verb runs other calls whenever it awaits.
+    Calls that are not profiled pay for a clock read and a string comparison.
+    """
+
+    CONTROL_CHECK_SECONDS = 1.0
+    FLUSH_SECONDS = 2.0
+
+    def __init__(self, profile_dir: str = PROFILE_DIR):
+        self.profile_dir = profile_dir
+        self.control_file = os.path.join(profile_dir, "control.json")
+        self.target: str | None = None  # "products.index.get"
+        self.rate = 1.0
+        self.interval = 0.005
+        self._control_mtime = None
+        self._control_checked = 0.0
+        self._active: dict[int, str] = {}  # thread id -> target key
+        self._stacks: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+        self._last_flush = time.monotonic()
+
+    # --- Control ---
+
+    def _refresh_control(self) -> None:
+        now = time.monotonic()
+        if now - self._control_checked < self.CONTROL_CHECK_SECONDS:
+            return
+        self._control_checked = now
+        try:
+            mtime = os.stat(self.control_file).st_mtime
+        except OSError:
+            self.target = None
+            self._control_mtime = None
+            return
+        if mtime == self._control_mtime:
+            return
+        self._control_mtime = mtime
+        try:
+            with open(self.control_file) as f:
+                control = json.load(f)
+        except (OSError, ValueError):
+            self.target = None
+            return
+        self.target = control.get("flow")
+        self.rate = float(control.get("rate", 1.0))
+        self.interval = float(control.get("interval_ms", 5)) / 1000
+
+    def should_profile(self, flow_name: str, verb: str) -> bool:
+        self._refresh_control()
+        if self.target is None or self.target != f"{flow_name}.{verb.lower()}":
+            return False
+        return self.rate >= 1.0 or random.random() < self.rate
+
+    # --- Sampling ---
+
+    def wrap(self, flow_name: str, verb: str, fn):
+        """Wraps a sync verb so the thread running it is sampled."""
+        key = f"{flow_name}.{verb.lower()}"
+
+        def profiled(*args, **kwargs):
+            self._enter(key)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit()
+        return profiled
+
+    def _enter(self, key: str) -> None:
+        with self._lock:
+            self._active[threading.get_ident()] = key
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, name="flow-profiler", daemon=True)
+                self._sampler.start()
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+        if time.monotonic() - self._last_flush >= self.FLUSH_SECONDS:
+            self.flush()
+
+    def _sample_loop(self) -> None:
+        while True:
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    # Nothing to sample: let the thread end until the next profiled call.
+                    self._sampler = None
+                    return
+            frames = sys._current_frames()
+            samples = []
+            for thread_id, key in active.items():
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    if code.co_filename == __file__:
+                        break  # Frames below the wrapper are thread/event loop plumbing
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    samples.append((key, ";".join(reversed(stack))))
+            del frames
+            with self._lock:
+                for key, collapsed in samples:
+                    counts = self._stacks.setdefault(key, {})
+                    counts[collapsed] = counts.get(collapsed, 0) + 1
+            time.sleep(self.interval)
+
+    def flush(self) -> None:
+        """Merges the collected samples into the .folded files."""
+        self._last_flush = time.monotonic()
+        with self._lock:
+            collected, self._stacks = self._stacks, {}
+        if not collected:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        for key, counts in collected.items():
+            flow_name, _, verb = key.rpartition(".")
+            path = profile_path(flow_name, verb, self.profile_dir)
+            # Other worker processes merge into the same file.
+            with open(path + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                merged = load_folded(path)
+                for stack, count in counts.items():
+                    merged[stack] = merged.get(stack, 0) + count
+                with open(path + ".tmp", "w") as f:
+                    f.writelines(f"{stack} {count}\n" for stack, count in merged.items())
+                os.replace(path + ".tmp", path)
+
+
+def main():
+    """
+    Switches profiling on or off for running flow runtimes.
+
+    Examples:
+        python -m flow_system.profiler products.index.get --rate 10
+        python -m flow_system.profiler --off
+    """
+    parser = argparse.ArgumentParser(description="Toggle the flow sampling profiler.")
+    parser.add_argument("flow", nargs="?", help="Flow and verb, e.g. products.index.get")
+    parser.add_argument("--rate", type=float, default=100.0, help="Percent of calls to profile.")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Sampling interval.")
+    parser.add_argument("--off", action="store_true", help="Stop profiling.")
+    args = parser.parse_args()
+
+    if args.off or not args.flow:
+        if os.path.exists(CONTROL_FILE):
+            os.remove(CONTROL_FILE)
+        print("Profiling disabled.")
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(CONTROL_FILE, "w") as f:
+        json.dump({"flow": args.flow, "rate": args.rate / 100, "interval_ms": args.interval_ms}, f)
+    print(f"Profiling {args.flow} at {args.rate:g}% of calls -> {PROFILE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
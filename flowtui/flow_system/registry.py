@@ -0,0 +1,93 @@
+import importlib
+
+from flow_system.base import BaseFlow
+
+
+class FlowNotFound(LookupError):
+    """Raised when a flow name does not resolve to a BaseFlow class."""
+
+
+class VerbNotImplemented(LookupError):
+    """Raised when a flow exists but does not implement the requested verb (or streaming)."""
+
+
+def split_flow_name(name: str) -> tuple[str, str | None]:
+    """
+    Splits an action string into (flow_name, verb).
+
+    Both "products.index" and "products.index.get" are accepted; the verb is
+    None when the last segment is not a known verb.
+    """
+    head, _, last = name.rpartition(".")
+    if head and last.lower() in BaseFlow.VERBS:
+        return head, last.lower()
+    return name, None
+
+
+class FlowRegistry:
+    """
+    Resolves dotted flow names to BaseFlow classes.
+
+    Convention: "fleet.vehicles.status_synch" lives in the module
+    `backend.flows.fleet.vehicles`, inside the domain class `Vehicles`,
+    as the inner class `status_synch`.
+    """
+
+    def __init__(self, package: str = "backend.flows"):
+        self.package = package
+        self._cache: dict[str, type[BaseFlow]] = {}
+
+    def flow_name_for(self, file_path: str, flow_class_name: str) -> str:
+        """
+        Builds the runtime flow name of a flow class defined in a file.
+        "backend/flows/fleet/vehicles.py" + "index" -> "fleet.vehicles.index"
+        """
+        module = file_path.removesuffix(".py").replace("\\", "/").replace("/", ".")
+        prefix = self.package + "."
+        domain = module.split(prefix, 1)[1] if prefix in module else module.rpartition(".")[2]
+        return f"{domain}.{flow_class_name}"
+
+    def domain_of(self, flow_name: str) -> str:
+        """Returns the domain part of a flow name ("fleet.vehicles.index" -> "fleet.vehicles")."""
+        return flow_name.rpartition(".")[0]
+
+    def resolve(self, flow_name: str) -> type[BaseFlow]:
+        flow_cls = self._cache.get(flow_name)
+        if flow_cls is not None:
+            return flow_cls
+
+        domain, _, inner = flow_name.rpartition(".")
+        if not domain or not inner:
+            raise FlowNotFound(f"Invalid flow name '{flow_name}'")
+        try:
+            module = importlib.import_module(f"{self.package}.{domain}")
+        except ModuleNotFoundError as e:
+            raise FlowNotFound(f"No flow module for '{flow_name}': {e}") from e
+
+        domain_cls = getattr(module, domain.rpartition(".")[2].capitalize(), None)
+        flow_cls = getattr(domain_cls, inner, None)
+        if not (isinstance(flow_cls, type) and issubclass(flow_cls, BaseFlow)):
+            raise FlowNotFound(f"'{flow_name}' is not a BaseFlow")
+
+        self._cache[flow_name] = flow_cls
+        return flow_cls
+
+    def invalidate_module(self, module_name: str) -> list[str]:
+        """Drops the cached flows defined in a module (after it was reloaded); returns their names."""
+        prefix = self.package + "."
+        if not module_name.startswith(prefix):
+            return []
+        domain = module_name[len(prefix):]
+        dropped = [name for name in self._cache if self.domain_of(name) == domain]
+        for name in dropped:
+            del self._cache[name]
+        return dropped
+
+    def flows_using_template(self, template: str) -> list[str]:
+        """Names of the resolved flows that render `template`."""
+        return [name for name, flow_cls in self._cache.items()
+                if template in (flow_cls.template, flow_cls.item_template)]
+
+    def topics_for(self, flow_name: str) -> tuple[str, ...]:
+        """Returns the change topics a flow depends on."""
+        return self.resolve(flow_name).watches or (self.domain_of(flow_name),)
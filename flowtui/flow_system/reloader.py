@@ -0,0 +1,231 @@
+"""
+Hot reload of flow modules for the dev server.
+
+Restarting uvicorn after every edit re-imports the whole backend and loses
+its in-memory state. The reloader instead polls the flow, contract and
+template files and, for a changed module, reloads just that module and the
+modules of the project that import it (directly or not), dependencies
+first. Only the affected flows are dropped from the registry's cache; the
+next call resolves them again. A module outside the watched packages
+(services, providers, models) is reloaded only when it imports a reloaded
+one: a service that builds contract models must build the new classes, or
+flows would reject its results. The others are left alone, so their caches
+and connection pools survive.
+
+Templates need no reloading: Jinja re-checks a template's mtime when it is
+used. For both kinds of change, subscribers of the affected flows are
+notified so open pages re-render.
+"""
+import ast
+import importlib
+import os
+import sys
+import threading
+import time
+
+WATCHED_PACKAGES = ("backend.flows", "backend.contracts")
+TEMPLATE_SUFFIXES = (".html", ".jinja", ".j2")
+
+
+def module_name_for(file_path: str) -> str:
+    """"backend/flows/fleet/vehicles.py" -> "backend.flows.fleet.vehicles" (packages drop "__init__")."""
+    module = os.path.relpath(file_path).removesuffix(".py").replace("\\", "/").replace("/", ".")
+    return module.removesuffix(".__init__")
+
+
+def imported_modules(module) -> set[str]:
+    """Names of the already imported modules that `module`'s source imports."""
+    path = getattr(module, "__file__", None)
+    if not path or not path.endswith(".py"):
+        return set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return set()
+
+    package = module.__name__ if hasattr(module, "__path__") else module.__name__.rpartition(".")[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{base}.{node.module}" if node.module else base
+            else:
+                base = node.module or ""
+            names.add(base)
+            # `from backend.contracts import fleet` imports a submodule.
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return {name for name in names if name in sys.modules}
+
+
+class ReloadResult:
+    def __init__(self):
+        self.modules: list[str] = []      # Reloaded, in order
+        self.templates: list[str] = []    # Changed template names
+        self.flows: list[str] = []        # Flow names dropped from the registry cache
+        self.errors: dict[str, str] = {}  # module -> error
+        self.seconds = 0.0
+
+    def __repr__(self) -> str:
+        return (f"ReloadResult({len(self.modules)} modules, {len(self.templates)} templates, "
+                f"{len(self.errors)} errors, {self.seconds * 1000:.1f} ms)")
+
+
+class HotReloader:
+    """
+    Watches a runtime's flow, contract and template files. `start()` polls
+    from a thread and hands each batch of changes to `schedule(fn)`, which
+    should run it where flows are resolved (the server passes the event
+    loop's call_soon_threadsafe). `check()` does one poll synchronously.
+    """
+
+    def __init__(self, runtime, packages: tuple[str, ...] = WATCHED_PACKAGES, interval: float = 0.25):
+        self.runtime = runtime
+        self.packages = packages
+        self.interval = interval
+        self.template_dirs = list(getattr(runtime.templates.loader, "searchpath", []))
+        self.last_result: ReloadResult | None = None
+        self._mtimes: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.poll()  # Record the current state: only later edits count
+
+    # --- Watching ---
+
+    def _watched_dirs(self) -> list[tuple[str, tuple[str, ...]]]:
+        dirs = [(package.replace(".", os.sep), (".py",)) for package in self.packages]
+        return dirs + [(path, TEMPLATE_SUFFIXES) for path in self.template_dirs]
+
+    def poll(self) -> list[str]:
+        """Returns the files that changed, appeared or disappeared since the last poll."""
+        changed, seen = [], set()
+        for root, suffixes in self._watched_dirs():
+            for dir_path, dir_names, file_names in os.walk(root):
+                dir_names[:] = [d for d in dir_names if d != "__pycache__"]
+                for file_name in file_names:
+                    if not file_name.endswith(suffixes):
+                        continue
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        mtime = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+                    seen.add(path)
+                    if self._mtimes.get(path) != mtime:
+                        self._mtimes[path] = mtime
+                        changed.append(path)
+        for path in [path for path in self._mtimes if path not in seen]:
+            del self._mtimes[path]
+            changed.append(path)
+        return changed
+
+    def check(self) -> ReloadResult | None:
+        changed = self.poll()
+        return self.apply(changed) if changed else None
+
+    def start(self, schedule=None) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        schedule = schedule or (lambda fn: fn())
+
+        def run():
+            while not self._stop.wait(self.interval):
+                changed = self.poll()
+                if changed:
+                    schedule(lambda: self.apply(changed))
+
+        self._thread = threading.Thread(target=run, name="flow-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # --- Reloading ---
+
+    def _watched(self, module_name: str) -> bool:
+        return any(module_name == p or module_name.startswith(p + ".") for p in self.packages)
+
+    def _in_project(self, module_name: str) -> bool:
+        """Whether the module belongs to the top-level package of a watched one ("backend")."""
+        return any(module_name.partition(".")[0] == p.partition(".")[0] for p in self.packages)
+
+    def _reload_order(self, changed: set[str]) -> list[str]:
+        """The changed modules plus the project modules depending on them, dependencies first."""
+        project = {name: module for name, module in list(sys.modules.items())
+                   if module is not None and self._in_project(name)}
+        imports = {name: imported_modules(module) & project.keys() for name, module in project.items()}
+        dependents: dict[str, set[str]] = {}
+        for name, deps in imports.items():
+            for dep in deps:
+                dependents.setdefault(dep, set()).add(name)
+
+        affected, stack = set(), [name for name in changed if name in project and self._watched(name)]
+        while stack:
+            name = stack.pop()
+            if name not in affected:
+                affected.add(name)
+                stack.extend(dependents.get(name, ()))
+
+        order, visiting = [], set()
+
+        def visit(name: str) -> None:
+            if name in visiting or name in order:
+                return
+            visiting.add(name)
+            for dep in sorted(imports[name] & affected):
+                visit(dep)
+            order.append(name)
+
+        for name in sorted(affected):
+            visit(name)
+        return order
+
+    def apply(self, changed_files: list[str]) -> ReloadResult:
+        """Reloads what `changed_files` affect and refreshes the affected flows."""
+        started = time.perf_counter()
+        result = ReloadResult()
+        registry = self.runtime.registry
+        topics: set[str] = set()
+
+        modules = {module_name_for(path) for path in changed_files if path.endswith(".py")}
+        for name in self._reload_order(modules):
+            try:
+                importlib.reload(sys.modules[name])
+            except Exception as e:  # Keep serving; the next save retries
+                result.errors[name] = f"{type(e).__name__}: {e}"
+            result.modules.append(name)
+            for flow_name in registry.invalidate_module(name):
+                result.flows.append(flow_name)
+                topics.add(registry.domain_of(flow_name))
+
+        for path in changed_files:
+            template = self._template_name(path)
+            if template is None:
+                continue
+            result.templates.append(template)
+            for flow_name in registry.flows_using_template(template):
+                topics.add(registry.domain_of(flow_name))
+
+        if result.modules and getattr(self.runtime, "process_pool", None) is not None:
+            self.runtime.process_pool.restart()  # Workers still run the old code
+        for topic in sorted(topics):
+            self.runtime.notify(topic)
+        result.seconds = time.perf_counter() - started
+        self.last_result = result
+        return result
+
+    def _template_name(self, path: str) -> str | None:
+        if not path.endswith(TEMPLATE_SUFFIXES):
+            return None
+        for template_dir in self.template_dirs:
+            relative = os.path.relpath(path, template_dir)
+            if not relative.startswith(".."):
+                return relative.replace(os.sep, "/")
+        return None
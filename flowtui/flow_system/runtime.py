@@ -0,0 +1,155 @@
+import asyncio
+import inspect
+import json
+import time
+from itertools import islice
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from pydantic import BaseModel
+
+from flow_system.metrics import FlowMetrics
+from flow_system.process_pool import ProcessFlowPool
+from flow_system.profiler import SamplingProfiler
+from flow_system.registry import FlowNotFound, FlowRegistry, VerbNotImplemented
+
+
+class FlowRuntime:
+    """
+    Executes flows and renders their output into HTML fragments.
+
+    This is the engine behind the universal `/___flow___` endpoint; the web
+    layer only translates HTTP into `run()` calls.
+    """
+
+    # Verbs that change state. After one of them succeeds, subscribers of the
+    # flow's topics are told their fragments are stale.
+    WRITE_VERBS = ("post", "put", "delete")
+    # Items pulled from a flow's stream() per worker-thread hop.
+    STREAM_BATCH_SIZE = 256
+
+    def __init__(self, template_dirs: list[str] | None = None, registry: FlowRegistry | None = None,
+                 metrics: FlowMetrics | None = None, profiler: SamplingProfiler | None = None,
+                 process_pool: ProcessFlowPool | None = None):
+        self.registry = registry or FlowRegistry()
+        self.metrics = metrics or FlowMetrics()
+        self.profiler = profiler or SamplingProfiler()
+        # Workers for `executor = "process"` flows; started on first use or by warm().
+        self.process_pool = process_pool or ProcessFlowPool()
+        self.templates = Environment(
+            loader=FileSystemLoader(template_dirs or []),
+            autoescape=select_autoescape(["html"]),
+        )
+        # Callbacks invoked with a topic name whenever a write verb succeeds.
+        self.change_listeners: list = []
+
+    # --- Execution ---
+
+    async def call(self, flow_name: str, verb: str, params: dict | None = None):
+        """Validates the params against the flow contract and runs the verb."""
+        started = time.perf_counter()
+        try:
+            result = await self._call(flow_name, verb, params)
+        except (FlowNotFound, VerbNotImplemented):
+            # Not under the requested names: any client could add keys without limit.
+            self.metrics.record_unresolved(time.perf_counter() - started)
+            raise
+        except Exception:
+            self.metrics.record(flow_name, verb, time.perf_counter() - started, error=True)
+            raise
+        self.metrics.record(flow_name, verb, time.perf_counter() - started)
+        return result
+
+    async def _call(self, flow_name: str, verb: str, params: dict | None):
+        flow_cls = self.registry.resolve(flow_name)
+        method = getattr(flow_cls(), verb.lower(), None)
+        if method is None:
+            raise VerbNotImplemented(f"Flow '{flow_name}' does not implement {verb.upper()}")
+
+        params = params or {}
+        flow_input = flow_cls.consumes(**params) if flow_cls.consumes else params
+
+        if flow_cls.executor == "process":
+            # CPU-bound: off the GIL, in a pool worker. (The sampling profiler
+            # only sees this process's threads.)
+            result = await self.process_pool.run(flow_name, flow_cls, verb.lower(), flow_input)
+        else:
+            if inspect.iscoroutinefunction(method):
+                # Not profiled: the loop thread's samples would include every
+                # other coroutine running while this one awaits.
+                result = await method(flow_input)
+            else:
+                if self.profiler.should_profile(flow_name, verb):
+                    method = self.profiler.wrap(flow_name, verb, method)
+                # Sync verbs may block (DB, services), so keep them off the event loop.
+                result = await asyncio.to_thread(method, flow_input)
+
+        if verb.lower() in self.WRITE_VERBS:
+            for topic in self.registry.topics_for(flow_name):
+                self.notify(topic)
+        return result
+
+    def render(self, flow_name: str, result) -> str:
+        """Renders a flow result through the flow's fragment template."""
+        flow_cls = self.registry.resolve(flow_name)
+        if isinstance(result, BaseModel):
+            # Shallow: keep nested models as objects for attribute access in templates.
+            context = {name: getattr(result, name) for name in type(result).model_fields}
+        else:
+            context = dict(result or {})
+
+        if not flow_cls.template:
+            return result.model_dump_json() if isinstance(result, BaseModel) else str(context)
+        return self.templates.get_template(flow_cls.template).render(**context)
+
+    async def run(self, flow_name: str, verb: str, params: dict | None = None) -> str:
+        """Calls a flow and returns its rendered fragment."""
+        result = await self.call(flow_name, verb, params)
+        return self.render(flow_name, result)
+
+    def stream(self, flow_name: str, params: dict | None = None, fmt: str = "ndjson"):
+        """
+        Serializes a list flow incrementally, as NDJSON lines or HTML chunks.
+
+        The flow's `stream()` iterator is consumed in bounded batches, so memory
+        per request stays flat no matter how many items the flow yields.
+        Validation happens here, before any bytes are sent; the returned async
+        generator only produces chunks.
+        """
+        flow_cls = self.registry.resolve(flow_name)
+        method = getattr(flow_cls(), "stream", None)
+        if method is None:
+            raise VerbNotImplemented(f"Flow '{flow_name}' does not support streaming")
+        if fmt == "html" and not flow_cls.item_template:
+            raise VerbNotImplemented(f"Flow '{flow_name}' has no item_template for HTML streaming")
+
+        params = params or {}
+        flow_input = flow_cls.consumes(**params) if flow_cls.consumes else params
+        item_template = self.templates.get_template(flow_cls.item_template) if fmt == "html" else None
+        # Called now, so errors it raises (a bad cursor) still become an error status.
+        items = iter(method(flow_input))
+
+        def serialize(item) -> str:
+            if item_template is not None:
+                return item_template.render(item=item)
+            if isinstance(item, BaseModel):
+                return item.model_dump_json() + "\n"
+            return json.dumps(item) + "\n"
+
+        async def chunks():
+            while True:
+                # Pull and serialize off the event loop: sources may block on I/O.
+                chunk = await asyncio.to_thread(
+                    lambda: "".join(serialize(item) for item in islice(items, self.STREAM_BATCH_SIZE))
+                )
+                if not chunk:
+                    return
+                yield chunk
+
+        return chunks()
+
+    # --- Change Notifications ---
+
+    def notify(self, topic: str) -> None:
+        """Signals that data behind a topic (e.g. "fleet.vehicles") changed."""
+        for listener in self.change_listeners:
+            listener(topic)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from pathlib import Path
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+
+from flow_system.process_pool import ProcessFlowPool
+from flow_system.registry import FlowNotFound, VerbNotImplemented, split_flow_name
+from flow_system.reloader import HotReloader
+from flow_system.runtime import FlowRuntime
+from flow_system.streaming import FlowHub, Subscription
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+# A client that cannot take a frame within this time is considered dead.
+SEND_TIMEOUT_SECONDS = 10.0
+
+# Streaming response modes for list flows.
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "html": "text/html; charset=utf-8",
+}
+
+
+def create_app(template_dirs: list[str] | None = None, runtime: FlowRuntime | None = None,
+               reload: bool = False, process_workers: int | None = None) -> FastAPI:
+    """
+    Builds the FastAPI app exposing the flow runtime.
+
+    Endpoints:
+    - POST /___flow___            one-shot flow call, returns an HTML fragment
+                                  (or a chunked NDJSON/HTML body with "stream")
+    - GET  /___flow___/stream     SSE push of fragments for subscribed flows
+    - WS   /___flow___/ws         same as the SSE stream, over a WebSocket
+
+    With `reload`, edited flow, contract and template files are reloaded in
+    place (see flow_system.reloader) instead of restarting the server.
+
+    The worker processes for `executor = "process"` flows (`process_workers`,
+    default one per CPU) are started with the first call to such a flow.
+    """
+    runtime = runtime or FlowRuntime(template_dirs, process_pool=ProcessFlowPool(process_workers))
+    hub = FlowHub(runtime)
+    app = FastAPI()
+    app.state.runtime = runtime
+    app.state.hub = hub
+
+    @app.on_event("shutdown")
+    def flush_metrics():
+        runtime.metrics.flush()
+
+    @app.on_event("shutdown")
+    def stop_process_pool():
+        runtime.process_pool.shutdown()
+
+    if reload:
+        reloader = HotReloader(runtime)
+        app.state.reloader = reloader
+
+        def apply_changes(apply):
+            result = apply()
+            print(f"Reloaded {', '.join(result.modules + result.templates)} in {result.seconds * 1000:.1f} ms")
+            for module, error in result.errors.items():
+                print(f"  {module}: {error}")
+
+        @app.on_event("startup")
+        async def start_reloader():
+            loop = asyncio.get_running_loop()
+            # Reload on the event loop, between requests, where flows are resolved.
+            reloader.start(lambda apply: loop.call_soon_threadsafe(apply_changes, apply))
+
+        @app.on_event("shutdown")
+        def stop_reloader():
+            reloader.stop()
+
+    # --- The "Flow" System Runner ---
+    @app.post("/___flow___")
+    async def handle_flow(request: Request):
+        payload = await request.json()
+        flow_name, verb = split_flow_name(payload.get("flow", ""))
+        verb = payload.get("verb") or verb or "get"
+        stream_format = payload.get("stream")
+        try:
+            if stream_format in STREAM_MEDIA_TYPES:
+                chunks = runtime.stream(flow_name, payload.get("params", {}), stream_format)
+                return StreamingResponse(chunks, media_type=STREAM_MEDIA_TYPES[stream_format])
+            html = await runtime.run(flow_name, verb, payload.get("params", {}))
+        except (FlowNotFound, VerbNotImplemented) as e:
+            return HTMLResponse(content=f"Error: Could not handle flow. {e}", status_code=404)
+        except ValueError as e:
+            # Contract validation errors and bad cursors are the client's fault.
+            return HTMLResponse(content=f"Error: Invalid input. {e}", status_code=400)
+        except Exception as e:
+            return HTMLResponse(content=f"An unexpected error occurred: {e}", status_code=500)
+        return HTMLResponse(content=html)
+
+    # --- Server Push ---
+    def _parse_specs(raw: list) -> list[dict]:
+        specs = []
+        for spec in raw:
+            flow_name, verb = split_flow_name(spec["flow"])
+            verb = (spec.get("verb") or verb or "get").lower()
+            if verb != "get":
+                # Every render would run the write, whose change notification
+                # triggers the next render.
+                raise ValueError(f"Only GET flows can be subscribed to, not {verb.upper()} {flow_name}")
+            runtime.registry.resolve(flow_name)  # Fail fast on unknown flows
+            specs.append({**spec, "flow": flow_name, "verb": verb})
+        return specs
+
+    @app.get("/___flow___/stream")
+    async def stream_flows(subscribe: str):
+        try:
+            specs = _parse_specs(json.loads(subscribe))
+        except (ValueError, KeyError, TypeError, FlowNotFound) as e:
+            return HTMLResponse(content=f"Error: Invalid subscription. {e}", status_code=400)
+
+        async def event_stream():
+            sub = Subscription(specs)
+            hub.subscribe(sub)
+            try:
+                async for frame in hub.frames(sub):
+                    if frame is None:
+                        yield ": ping\n\n"
+                    else:
+                        yield f"event: fragment\ndata: {json.dumps(frame)}\n\n"
+            finally:
+                hub.unsubscribe(sub)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.websocket("/___flow___/ws")
+    async def stream_flows_ws(websocket: WebSocket):
+        await websocket.accept()
+        try:
+            specs = _parse_specs(json.loads(await websocket.receive_text()))
+        except (ValueError, KeyError, TypeError, FlowNotFound) as e:
+            await websocket.close(code=1008, reason=str(e)[:120])
+            return
+
+        sub = Subscription(specs)
+        hub.subscribe(sub)
+        try:
+            async for frame in hub.frames(sub):
+                message = json.dumps(frame) if frame else '{"ping": true}'
+                await asyncio.wait_for(websocket.send_text(message), SEND_TIMEOUT_SECONDS)
+        except (WebSocketDisconnect, asyncio.TimeoutError):
+            pass
+        finally:
+            hub.unsubscribe(sub)
+
+    @app.get("/___flow___/flow_stream.js")
+    async def stream_client():
+        return FileResponse(STATIC_DIR / "flow_stream.js", media_type="text/javascript")
+
+    return app
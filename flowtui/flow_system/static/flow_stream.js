@@ -0,0 +1,45 @@
+/**
+ * Server-push client for the Flow architecture.
+ *
+ * Every element with a `flow:subscribe` attribute (e.g.
+ * `flow:subscribe="fleet.vehicles.index"`) is kept up to date by the server:
+ * when the data behind the flow changes, the re-rendered fragment is pushed
+ * over a single EventSource and swapped into `flow:target` (default: the
+ * element itself) using `flow:swap` (default: innerHTML).
+ *
+ * This replaces `flow:poll` timers for live dashboards.
+ */
+(function () {
+    const elements = document.querySelectorAll('[flow\\:subscribe]');
+    if (!elements.length) return;
+
+    const specs = Array.from(elements, (el, i) => {
+        if (!el.id) el.id = `flow-sub-${i}`;
+        return {
+            flow: el.getAttribute('flow:subscribe'),
+            params: JSON.parse(el.getAttribute('flow:params') || '{}'),
+            target: el.getAttribute('flow:target') || `#${el.id}`,
+            swap: el.getAttribute('flow:swap') || 'innerHTML',
+        };
+    });
+
+    const url = `/___flow___/stream?subscribe=${encodeURIComponent(JSON.stringify(specs))}`;
+    const source = new EventSource(url);
+
+    source.addEventListener('fragment', (event) => {
+        const frame = JSON.parse(event.data);
+        const target = document.querySelector(frame.target);
+        if (!target) {
+            console.error(`Flow Error: Target element "${frame.target}" not found.`);
+            return;
+        }
+        if (frame.swap === 'outerHTML') {
+            target.outerHTML = frame.html;
+        } else {
+            target.innerHTML = frame.html;
+        }
+    });
+
+    // EventSource reconnects on its own; the server re-sends a full frame on connect.
+    source.onerror = () => console.warn('Flow stream interrupted, reconnecting...');
+})();
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+
+class Subscription:
+    """
+    A single client connection subscribed to one or more flows.
+
+    Changes are coalesced: a flow that goes stale several times before the
+    client has caught up is re-rendered and sent only once. The pending set
+    never holds more than one entry per subscribed flow, so a slow client
+    costs bounded memory and simply receives fewer, fresher frames.
+    """
+
+    def __init__(self, specs: list[dict], min_interval: float = 0.05):
+        # Each spec: {"flow": "fleet.vehicles.index", "verb": "get", "params": {}, "target": "#list"}
+        self.specs = {str(i): spec for i, spec in enumerate(specs)}
+        self.min_interval = min_interval
+        self._pending: dict[str, None] = {}
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def mark_stale(self, spec_id: str) -> None:
+        """Thread-safe: flows with sync verbs run in worker threads."""
+        self._loop.call_soon_threadsafe(self._mark, spec_id)
+
+    def _mark(self, spec_id: str) -> None:
+        self._pending[spec_id] = None
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float | None = None) -> list[str]:
+        """Waits for stale flows; returns [] if nothing changed within `timeout`."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        # Let a burst of notifications settle so it collapses into one frame.
+        await asyncio.sleep(self.min_interval)
+        self._wakeup.clear()
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+
+class FlowHub:
+    """
+    Routes change notifications to subscribed connections and pushes
+    re-rendered fragments to them.
+
+    A fragment is rendered once per change and shared by every connection
+    subscribed to the same flow call, no matter how many are open. Flow calls
+    are reference counted, so the last connection leaving one drops its
+    cached fragment.
+    """
+
+    HEARTBEAT_SECONDS = 15.0
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self._subscribers: dict[str, set[tuple[Subscription, str]]] = {}
+        self._keys_by_topic: dict[str, dict[str, int]] = {}  # topic -> spec key -> subscriptions
+        self._key_refs: dict[str, int] = {}  # spec key -> subscriptions, over all topics
+        self._registered: dict[Subscription, list[tuple[str, str, str]]] = {}  # (topic, spec id, key)
+        self._renders: dict[str, asyncio.Future] = {}
+        runtime.change_listeners.append(self.notify)
+
+    @staticmethod
+    def _spec_key(spec: dict) -> str:
+        return json.dumps([spec["flow"], spec.get("verb", "get"), spec.get("params") or {}], sort_keys=True)
+
+    def subscribe(self, sub: Subscription) -> None:
+        if sub in self._registered:
+            return
+        registered = self._registered[sub] = []
+        for spec_id, spec in sub.specs.items():
+            key = self._spec_key(spec)
+            self._key_refs[key] = self._key_refs.get(key, 0) + 1
+            # Recorded, so unsubscribing undoes exactly this even if the flows were reloaded since.
+            for topic in self.runtime.registry.topics_for(spec["flow"]):
+                self._subscribers.setdefault(topic, set()).add((sub, spec_id))
+                keys = self._keys_by_topic.setdefault(topic, {})
+                keys[key] = keys.get(key, 0) + 1
+                registered.append((topic, spec_id, key))
+            # Every subscription starts with a full initial frame.
+            sub._mark(spec_id)
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        registered = self._registered.pop(sub, None)
+        if registered is None:
+            return
+        for topic, spec_id, key in registered:
+            entries = self._subscribers.get(topic)
+            if entries is not None:
+                entries.discard((sub, spec_id))
+                if not entries:
+                    del self._subscribers[topic]
+            keys = self._keys_by_topic[topic]
+            keys[key] -= 1
+            if not keys[key]:
+                del keys[key]
+                if not keys:
+                    del self._keys_by_topic[topic]
+        for spec in sub.specs.values():
+            key = self._spec_key(spec)
+            self._key_refs[key] -= 1
+            if not self._key_refs[key]:
+                del self._key_refs[key]
+                self._renders.pop(key, None)
+
+    def notify(self, topic: str) -> None:
+        """Marks every flow watching `topic` as stale on every connection."""
+        for key in self._keys_by_topic.get(topic, ()):
+            self._renders.pop(key, None)
+        for sub, spec_id in list(self._subscribers.get(topic, ())):
+            sub.mark_stale(spec_id)
+
+    async def _render(self, spec: dict) -> str:
+        key = self._spec_key(spec)
+        future = self._renders.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self.runtime.run(spec["flow"], spec.get("verb", "get"), spec.get("params"))
+            )
+            self._renders[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._renders.pop(key, None)
+            raise
+
+    async def frames(self, sub: Subscription):
+        """
+        Yields {"target", "html"} frames for a connection, or None as a heartbeat.
+
+        The caller must finish sending a frame before asking for the next one;
+        that is what provides back-pressure.
+        """
+        while True:
+            batch = await sub.next_batch(timeout=self.HEARTBEAT_SECONDS)
+            if not batch:
+                yield None
+                continue
+            for spec_id in batch:
+                spec = sub.specs[spec_id]
+                try:
+                    html = await self._render(spec)
+                except Exception as e:
+                    html = f"<!-- flow error: {e} -->"
+                yield {"target": spec.get("target"), "swap": spec.get("swap", "innerHTML"), "html": html}
@@ -0,0 +1,329 @@
+"""
+Multi-worker flow server.
+
+A single uvicorn process runs every flow on one core. The supervisor forks
+N workers (pre-fork: before it starts any thread), and each worker binds
+its own listening socket on the same port with SO_REUSEPORT, so the kernel
+spreads incoming connections across them without a shared accept queue.
+
+State that must agree between workers lives outside them: the backend
+services keep their data in the SQLite shared store
+(backend.services.shared_store), and change notifications for pushed
+fragments are relayed through a small SQLite table (ChangeRelay), so a
+write handled by one worker refreshes subscribers connected to any other.
+
+Rolling restart (SIGHUP): workers are replaced one at a time. The new
+worker is started and must be accepting connections before the old one is
+retired. Retiring takes two steps. First SIGUSR1 makes the old worker
+drain: it closes its listening socket, so new connections go to the
+others, and answers with "Connection: close", so keep-alive clients
+reconnect elsewhere after their current request instead of finding the
+connection closed under them. DRAIN_SECONDS later, SIGTERM lets uvicorn
+finish what is in flight and exit. Connections still waiting in the old
+socket's accept queue when it closes are only handed over to the other
+workers if the kernel's net.ipv4.tcp_migrate_req is enabled (Linux 5.14+).
+SIGTERM or SIGINT stops all workers; a worker that dies is restarted.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+from multiprocessing.connection import wait
+
+import uvicorn
+
+CHANGES_DB_PATH = os.environ.get("FLOWTUI_CHANGES_DB", os.path.join(".flowtui", "flow_changes.db"))
+
+
+def bind_reuseport(host: str, port: int) -> socket.socket:
+    """A listening socket that other processes can bind to the same address as well."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+# -------------------------------------------------
+# Change Relay
+# -------------------------------------------------
+
+class ChangeRelay:
+    """
+    Shares FlowRuntime change notifications between worker processes.
+
+    Every topic this worker notifies is appended to a table; a thread polls
+    the table for topics notified by the other workers and passes them to
+    this worker's change listeners (the FlowHub) on the event loop.
+    """
+
+    POLL_SECONDS = 0.1
+    KEEP_ROWS = 10_000
+
+    def __init__(self, runtime, path: str = CHANGES_DB_PATH):
+        self.runtime = runtime
+        self.path = path
+        self.origin = os.getpid()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._write_lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS flow_changes "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, origin INTEGER NOT NULL)"
+        )
+        self._last_id = self._conn.execute("SELECT coalesce(max(id), 0) FROM flow_changes").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self.runtime.change_listeners.append(self.publish)
+        self._thread = threading.Thread(target=self._poll_loop, name="flow-change-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.publish in self.runtime.change_listeners:
+            self.runtime.change_listeners.remove(self.publish)
+
+    def publish(self, topic: str) -> None:
+        with self._write_lock:
+            row_id = self._conn.execute(
+                "INSERT INTO flow_changes (topic, origin) VALUES (?, ?)", (topic, self.origin)
+            ).lastrowid
+            if row_id % 1000 == 0:
+                self._conn.execute("DELETE FROM flow_changes WHERE id <= ?", (row_id - self.KEEP_ROWS,))
+
+    def _poll_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while not self._stop.wait(self.POLL_SECONDS):
+                rows = conn.execute(
+                    "SELECT id, topic, origin FROM flow_changes WHERE id > ? ORDER BY id", (self._last_id,)
+                ).fetchall()
+                if not rows:
+                    continue
+                self._last_id = rows[-1][0]
+                topics = sorted({topic for _, topic, origin in rows if origin != self.origin})
+                if topics:
+                    self._loop.call_soon_threadsafe(self._deliver, topics)
+        finally:
+            conn.close()
+
+    def _deliver(self, topics: list[str]) -> None:
+        # Straight to the other listeners: publishing them again would echo.
+        for topic in topics:
+            for listener in list(self.runtime.change_listeners):
+                if listener != self.publish:
+                    listener(topic)
+
+
+# -------------------------------------------------
+# Workers
+# -------------------------------------------------
+
+class _DrainMiddleware:
+    """Once `draining` is set, asks clients to close their connection after each response."""
+
+    def __init__(self, app):
+        self.app = app
+        self.draining = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.draining:
+            return await self.app(scope, receive, send)
+
+        async def send_closing(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"connection", b"close")]}
+            await send(message)
+
+        return await self.app(scope, receive, send_closing)
+
+
+class _WorkerServer(uvicorn.Server):
+    """Signals the supervisor once it accepts connections."""
+
+    def __init__(self, config: uvicorn.Config, ready):
+        super().__init__(config)
+        self._ready = ready
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            self._ready.set()
+
+
+def _serve_worker(host: str, port: int, app_options: dict, ready) -> None:
+    # Imported here, after the fork: the app, its pools and threads belong to the worker.
+    from flow_system.server import create_app
+
+    # Drop the supervisor's handlers inherited through fork; uvicorn installs its own.
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)  # Until the drain handler is installed
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    sock = bind_reuseport(host, port)
+    app = create_app(**app_options)
+    relay = ChangeRelay(app.state.runtime)
+    drain = _DrainMiddleware(app)
+    server = _WorkerServer(uvicorn.Config(drain, lifespan="on"), ready)
+
+    def start_draining():
+        drain.draining = True
+        for listener in server.servers:
+            listener.close()  # Stop accepting; open connections carry on
+
+    @app.on_event("startup")
+    async def start_relay():
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGUSR1, start_draining)
+        relay.start(loop)
+
+    @app.on_event("shutdown")
+    def stop_relay():
+        relay.stop()
+
+    server.run(sockets=[sock])
+
+
+class _Worker:
+    def __init__(self, process, ready):
+        self.process = process
+        self.ready = ready
+        self.started_at = time.monotonic()
+
+
+# -------------------------------------------------
+# Supervisor
+# -------------------------------------------------
+
+class Supervisor:
+    """Runs and watches `workers` flow server processes on one port."""
+
+    READY_TIMEOUT = 30.0
+    # Time a retired worker keeps answering (with "Connection: close") before SIGTERM.
+    DRAIN_SECONDS = 1.0
+    # Time a stopping worker gets to finish in-flight requests before it is killed.
+    GRACEFUL_TIMEOUT = 30.0
+    # A worker that exits sooner than this after starting counts as crashing.
+    MIN_UPTIME = 2.0
+
+    def __init__(self, workers: int, host: str = "127.0.0.1", port: int = 8000, app_options: dict | None = None):
+        self.workers = max(1, workers)
+        self.host = host
+        self.port = port
+        self.app_options = app_options or {}
+        # Worker process pools share the cores with the workers themselves.
+        self.app_options.setdefault("process_workers", max(1, (os.cpu_count() or 1) // self.workers))
+        # Pre-fork: the supervisor starts no threads and never imports the flows,
+        # so a worker forked for a rolling restart loads the current code.
+        self._context = multiprocessing.get_context("fork")
+        self._workers: list[_Worker | None] = []
+        self._stopping = False
+        self._restart_requested = False
+        self._crashes = 0
+
+    # --- Worker processes ---
+
+    def _spawn(self) -> _Worker:
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_serve_worker, args=(self.host, self.port, self.app_options, ready), name="flow-worker",
+        )
+        process.start()
+        return _Worker(process, ready)
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + self.READY_TIMEOUT
+        while time.monotonic() < deadline:
+            if worker.ready.wait(0.1):
+                return True
+            if not worker.process.is_alive():
+                return False
+        return False
+
+    def _stop_worker(self, worker: _Worker, drain: bool = False) -> None:
+        if drain and worker.process.is_alive():
+            os.kill(worker.process.pid, signal.SIGUSR1)
+            worker.process.join(self.DRAIN_SECONDS)
+        if worker.process.is_alive():
+            worker.process.terminate()  # SIGTERM: uvicorn drains, then exits
+        worker.process.join(self.GRACEFUL_TIMEOUT)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+    # --- Control ---
+
+    def run(self) -> None:
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "_restart_requested", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stopping", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "_stopping", True))
+        print(f"Flow supervisor {os.getpid()}: {self.workers} workers on http://{self.host}:{self.port} "
+              f"(kill -HUP {os.getpid()} for a rolling restart)")
+
+        self._workers = [self._spawn() for _ in range(self.workers)]
+        try:
+            while not self._stopping:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self.rolling_restart()
+                    continue
+                sentinels = {w.process.sentinel: i for i, w in enumerate(self._workers) if w is not None}
+                for sentinel in wait(list(sentinels), timeout=0.5):
+                    if not self._stopping:
+                        self._replace_dead(sentinels[sentinel])
+        finally:
+            for worker in self._workers:
+                if worker is not None and worker.process.is_alive():
+                    worker.process.terminate()
+            for worker in self._workers:
+                if worker is not None:
+                    self._stop_worker(worker)
+
+    def _replace_dead(self, slot: int) -> None:
+        dead = self._workers[slot]
+        dead.process.join()
+        if time.monotonic() - dead.started_at < self.MIN_UPTIME:
+            self._crashes += 1
+            time.sleep(min(30.0, 0.5 * 2 ** self._crashes))  # Back off a crash loop
+        else:
+            self._crashes = 0
+        print(f"Flow worker {dead.process.pid} exited with {dead.process.exitcode}; starting a new one")
+        self._workers[slot] = self._spawn()
+
+    def rolling_restart(self) -> bool:
+        """
+        Replaces every worker, one at a time, never dropping below the
+        current number accepting connections. Stops (and returns False) at
+        the first new worker that fails to start, keeping the old ones.
+        """
+        for slot, old in enumerate(self._workers):
+            if self._stopping:
+                return False
+            new = self._spawn()
+            if not self._wait_ready(new):
+                print(f"Flow worker {new.process.pid} did not start; rolling restart aborted")
+                self._stop_worker(new)
+                return False
+            self._workers[slot] = new
+            if old is not None:
+                self._stop_worker(old, drain=True)
+        print(f"Rolling restart done: workers {', '.join(str(w.process.pid) for w in self._workers)}")
+        return True
@@ -1,15 +1,24 @@
+import argparse
+import os
+import subprocess
+import sys
+
 from textual.app import App, ComposeResult
+from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
-from textual.widgets import Header, Footer, Button
+from textual.message import Message
+from textual.widgets import Header, Footer
 
-from services.code_scanner import CodeScannerService
-from tui_panels.panel import Panel
-from tui_panels.deploy_info import DeployInfo
+from services import startup_profile
+from services.editor_bridge import EditorBridge, EditorError
+from services.index_daemon import IndexClient
+from services.project_graph import ProjectGraph
+from services.workspace import Workspace
+from tui_panels.panel import LazyContent, Panel
 from tui_panels.explorer_content import ExplorerContent
 from tui_panels.component_overview_content import ComponentOverviewContent
-from tui_panels.inspector_content import InspectorContent
-from tui_panels.utilities_content import UtilitiesContent
-# from tui_panels.oracle_content import OracleContent
+from tui_panels.code_viewer import CodeViewer
+# Inspector, Utilities, Deploy and Oracle are imported by LazyContent after the first frame.
 
 # -------------------------------------------------
 # Main App
@@ -25,6 +34,7 @@ class FlowTUI(App):
     #col-2 { width: 1.5fr; }
     #col-3 { width: 1.5fr; }
     #col-4 { width: 1fr; }
+    #col-5 { width: 1.5fr; }
     .panel-title { background: #1e1e1e; color: #ffffff; padding: 0 1; text-style: bold; }
     .panel-body { height: 1fr; padding: 1; border: round #333333; }
     .panel-body > Tree { border: none; padding: 0; }
@@ -48,12 +58,9 @@ class FlowTUI(App):
         background: #2a2a2a;
     }
     #col-3 .code-preview {
-        width: 60%;
-        height: auto;
-        max-height: 5;
-        content-align: left middle;
+        width: 100%;
+        height: 12;
         background: #2a2a2a;
-        padding: 0 1;
         border: none;
     }
     #col-3 .edit-btn {
@@ -66,19 +73,186 @@ class FlowTUI(App):
     }
 
     """
-    def __init__(self, *args, **kwargs):
+    BINDINGS = [
+        Binding("ctrl+o", "quick_open", "Quick open"),
+    ]
+
+    # Panels loaded by LazyContent once the first frame is painted.
+    LAZY_PANELS = ("inspector", "utilities", "deploy", "oracle")
+    # How often to ask the index daemon whether the project changed.
+    INDEX_POLL_SECONDS = 2.0
+    # With several workspace roots, the indexes of roots unused for this long are evicted.
+    ROOT_IDLE_SECONDS = 600.0
+
+    class EditorFileWritten(Message):
+        """Posted (from the editor bridge's thread) when Neovim writes a file."""
+        def __init__(self, file_path: str) -> None:
+            super().__init__()
+            self.file_path = file_path
+
+    def __init__(self, *args, roots: list[str] | None = None, **kwargs):
         super().__init__(*args, **kwargs)
-        self.code_scanner = CodeScannerService()
+        # Project roots shown side by side; the first one is the primary root.
+        self.workspace = Workspace(roots)
+        self._active_root = self.workspace.primary
+        self._pending_panels = set(self.LAZY_PANELS)
+        # Shared index (python -m services.index_daemon), when one is running.
+        self.index_client = IndexClient.connect()
+        self._index_generation = None
+        self._scanning = False  # A workspace scan is running in a worker thread
+        self._rescan = False  # Scan again once it is done
+        self._scanned = False  # The first scan has finished
+        # Shared Neovim session; connected on the first "Edit in Neovim".
+        self.editor = EditorBridge(on_write=lambda path: self.post_message(self.EditorFileWritten(path)))
 
     def on_mount(self) -> None:
-        """Perform initial project scan when the app starts."""
+        # Frontend <-> flow references of each root, refreshed (changed files only) on every scan.
+        self.query_one(ComponentOverviewContent).flow_xref = self.workspace.primary.xref()
+        if self.index_client is not None:
+            self.query_one(ComponentOverviewContent).index_client = self.index_client
+            self.set_interval(self.INDEX_POLL_SECONDS, self._check_index)
+        if len(self.workspace) > 1:
+            self.set_interval(self.ROOT_IDLE_SECONDS / 4, self._evict_idle_roots)
+
+    def on_ready(self) -> None:
+        """
+        Sent once the first frame is displayed: only now scan the project and
+        load the remaining panels, so the layout shows up immediately.
+        """
+        startup_profile.mark("first_frame")
         self.scan_and_refresh_explorer()
+        for lazy in self.query(LazyContent):
+            self.run_worker(lazy.load(), group="lazy-panels")
+
+    def on_lazy_content_loaded(self, message: LazyContent.Loaded) -> None:
+        self._pending_panels.discard(message.control.id)
+        if not self._pending_panels:
+            startup_profile.mark("panels_loaded")
+            self._startup_done()
+
+    def _startup_done(self) -> None:
+        # A profiled startup ends once the panels are loaded and the project is scanned.
+        if startup_profile.profiling() and self._scanned and not self._pending_panels:
+            self.exit()
+
+    def _panel(self, panel_id: str):
+        """Returns a lazily loaded panel's content widget, or None while it is still loading."""
+        return self.query_one(f"#{panel_id}", LazyContent).content
 
     def scan_and_refresh_explorer(self) -> None:
-        """Scans the project and tells the explorer to refresh."""
-        app_graph = self.code_scanner.scan_project()
+        """
+        Scans every workspace root concurrently (the primary one may come from
+        the index daemon instead) in a worker thread, then tells the explorer
+        to refresh. A request made while a scan runs starts one more after it.
+        """
+        if self._scanning:
+            self._rescan = True
+            return
+        self._scanning = True
+        self.run_worker(self._scan_workspace, thread=True, group="workspace-scan")
+
+    def _scan_workspace(self) -> None:
+        known_graphs, generation = {}, None
+        index_client = self.index_client
+        if index_client is not None:
+            try:
+                status = index_client.status()
+                if status["root"] == os.path.abspath(self.workspace.primary.path):
+                    generation = status["generation"]
+                    known_graphs[self.workspace.primary.path] = ProjectGraph.from_app_graph(index_client.graph())
+                else:
+                    self.log(f"Index daemon serves {status['root']}, not this project; not using it")
+                    self.call_from_thread(self._drop_index_client)
+            except (OSError, LookupError):
+                self.call_from_thread(self._drop_index_client)
+        app_graphs = self.workspace.scan(known_graphs)
+        self.call_from_thread(self._apply_scan, app_graphs, generation)
+
+    def _apply_scan(self, app_graphs: dict, generation) -> None:
+        if generation is not None:
+            self._index_generation = generation
+        self._scanning = False
+        if not self._scanned:
+            self._scanned = True
+            startup_profile.mark("project_scanned")
+            self._startup_done()
         explorer = self.query_one(ExplorerContent)
-        explorer.refresh_tree(app_graph)
+        explorer.refresh_workspace(app_graphs, {root.path: root.name for root in self.workspace})
+        oracle = self._panel("oracle")
+        if oracle is not None:
+            oracle.refresh_index()
+        if self._rescan:
+            self._rescan = False
+            self.scan_and_refresh_explorer()
+
+    def _check_index(self) -> None:
+        """Refreshes the explorer when the daemon has seen the project change."""
+        if self.index_client is None or self._scanning:
+            return  # A running scan is compared again once it has finished
+        try:
+            generation = self.index_client.status()["generation"]
+        except (OSError, LookupError):
+            self._drop_index_client()
+            return
+        if generation != self._index_generation:
+            self.scan_and_refresh_explorer()
+
+    def _evict_idle_roots(self) -> None:
+        for root in self.workspace.evict_idle(self.ROOT_IDLE_SECONDS, keep=self._active_root):
+            self.log(f"Evicted the index of workspace root {root.path}")
+
+    def _drop_index_client(self) -> None:
+        """The daemon went away (or indexes another project): fall back to scanning in-process."""
+        if self.index_client is None:
+            return
+        self.index_client.close()
+        self.index_client = None
+        self.query_one(ComponentOverviewContent).index_client = None
+
+    def on_unmount(self) -> None:
+        self.editor.close()
+
+    # --- Editor ---
+
+    def open_in_editor(self, file_path: str, line: int) -> None:
+        """Jumps to file:line in the shared Neovim session (started on first use)."""
+        self.run_worker(lambda: self._open_in_editor(file_path, line), thread=True, group="editor", exclusive=True)
+
+    def _open_in_editor(self, file_path: str, line: int) -> None:
+        try:
+            attached = self.editor.open(file_path, line)
+        except EditorError as e:
+            self.call_from_thread(self.log, f"❌ [bold red]Could not open Neovim:[/] {e}")
+            return
+        if not attached:
+            self.call_from_thread(self._show_editor)
+
+    def _show_editor(self) -> None:
+        """Displays the headless session: in a tmux pane if possible, else in place of the TUI until you quit it."""
+        tmux = self.editor.tmux_command()
+        if tmux is not None:
+            subprocess.Popen(tmux, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        with self.suspend():
+            subprocess.run(self.editor.ui_command())
+
+    def on_flow_tui_editor_file_written(self, message: EditorFileWritten) -> None:
+        """Re-indexes a file as soon as Neovim writes it, and reloads viewers showing it."""
+        path = message.file_path
+        root = self.workspace.root_for(path)
+        if root is not None and root.indexed:
+            xref = root.xref()
+            if any(path.startswith(xref_root + os.sep) for xref_root in xref.roots):
+                xref.update_file(path)
+        oracle = self._panel("oracle")
+        if oracle is not None:
+            oracle.file_written(path)
+        for viewer in self.query(CodeViewer):
+            if viewer.file_path and os.path.abspath(viewer.file_path) == os.path.abspath(path):
+                viewer.reload()
+
+    def action_quick_open(self) -> None:
+        self.query_one(ExplorerContent).action_quick_open()
 
     def on_explorer_content_scan_project_requested(
         self, message: ExplorerContent.ScanProjectRequested
@@ -99,15 +273,20 @@ class FlowTUI(App):
 
             # --- COLUMN 3: INSPECTOR ---
             with Panel("Inspector", "🔍", id="col-3"):
-                yield InspectorContent()
+                yield LazyContent("tui_panels.inspector_content", "InspectorContent", id="inspector")
 
             # --- COLUMN 4: UTILITIES & DEPLOY ---
             with Vertical(id="col-4"):
                 with Panel("Utilities", "🛠️") as p:
-                    yield UtilitiesContent(classes="panel-body")
+                    yield LazyContent("tui_panels.utilities_content", "UtilitiesContent",
+                                      id="utilities", classes="panel-body")
 
                 with Panel("Deploy", "🚀") as p:
-                    yield DeployInfo(classes="panel-body")
+                    yield LazyContent("tui_panels.deploy_info", "DeployInfo", id="deploy", classes="panel-body")
+
+            # --- COLUMN 5: ORACLE (project search) ---
+            with Panel("Oracle", "🔮", id="col-5"):
+                yield LazyContent("tui_panels.oracle_content", "OracleContent", id="oracle", classes="panel-body")
 
 
         yield Footer()
@@ -116,24 +295,50 @@ class FlowTUI(App):
         self, message: ComponentOverviewContent.ElementSelected
     ) -> None:
         """When an element is selected in the view tree, update the inspector."""
-        inspector = self.query_one(InspectorContent)
-        inspector.on_component_overview_content_element_selected(message)
+        inspector = self._panel("inspector")
+        if inspector is not None:
+            inspector.on_component_overview_content_element_selected(message)
 
     def on_explorer_content_flow_selected(
         self, message: ExplorerContent.FlowSelected
     ) -> None:
         """When a flow is selected in the explorer, update the implementation panel."""
         component_overview = self.query_one(ComponentOverviewContent)
+        # Cross-references resolve within the selection's own root.
+        root = self.workspace.root_for(message.file_path) or self.workspace.primary
+        self._active_root = root
+        component_overview.flow_xref = root.xref()
+        component_overview.project_root = root.path
         component_overview.on_explorer_content_flow_selected(message)
 
+    def on_oracle_content_result_selected(self, message) -> None:
+        """When a search hit is chosen, reveal its file in the explorer (which opens it)."""
+        self.query_one(ExplorerContent).reveal(message.file_path)
+
     def on_component_overview_content_method_selected(
         self, message: ComponentOverviewContent.MethodSelected
     ) -> None:
         """When a method is selected in the implementation panel, update the inspector."""
-        inspector = self.query_one(InspectorContent)
-        inspector.on_component_overview_content_method_selected(message)
+        inspector = self._panel("inspector")
+        if inspector is not None:
+            inspector.on_component_overview_content_method_selected(message)
+
+
+
+def main():
+    startup_profile.mark("imports_done")
+    parser = argparse.ArgumentParser(description="Flow TUI")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Start the TUI headless under -X importtime, report where startup time goes and exit.")
+    parser.add_argument("roots", nargs="*", default=["."],
+                        help="Project roots to show side by side (default: the current directory).")
+    args = parser.parse_args()
 
+    if args.profile_startup:
+        child_args = [a for a in sys.argv[1:] if a != "--profile-startup"]
+        sys.exit(startup_profile.run_profiled(__file__, child_args))
+    FlowTUI(roots=args.roots).run(headless=startup_profile.profiling())
 
 
 if __name__ == "__main__":
-    FlowTUI().run()
+    main()
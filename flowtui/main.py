@@ -1,14 +1,46 @@
-import json
-from services.code_scanner import CodeScannerService
+import argparse
+import sys
+
+from services import graph_export, startup_profile
 
 
 def main():
     """
-    Main entry point for the FlowTUI application.
+    Headless entry point: scans the project and streams the app graph to stdout
+    (or --output) as it goes, so memory stays flat however large the project is.
+    Must never import Textual (or any panel), so it stays fast enough for scripts.
     """
-    scanner = CodeScannerService()
-    app_graph = scanner.scan_project()
-    print(json.dumps(app_graph, indent=2))
+    startup_profile.mark("imports_done")
+    parser = argparse.ArgumentParser(description="Scan the project and print its app graph.")
+    parser.add_argument("--format", choices=sorted(graph_export.WRITERS), default="json",
+                        help="json: the app_graph document; ndjson: one node per line; "
+                             "msgpack: compact binary node stream (see services/graph_export.py).")
+    parser.add_argument("--compact", action="store_true", help="Unindented JSON.")
+    parser.add_argument("-o", "--output", help="Write to this file instead of stdout.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Run the scan under -X importtime and report where startup time goes.")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        child_args = [a for a in sys.argv[1:] if a != "--profile-startup"]
+        sys.exit(startup_profile.run_profiled(__file__, child_args))
+
+    binary = args.format == "msgpack"
+    if args.output:
+        out = open(args.output, "wb" if binary else "w")
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+    try:
+        if args.format == "json":
+            graph_export.write_json(out, indent=None if args.compact else 2)
+        else:
+            graph_export.WRITERS[args.format](out)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+    startup_profile.mark("output_written")
 
 
 if __name__ == "__main__":
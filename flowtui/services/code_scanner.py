@@ -1,5 +1,7 @@
 import os
 
+from services.project_graph import ProjectGraph
+
 class CodeScannerService:
     """
     Scans the 'apps' directory to build a structured, recursive representation of the applications.
@@ -21,10 +23,20 @@ class CodeScannerService:
                 tree[name] = None  # Mark as file
         return tree
 
-    def scan_project(self) -> dict:
+    def scan_graph(self, root: str = ".") -> ProjectGraph:
+        """
+        Scans the same directories as scan_project() into a compact ProjectGraph
+        (see services/project_graph.py); its to_app_graph() gives the dict.
+        """
+        return ProjectGraph.scan(root)
+
+    def scan_project(self, root: str = ".") -> dict:
         """
         Scans the project's 'apps' and 'backend' directories and builds a deep graph.
 
+        Args:
+            root: The project directory. Paths in the graph are relative to it.
+
         Returns:
             A dictionary representing the application graph with full file trees.
         """
@@ -34,11 +46,12 @@ class CodeScannerService:
         }
 
         # Scan the root backend directory
-        if os.path.exists("backend") and os.path.isdir("backend"):
-            project_graph["backend_tree"] = self._scan_directory_recursively("backend")
+        backend_dir = os.path.join(root, "backend")
+        if os.path.exists(backend_dir) and os.path.isdir(backend_dir):
+            project_graph["backend_tree"] = self._scan_directory_recursively(backend_dir)
 
         # Scan the apps directory
-        root_dir = "apps"
+        root_dir = os.path.join(root, "apps")
         if not os.path.exists(root_dir) or not os.path.isdir(root_dir):
             return project_graph
 
@@ -0,0 +1,402 @@
+"""
+Incremental full-text index behind the Oracle search panel.
+
+Source and template files are split into identifier-like tokens
+([A-Za-z0-9_]+, lowercased). Each token maps to the files that contain it
+and to its positions in each of them (positional postings), so a query of
+several words only reads files where those words appear next to each other.
+The lowercase trigrams of every file are indexed too. For a regex query,
+the index first picks the files that contain every literal run the pattern
+requires, and only those are scanned.
+
+The index holds postings only, never file contents. Candidate files are read
+and matched at query time, one file at a time. Results therefore stream out
+as they are found, and a search can stop as soon as the query changes.
+
+`refresh()` re-reads only the files whose mtime or size changed. A changed
+or deleted file gets a new id and leaves its old postings behind as a
+tombstone. Queries skip tombstones, and the postings are compacted once
+tombstones outnumber live files.
+"""
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from re import _parser as sre_parse
+
+SEARCH_EXTENSIONS = {
+    ".py", ".html", ".htm", ".jinja", ".j2", ".js", ".ts", ".css", ".scss",
+    ".json", ".toml", ".yaml", ".yml", ".md", ".txt", ".sql", ".sh", ".cfg", ".ini",
+}
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "site-packages"}
+# Larger files are almost always generated or vendored.
+MAX_FILE_BYTES = 2 * 1024 * 1024
+# A last word that is a prefix of more tokens than this is not used to narrow
+# the candidates ("a" would expand to most of the vocabulary).
+MAX_PREFIX_EXPANSION = 512
+# Characters of a matching line kept in a hit.
+MAX_LINE_CHARS = 240
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def line_trigrams(text: str) -> set[str]:
+    """
+    Trigrams of every line. Code repeats lines a lot, so each distinct line is
+    only sliced once: several times faster than trigrams() on the whole text.
+    Trigrams spanning a newline are left out (see _literal_candidates).
+    """
+    grams = set()
+    for line in set(text.split("\n")):
+        grams.update(line[i:i + 3] for i in range(len(line) - 2))
+    return grams
+
+
+class SearchHit:
+    """A matching line: 1-based line number, the line text and the (start, end) spans that matched."""
+    __slots__ = ("path", "line_number", "line", "spans")
+
+    def __init__(self, path: str, line_number: int, line: str, spans: list[tuple[int, int]]):
+        self.path = path
+        self.line_number = line_number
+        self.line = line
+        self.spans = spans
+
+    def __repr__(self) -> str:
+        return f"SearchHit({self.path}:{self.line_number})"
+
+
+# -------------------------------------------------
+# Regex prefilter
+# -------------------------------------------------
+
+def required_literals(pattern: str, flags: int = 0) -> list[str]:
+    """
+    Literal runs (lowercased) that every match of `pattern` must contain.
+    Conservative: anything optional or alternative ends a run and adds nothing.
+    """
+    return [run.lower() for run in _literal_runs(sre_parse.parse(pattern, flags)) if run]
+
+
+def _literal_runs(parsed) -> list[str]:
+    runs, current = [], []
+
+    def flush():
+        runs.append("".join(current))
+        current.clear()
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+        elif op is sre_parse.SUBPATTERN:
+            flush()
+            runs.extend(_literal_runs(av[3]))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            body = av[2]
+            if len(body) == 1 and body[0][0] is sre_parse.LITERAL:
+                current.append(chr(body[0][1]))  # "c+": at least one "c" continues the run
+                flush()
+            else:
+                flush()
+                runs.extend(_literal_runs(body))
+        else:
+            flush()
+    flush()
+    return runs
+
+
+# -------------------------------------------------
+# Index
+# -------------------------------------------------
+
+class CodeSearchIndex:
+    """
+    Thread-safe: `refresh()` can run in one worker while `search()` runs in
+    another. The lock is only held while postings change or candidates are
+    picked, never while files are read, so searching during the first
+    indexing pass works on whatever has been indexed so far.
+    """
+
+    def __init__(self, root: str = "."):
+        self.root = root
+        self._lock = threading.Lock()
+        self._paths: list[str | None] = []  # file id -> path, None once tombstoned
+        self._files: dict[str, tuple[int, int, int]] = {}  # path -> (file id, mtime_ns, size)
+        # token -> (sorted file ids, token positions in each of those files)
+        self._postings: dict[str, tuple[array, list[array]]] = {}
+        self._trigrams: dict[str, array] = {}  # trigram -> sorted file ids
+        self._vocabulary: list[str] | None = None  # Sorted tokens, rebuilt lazily for prefix queries
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    # --- Updating ---
+
+    def _iter_files(self, dir_path: str):
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name in SKIP_DIRS:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_files(entry.path)
+                elif os.path.splitext(entry.name)[1] in SEARCH_EXTENSIONS:
+                    yield entry
+            except OSError:
+                continue
+
+    def refresh(self) -> tuple[int, int]:
+        """Re-indexes changed files and drops deleted ones. Returns (indexed, removed)."""
+        indexed = 0
+        seen = set()
+        for entry in self._iter_files(self.root):
+            path = os.path.relpath(entry.path, self.root) if self.root not in ("", ".") else entry.path[2:]
+            seen.add(path)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            known = self._files.get(path)
+            if known and known[1:] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            if self.update_file(path, stat):
+                indexed += 1
+        removed = [path for path in self._files if path not in seen]
+        for path in removed:
+            self.remove_file(path)
+        return indexed, len(removed)
+
+    def update_file(self, path: str, stat: os.stat_result | None = None) -> bool:
+        """(Re-)indexes one file. Returns False if it is gone, too large or binary."""
+        full_path = os.path.join(self.root, path)
+        try:
+            stat = stat or os.stat(full_path)
+            if stat.st_size > MAX_FILE_BYTES:
+                self.remove_file(path)
+                return False
+            with open(full_path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            self.remove_file(path)
+            return False
+        if b"\0" in raw[:8192]:
+            self.remove_file(path)
+            return False
+        lower = raw.decode("utf-8", errors="replace").lower()
+
+        # Tokenizing is the expensive part: do it before taking the lock.
+        positions: dict[str, array] = {}
+        for position, token in enumerate(TOKEN_PATTERN.findall(lower)):
+            token_positions = positions.get(token)
+            if token_positions is None:
+                positions[token] = token_positions = array("I")
+            token_positions.append(position)
+        grams = line_trigrams(lower)
+
+        with self._lock:
+            self._tombstone(path)
+            file_id = len(self._paths)
+            self._paths.append(path)
+            self._files[path] = (file_id, stat.st_mtime_ns, stat.st_size)
+            for token, token_positions in positions.items():
+                posting = self._postings.get(token)
+                if posting is None:
+                    self._postings[token] = posting = (array("I"), [])
+                    self._vocabulary = None
+                posting[0].append(file_id)  # Ids only grow, so postings stay sorted
+                posting[1].append(token_positions)
+            for gram in grams:
+                ids = self._trigrams.get(gram)
+                if ids is None:
+                    self._trigrams[gram] = ids = array("I")
+                ids.append(file_id)
+        return True
+
+    def remove_file(self, path: str) -> None:
+        with self._lock:
+            self._tombstone(path)
+
+    def _tombstone(self, path: str) -> None:
+        known = self._files.pop(path, None)
+        if known is None:
+            return
+        self._paths[known[0]] = None
+        self._tombstones += 1
+        if self._tombstones > max(len(self._files), 1000):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drops tombstoned postings. Ids are kept, so no live posting moves."""
+        paths = self._paths
+        for token, (ids, positions) in list(self._postings.items()):
+            live = [i for i, file_id in enumerate(ids) if paths[file_id] is not None]
+            if not live:
+                del self._postings[token]
+            elif len(live) < len(ids):
+                self._postings[token] = (array("I", (ids[i] for i in live)), [positions[i] for i in live])
+        for gram, ids in list(self._trigrams.items()):
+            live = array("I", (file_id for file_id in ids if paths[file_id] is not None))
+            if live:
+                self._trigrams[gram] = live
+            else:
+                del self._trigrams[gram]
+        self._vocabulary = None
+        self._tombstones = 0
+
+    # --- Candidates ---
+
+    def _expand_prefix(self, prefix: str) -> list[str] | None:
+        """Tokens starting with `prefix`, or None if there are too many to be useful."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        tokens = []
+        for token in vocabulary[start:start + MAX_PREFIX_EXPANSION + 1]:
+            if not token.startswith(prefix):
+                break
+            tokens.append(token)
+        return tokens if len(tokens) <= MAX_PREFIX_EXPANSION else None
+
+    def _positions(self, token: str, file_id: int) -> array | None:
+        ids, positions = self._postings[token]
+        i = bisect_left(ids, file_id)
+        return positions[i] if i < len(ids) and ids[i] == file_id else None
+
+    def _phrase_candidates(self, words: list[str]) -> list[int] | None:
+        """
+        Files where `words` occur as consecutive tokens, the last one as a
+        prefix. None means the words cannot narrow the search (scan everything).
+        """
+        alternatives = [[word] if word in self._postings else [] for word in words[:-1]]
+        last = self._expand_prefix(words[-1])
+        if last is not None:
+            alternatives.append(last)
+        elif len(words) == 1:
+            return None
+        # Otherwise narrow on the complete words only; the pattern checks the rest.
+        if any(not tokens for tokens in alternatives):
+            return []
+
+        id_sets = []
+        for tokens in alternatives:
+            ids = set()
+            for token in tokens:
+                ids.update(self._postings[token][0])
+            id_sets.append(ids)
+        id_sets.sort(key=len)
+        files = id_sets[0].intersection(*id_sets[1:])
+        if len(alternatives) == 1:
+            return sorted(f for f in files if self._paths[f] is not None)
+
+        result = []
+        for file_id in sorted(files):
+            if self._paths[file_id] is None:
+                continue
+            # Start positions of the phrase that survive every following word.
+            starts = None
+            for offset, tokens in enumerate(alternatives):
+                found = set()
+                for token in tokens:
+                    token_positions = self._positions(token, file_id)
+                    if token_positions is not None:
+                        found.update(p - offset for p in token_positions)
+                starts = found if starts is None else starts & found
+                if not starts:
+                    break
+            if starts:
+                result.append(file_id)
+        return result
+
+    def _literal_candidates(self, literals: list[str]) -> list[int] | None:
+        """Files containing every literal (by trigrams). None if no literal is long enough."""
+        grams = {gram for literal in literals for line in literal.split("\n") for gram in trigrams(line)}
+        if not grams:
+            return None
+        postings = sorted((self._trigrams.get(gram, array("I")) for gram in grams), key=len)
+        files = set(postings[0])
+        for ids in postings[1:]:
+            if not files:
+                break
+            files.intersection_update(ids)
+        return sorted(f for f in files if self._paths[f] is not None)
+
+    # --- Searching ---
+
+    def compile(self, query: str, regex: bool = False) -> tuple[re.Pattern | None, list[str] | None, list[str]]:
+        """
+        Returns (pattern, words, literals) for a query: `words` for a plain
+        query, `literals` required by a regex. Raises re.error for a bad regex.
+        """
+        if regex:
+            pattern = re.compile(query, re.MULTILINE)
+            return pattern, None, required_literals(query, re.MULTILINE)
+        words = TOKEN_PATTERN.findall(query.lower())
+        if not words:
+            return None, None, []
+        # Words as whole tokens separated by anything else; the last may be incomplete.
+        body = r"[^a-z0-9_]+".join(re.escape(word) for word in words)
+        pattern = re.compile(rf"(?<![a-z0-9_]){body}[a-z0-9_]*", re.IGNORECASE)
+        return pattern, words, []
+
+    def search(self, query: str, regex: bool = False, max_hits: int = 1000):
+        """
+        Yields SearchHits file by file. Plain queries match words (the last one
+        as a prefix), case-insensitively; regex queries are matched as given.
+        """
+        pattern, words, literals = self.compile(query, regex)
+        if pattern is None:
+            return
+        with self._lock:
+            candidates = self._phrase_candidates(words) if words else self._literal_candidates(literals)
+            if candidates is None:
+                candidates = [file_id for file_id, path in enumerate(self._paths) if path is not None]
+            paths = [self._paths[file_id] for file_id in candidates]
+
+        hits = 0
+        for path in paths:
+            if path is None:
+                continue  # Tombstoned since the candidates were picked
+            for hit in self._match_file(path, pattern):
+                yield hit
+                hits += 1
+                if hits >= max_hits:
+                    return
+
+    def _match_file(self, path: str, pattern: re.Pattern):
+        try:
+            with open(os.path.join(self.root, path), encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return
+        line_number, counted_to = 1, 0
+        current = None
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                continue
+            line_number += text.count("\n", counted_to, start)
+            counted_to = start
+            if current is None or current.line_number != line_number:
+                if current is not None:
+                    yield current
+                line_start = text.rfind("\n", 0, start) + 1
+                line_end = text.find("\n", start)
+                line = text[line_start:line_end if line_end >= 0 else len(text)]
+                current = SearchHit(path, line_number, line[:MAX_LINE_CHARS], [])
+                current_offset = line_start
+            span_end = min(end - current_offset, len(current.line))
+            if start - current_offset < span_end:
+                current.spans.append((start - current_offset, span_end))
+        if current is not None:
+            yield current
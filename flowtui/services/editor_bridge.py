@@ -0,0 +1,292 @@
+"""
+A persistent Neovim session for "Edit in Neovim".
+
+Instead of starting a new nvim (config, plugins and all) for every edit,
+FlowTUI talks to one long-lived `nvim --listen` server over msgpack-rpc:
+
+- If a server is already listening on the socket (for example one you
+  started in another terminal with `nvim --listen .flowtui/nvim.sock`), a
+  jump is a single RPC and the TUI never leaves the screen.
+- Otherwise FlowTUI starts a headless server once and shows it with a thin
+  `nvim --server ... --remote-ui` client: in a new tmux pane when running in
+  tmux, else in place of the TUI until you quit it. In that server, quitting
+  the last window (:q, :wq, :x, ZZ, :qa, ...) only detaches the UI, so
+  buffers, undo history and plugin state survive between edits until
+  FlowTUI exits.
+
+Every connection registers a BufWritePost autocommand that notifies FlowTUI
+of the written file, so its indexes are refreshed right away.
+"""
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+
+from services import msgpack_lite
+
+SOCKET_PATH = os.environ.get("FLOWTUI_NVIM_SOCKET", os.path.join(".flowtui", "nvim.sock"))
+WRITE_EVENT = "flowtui_buf_write"
+
+# Quit commands that detach a UI from the server FlowTUI started instead of
+# ending it: user command -> (command it replaces, its aliases, write first, quits all windows).
+_DETACHING_QUITS = {
+    "FlowtuiQuit": ("quit", ["q", "quit"], "", 0),
+    "FlowtuiWriteQuit": ("wq", ["wq"], "write", 0),
+    "FlowtuiExit": ("xit", ["x", "xit", "exit"], "update", 0),
+    "FlowtuiQuitAll": ("qall", ["qa", "qall", "quita", "quitall"], "", 1),
+    "FlowtuiWriteQuitAll": ("wqall", ["wqa", "wqall", "xa", "xall"], "wall", 1),
+}
+_DETACH_ON_QUIT = """
+function! FlowtuiDetachOnQuit(original, write, all, bang) abort
+  if !a:all && (winnr('$') > 1 || tabpagenr('$') > 1)
+    execute a:original . a:bang
+    return
+  endif
+  if !empty(a:write)
+    execute a:write . a:bang
+  endif
+  detach
+endfunction
+nnoremap ZZ <Cmd>FlowtuiExit<CR>
+nnoremap ZQ <Cmd>FlowtuiQuit!<CR>
+""" + "".join(
+    f"command! -bang {name} call FlowtuiDetachOnQuit('{original}', '{write}', {all}, <q-bang>)\n"
+    + "".join(
+        f"cnoreabbrev <expr> {alias} getcmdtype() ==# ':' && getcmdline() ==# '{alias}' ? '{name}' : '{alias}'\n"
+        for alias in aliases
+    )
+    for name, (original, aliases, write, all) in _DETACHING_QUITS.items()
+)
+
+# msgpack-rpc message types
+REQUEST, RESPONSE, NOTIFICATION = 0, 1, 2
+
+
+class EditorError(RuntimeError):
+    """Raised when Neovim cannot be started or reached, or rejects a request."""
+
+
+class NvimClient:
+    """
+    msgpack-rpc connection to a Neovim server. `call()` blocks until the
+    response arrives; a reader thread matches responses to requests and
+    hands notifications to `on_notification(method, params)`.
+    """
+
+    def __init__(self, socket_path: str, on_notification=None, timeout: float = 2.0):
+        self.timeout = timeout
+        self.on_notification = on_notification
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+        self._pending: dict[int, list] = {}  # msgid -> [event, error, result]
+        self.closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="nvim-rpc", daemon=True)
+        self._reader.start()
+
+    def call(self, method: str, *args):
+        event = threading.Event()
+        with self._send_lock:
+            if self.closed:
+                raise EditorError("Neovim connection is closed")
+            self._next_id += 1
+            msgid = self._next_id
+            self._pending[msgid] = slot = [event, None, None]
+            try:
+                self._sock.sendall(msgpack_lite.pack([REQUEST, msgid, method, list(args)]))
+            except OSError as e:
+                self._pending.pop(msgid, None)
+                self.close()
+                raise EditorError(f"Neovim connection lost: {e}") from e
+        if not event.wait(self.timeout):
+            self._pending.pop(msgid, None)
+            raise EditorError(f"Neovim did not answer {method} in {self.timeout}s")
+        if slot[1] is not None:
+            error = slot[1]
+            # Neovim sends [error type, message]
+            raise EditorError(error[1] if isinstance(error, list) and len(error) > 1 else str(error))
+        return slot[2]
+
+    def notify(self, method: str, *args) -> None:
+        """Sends a request without waiting for (or getting) an answer."""
+        with self._send_lock:
+            if self.closed:
+                raise EditorError("Neovim connection is closed")
+            try:
+                self._sock.sendall(msgpack_lite.pack([NOTIFICATION, method, list(args)]))
+            except OSError as e:
+                self.close()
+                raise EditorError(f"Neovim connection lost: {e}") from e
+
+    def _read_loop(self) -> None:
+        unpacker = msgpack_lite.Unpacker()
+        try:
+            while True:
+                data = self._sock.recv(65536)
+                if not data:
+                    break
+                unpacker.feed(data)
+                for message in unpacker:
+                    self._dispatch(message)
+        except (OSError, msgpack_lite.UnpackError):
+            pass
+        finally:
+            self.close()
+
+    def _dispatch(self, message) -> None:
+        kind = message[0]
+        if kind == RESPONSE:
+            _, msgid, error, result = message
+            slot = self._pending.pop(msgid, None)
+            if slot is not None:
+                slot[1], slot[2] = error, result
+                slot[0].set()
+        elif kind == NOTIFICATION:
+            if self.on_notification is not None:
+                self.on_notification(message[1], message[2])
+        elif kind == REQUEST:
+            # FlowTUI exposes no methods; answer so Neovim does not wait.
+            with self._send_lock:
+                try:
+                    self._sock.sendall(msgpack_lite.pack([RESPONSE, message[1], f"Unknown method {message[2]}", None]))
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        for slot in list(self._pending.values()):
+            slot[1] = [0, "Neovim connection closed"]
+            slot[0].set()
+        self._pending.clear()
+
+
+class EditorBridge:
+    """
+    Opens files at a line in the shared Neovim session. `on_write(path)` is
+    called (from the RPC reader thread) with the project-relative path of
+    every file Neovim writes.
+    """
+
+    # How long a freshly started server gets to create its socket.
+    START_TIMEOUT = 10.0
+
+    def __init__(self, on_write=None, socket_path: str = SOCKET_PATH, nvim: str = "nvim"):
+        self.on_write = on_write
+        self.socket_path = socket_path
+        self.nvim = nvim
+        self._client: NvimClient | None = None
+        self._server: subprocess.Popen | None = None  # A server we started
+        self._lock = threading.Lock()
+
+    # --- Connection ---
+
+    def _connect(self) -> NvimClient | None:
+        if not os.path.exists(self.socket_path):
+            return None
+        try:
+            client = NvimClient(self.socket_path, self._notified)
+        except OSError:
+            if self._server is None or self._server.poll() is not None:
+                try:
+                    os.unlink(self.socket_path)  # Stale socket from a server that is gone
+                except OSError:
+                    pass
+            return None
+        channel = client.call("nvim_get_api_info")[0]
+        group = f"flowtui_{os.getpid()}_{channel}"
+        for command in (
+            f"augroup {group}",
+            "autocmd!",
+            f"autocmd BufWritePost * silent! call rpcnotify({channel}, '{WRITE_EVENT}', expand('<afile>:p'))",
+            "augroup END",
+        ):
+            client.call("nvim_command", command)
+        return client
+
+    def _start_server(self) -> NvimClient:
+        if shutil.which(self.nvim) is None:
+            raise EditorError(f"'{self.nvim}' was not found on PATH")
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        self._server = subprocess.Popen(
+            [self.nvim, "--headless", "--listen", self.socket_path],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Survives a Ctrl+C in the TUI
+        )
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._server.poll() is not None:
+                raise EditorError(f"Neovim exited while starting (code {self._server.returncode})")
+            client = self._connect()
+            if client is not None:
+                # :detach needs Neovim 0.10; older servers still end with the UI.
+                if client.call("nvim_eval", "has('nvim-0.10')"):
+                    client.call("nvim_exec2", _DETACH_ON_QUIT, {})
+                return client
+            time.sleep(0.02)
+        raise EditorError("Neovim did not start listening in time")
+
+    def client(self) -> NvimClient:
+        """The live connection, reconnecting (or starting a server) if needed."""
+        with self._lock:
+            if self._client is None or self._client.closed:
+                self._client = self._connect() or self._start_server()
+            return self._client
+
+    def _notified(self, method: str, params: list) -> None:
+        if method == WRITE_EVENT and params and self.on_write is not None:
+            path = params[0]
+            try:
+                # Relative like the workspace roots, also outside the current directory ("../billing/...").
+                path = os.path.relpath(path)
+            except ValueError:  # Another drive on Windows
+                pass
+            self.on_write(path)
+
+    # --- Editing ---
+
+    def open(self, file_path: str, line: int = 1) -> bool:
+        """
+        Shows `file_path` at `line` in the session. Returns True if a UI is
+        already attached to it (nothing else to do), False if the caller
+        should show it with `ui_command()`.
+        """
+        client = self.client()
+        escaped = client.call("nvim_call_function", "fnameescape", [os.path.abspath(file_path)])
+        client.call("nvim_command", f"drop +{max(line, 1)} {escaped}")
+        client.call("nvim_command", "normal! zz")
+        return bool(client.call("nvim_list_uis"))
+
+    def ui_command(self) -> list[str]:
+        """A thin client that displays the running session (quitting it detaches from a server FlowTUI started)."""
+        return [self.nvim, "--server", self.socket_path, "--remote-ui"]
+
+    def tmux_command(self) -> list[str] | None:
+        """Opens the session in a new tmux pane, when running inside tmux."""
+        if not os.environ.get("TMUX") or shutil.which("tmux") is None:
+            return None
+        return ["tmux", "split-window", "-h", *self.ui_command()]
+
+    def close(self) -> None:
+        """
+        Disconnects. A server FlowTUI started is asked to quit unless a UI is
+        attached to it; it stays up if a buffer has unsaved changes.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            if self._server is not None and self._server.poll() is None and not client.call("nvim_list_uis"):
+                client.notify("nvim_command", "qall")
+        except EditorError:
+            pass
+        client.close()
@@ -0,0 +1,47 @@
+import re
+
+# Inner classes inheriting from BaseFlow.
+# Group 1: flow name (the inner class), groups 2/3: docstring (optional), group 4: class body.
+# The lookahead stops before the next class definition or at the end of the file.
+FLOW_CLASS_PATTERN = re.compile(
+    r"class\s+(\w+)\s*\(\s*BaseFlow\s*\)\s*:\s*(?:(?:\"\"\"(.*?)\"\"\")|(?:\'\'\'(.*?)\'\'\'))?([\s\S]*?)(?=\n\s*class\s+\w+|\Z)",
+    re.MULTILINE
+)
+ROUTES_PATTERN = re.compile(r'Routes:\s*([A-Z0-9_, ]+)', re.IGNORECASE)
+METHOD_PATTERN = re.compile(r'^\s*def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', re.MULTILINE)
+
+
+def parse_flow_structure(content: str) -> dict[str, dict[str, list[str] | set[str]]]:
+    """
+    Finds BaseFlow subclasses (flows) in a flow file's source, their routes from
+    docstrings, and their public methods.
+    Returns a dict like:
+    {
+        "flow_name": {
+            "routes": ["ROUTE1", "ROUTE2"],
+            "methods": {"get", "post"}
+        },
+        ...
+    }
+    Headless (no Textual), so the index daemon and the TUI share it.
+    """
+    flow_data = {}
+    for match in FLOW_CLASS_PATTERN.finditer(content):
+        flow_name = match.group(1)
+        docstring = match.group(2) or match.group(3) or ""
+        class_body = match.group(4)
+
+        routes = []
+        routes_match = ROUTES_PATTERN.search(docstring) if docstring else None
+        if routes_match:
+            routes = [route.strip() for route in routes_match.group(1).split(',')]
+
+        methods = set()
+        if class_body:
+            # Public methods defined directly within this flow class's body, lowercased.
+            methods = {m.lower() for m in METHOD_PATTERN.findall(class_body) if not m.startswith('_')}
+
+        # Only routes or methods indicate a valid flow definition
+        if routes or methods:
+            flow_data[flow_name] = {"routes": routes, "methods": methods}
+    return flow_data
@@ -0,0 +1,219 @@
+"""
+Cross-reference index between frontends and flows.
+
+Frontends name the flow they call in a few ways:
+
+- HTML / JS:  flow:click="products.index.get", flow:subscribe="fleet.vehicles.index"
+              (any flow:* attribute except the options below, such as flow:target)
+- Python:     op.flow_action = "fleet.vehicles.create", UIElement(flow_action="...")
+
+The index maps every flow name to the references that call it, and every
+(file, line) to the flows called there (for markup, the line the element's
+tag starts on). Both lookups are dict lookups. Flow definitions come from
+the BaseFlow classes under backend/flows, so a reference to a missing flow,
+or to a verb the flow does not implement, is reported as dangling.
+
+`refresh()` only re-reads files whose mtime changed, and a changed file
+replaces exactly the references (or definitions) it contributed.
+"""
+import os
+import re
+
+from flow_system.registry import FlowRegistry, split_flow_name
+from services.flow_parser import parse_flow_structure
+
+# Directories the project scan covers (see CodeScannerService).
+XREF_ROOTS = ("backend", "apps")
+MARKUP_EXTENSIONS = {".html", ".htm", ".jinja", ".j2", ".js", ".ts"}
+SKIP_DIRS = {"__pycache__", "node_modules"}
+
+# flow:* attributes that configure a call instead of naming a flow.
+FLOW_OPTION_ATTRIBUTES = {
+    "target", "swap", "trigger", "poll", "params", "confirm", "indicator", "vals", "include", "select",
+}
+FLOW_NAME = r"[A-Za-z_]\w*(?:\.\w+)+"
+MARKUP_REFERENCE_PATTERN = re.compile(rf"""flow:([a-z][a-z-]*)\s*=\s*["']({FLOW_NAME})["']""")
+PYTHON_REFERENCE_PATTERN = re.compile(rf"""\bflow_action\s*(?::[^=\n]*)?=\s*["']({FLOW_NAME})["']""")
+TAG_PATTERN = re.compile(r"<([a-zA-Z][\w-]*)([^<>]*)$")
+ID_PATTERN = re.compile(r"""\bid\s*=\s*["']([^"']+)["']""")
+
+
+class FlowReference:
+    """One place where a frontend names a flow."""
+    __slots__ = ("file_path", "line", "attribute", "target", "flow_name", "verb", "element")
+
+    def __init__(self, file_path: str, line: int, attribute: str, target: str, element: str):
+        self.file_path = file_path
+        self.line = line
+        self.attribute = attribute  # "flow:click", "flow_action", ...
+        self.target = target  # As written: "products.index.get"
+        self.flow_name, self.verb = split_flow_name(target)
+        self.element = element  # "<button#save>", or the Python source line
+
+    def __repr__(self) -> str:
+        return f"FlowReference({self.file_path}:{self.line} {self.attribute}={self.target!r})"
+
+
+def _line_numbers(text: str, offsets):
+    """Yields the 1-based line of each offset (offsets in increasing order)."""
+    line, counted_to = 1, 0
+    for offset in offsets:
+        line += text.count("\n", counted_to, offset)
+        counted_to = offset
+        yield line
+
+
+def parse_references(file_path: str, text: str) -> list[FlowReference]:
+    """Finds the flow references in one file's source."""
+    if file_path.endswith(".py"):
+        matches = [(m.start(), "flow_action", m.group(1)) for m in PYTHON_REFERENCE_PATTERN.finditer(text)]
+    else:
+        matches = [
+            (m.start(), f"flow:{m.group(1)}", m.group(2))
+            for m in MARKUP_REFERENCE_PATTERN.finditer(text)
+            if m.group(1) not in FLOW_OPTION_ATTRIBUTES
+        ]
+    located = []  # (offset of the element, attribute, target, element)
+    for offset, attribute, target in matches:
+        if attribute == "flow_action":
+            line_start = text.rfind("\n", 0, offset) + 1
+            line_end = text.find("\n", offset)
+            located.append((offset, attribute, target, text[line_start:line_end if line_end >= 0 else len(text)].strip()))
+            continue
+        # The attribute's element: the last tag opened before it. Tags often
+        # span lines; the reference is filed under the line the tag starts on.
+        tag = TAG_PATTERN.search(text, max(0, offset - 2000), offset)
+        if tag is None:
+            located.append((offset, attribute, target, "<?>"))
+            continue
+        element_id = ID_PATTERN.search(tag.group(2))
+        located.append((tag.start(), attribute, target, f"<{tag.group(1)}{'#' + element_id.group(1) if element_id else ''}>"))
+    return [
+        FlowReference(file_path, line, attribute, target, element)
+        for (_, attribute, target, element), line in zip(located, _line_numbers(text, (l[0] for l in located)))
+    ]
+
+
+class FlowXrefIndex:
+    def __init__(self, roots: tuple[str, ...] = XREF_ROOTS):
+        self.roots = roots
+        self.registry = FlowRegistry()
+        self._mtimes: dict[str, int] = {}
+        self._references: dict[str, list[FlowReference]] = {}  # file -> references in it
+        self._callers: dict[str, dict[FlowReference, None]] = {}  # flow name -> references (ordered set)
+        self._by_line: dict[tuple[str, int], list[FlowReference]] = {}
+        self._definitions: dict[str, tuple[str, set[str]]] = {}  # flow name -> (file, methods)
+        self._defined_in: dict[str, list[str]] = {}  # file -> flow names defined in it
+
+    # --- Lookups ---
+
+    def callers(self, flow_name: str) -> list[FlowReference]:
+        """Every reference to `flow_name` (with or without a verb)."""
+        return list(self._callers.get(flow_name, ()))
+
+    def calls_from(self, file_path: str, line: int) -> list[FlowReference]:
+        """The flows called by the element on `line` of `file_path`."""
+        return self._by_line.get((file_path, line), [])
+
+    def references_in(self, file_path: str) -> list[FlowReference]:
+        return self._references.get(file_path, [])
+
+    def definition(self, flow_name: str) -> tuple[str, set[str]] | None:
+        """(file defining the flow, its public methods), or None if no such flow exists."""
+        return self._definitions.get(flow_name)
+
+    def problem(self, reference: FlowReference) -> str | None:
+        """Why a reference is dangling, or None if it resolves."""
+        definition = self._definitions.get(reference.flow_name)
+        if definition is None:
+            return f"no flow named '{reference.flow_name}'"
+        if reference.verb and reference.verb not in definition[1]:
+            return f"'{reference.flow_name}' does not implement {reference.verb.upper()}"
+        return None
+
+    def dangling(self) -> list[tuple[FlowReference, str]]:
+        """Every reference that does not resolve, with the reason."""
+        found = []
+        for flow_name, references in self._callers.items():
+            for reference in references:
+                problem = self.problem(reference)
+                if problem:
+                    found.append((reference, problem))
+        return found
+
+    # --- Updating ---
+
+    def _iter_files(self, dir_path: str):
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name in SKIP_DIRS:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._iter_files(entry.path)
+            elif entry.name.endswith(".py") or os.path.splitext(entry.name)[1] in MARKUP_EXTENSIONS:
+                yield entry
+
+    def refresh(self) -> int:
+        """Re-reads the files that changed since the last refresh. Returns how many changed."""
+        changed = 0
+        seen = set()
+        for root in self.roots:
+            for entry in self._iter_files(root):
+                seen.add(entry.path)
+                try:
+                    mtime = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                if self._mtimes.get(entry.path) != mtime:
+                    self._mtimes[entry.path] = mtime
+                    self.update_file(entry.path)
+                    changed += 1
+        for path in [path for path in self._mtimes if path not in seen]:
+            self.remove_file(path)
+            changed += 1
+        return changed
+
+    def update_file(self, file_path: str) -> None:
+        try:
+            with open(file_path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            self.remove_file(file_path)
+            return
+        self._forget(file_path)
+
+        references = parse_references(file_path, text)
+        if references:
+            self._references[file_path] = references
+        for reference in references:
+            self._callers.setdefault(reference.flow_name, {})[reference] = None
+            self._by_line.setdefault((file_path, reference.line), []).append(reference)
+
+        if file_path.endswith(".py") and f"{os.sep}flows{os.sep}" in f"{os.sep}{file_path}":
+            names = []
+            for class_name, structure in parse_flow_structure(text).items():
+                flow_name = self.registry.flow_name_for(file_path, class_name)
+                self._definitions[flow_name] = (file_path, structure["methods"])
+                names.append(flow_name)
+            if names:
+                self._defined_in[file_path] = names
+
+    def remove_file(self, file_path: str) -> None:
+        self._mtimes.pop(file_path, None)
+        self._forget(file_path)
+
+    def _forget(self, file_path: str) -> None:
+        for reference in self._references.pop(file_path, ()):
+            callers = self._callers.get(reference.flow_name)
+            if callers is not None:
+                callers.pop(reference, None)
+                if not callers:
+                    del self._callers[reference.flow_name]
+            self._by_line.pop((file_path, reference.line), None)
+        for flow_name in self._defined_in.pop(file_path, ()):
+            if self._definitions.get(flow_name, ("",))[0] == file_path:
+                del self._definitions[flow_name]
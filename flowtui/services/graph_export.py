@@ -0,0 +1,308 @@
+"""
+Streaming exports of the project graph.
+
+`CodeScannerService.scan_project()` builds the whole nested graph in memory;
+the writers here walk the same directories and write each node as soon as it
+is seen, so memory stays proportional to the directory depth instead of the
+project size. Three formats:
+
+- json:    the same document scan_project() produces, written incrementally.
+- ndjson:  one {"path": ..., "dir": ...} object per line.
+- msgpack: a header map, then one [parent, name, is_dir] array per node.
+           `parent` is the id of the parent directory node (-1 for scan roots,
+           whose name is their full path; directories are numbered in the
+           order they appear) and
+           `name` is either a new string or the index of an earlier one in
+           the name table, so repeated path segments are stored once.
+
+`read_nodes()` reads the ndjson and msgpack formats back as (path, is_dir)
+pairs and `graph_from_nodes()` rebuilds the scan_project() dict from them.
+"""
+import json
+import os
+
+from services import msgpack_lite
+
+MSGPACK_HEADER = {"format": "flowtui-graph", "version": 1}
+
+
+# -------------------------------------------------
+# Walking
+# -------------------------------------------------
+
+def _entries(dir_path: str):
+    """Directory entries in os.listdir() order (the order scan_project() uses)."""
+    try:
+        with os.scandir(dir_path) as it:
+            yield from it
+    except OSError:
+        return
+
+
+def _walk(root: str, dir_path: str):
+    """Yields (path, is_dir) for every node below `dir_path`, depth first, both relative to `root`."""
+    for entry in _entries(os.path.join(root, dir_path)):
+        is_dir = entry.is_dir()
+        path = os.path.join(dir_path, entry.name)
+        yield path, is_dir
+        if is_dir:
+            yield from _walk(root, path)
+
+
+def _frontends(app_path: str):
+    for entry in _entries(app_path):
+        if entry.name.startswith("ext_frontend_") and entry.is_dir():
+            yield entry
+
+
+def iter_nodes(root: str = "."):
+    """
+    Yields (path, is_dir) for everything scan_project() covers, depth first,
+    paths relative to `root`. Scan roots (backend, apps/<app>, apps/<app>/backend,
+    apps/<app>/ext_frontend_*) are included so the graph can be rebuilt.
+    """
+    if os.path.isdir(os.path.join(root, "backend")):
+        yield "backend", True
+        yield from _walk(root, "backend")
+    for app in _entries(os.path.join(root, "apps")):
+        if not app.is_dir():
+            continue
+        app_path = os.path.join("apps", app.name)
+        yield app_path, True
+        backend = os.path.join(app_path, "backend")
+        if os.path.isdir(os.path.join(root, backend)):
+            yield backend, True
+            yield from _walk(root, backend)
+        for frontend in _frontends(app.path):
+            frontend_path = os.path.join(app_path, frontend.name)
+            yield frontend_path, True
+            yield from _walk(root, frontend_path)
+
+
+# -------------------------------------------------
+# Writers
+# -------------------------------------------------
+
+class JsonStreamWriter:
+    """
+    Writes a JSON document piece by piece, with the same layout as
+    json.dumps(obj, indent=indent), or separators=(",", ":") when indent is None.
+    """
+
+    def __init__(self, out, indent: int | None = 2):
+        self.out = out
+        self.indent = indent
+        self._first: list[bool] = []  # Per open container: no item written yet
+        self._after_key = False
+
+    def _item(self) -> None:
+        if self._after_key:
+            self._after_key = False  # The value of a key: already positioned
+            return
+        if not self._first:
+            return
+        if not self._first[-1]:
+            self.out.write(",")
+        self._first[-1] = False
+        if self.indent is not None:
+            self.out.write("\n" + " " * (self.indent * len(self._first)))
+
+    def _open(self, bracket: str) -> None:
+        self._item()
+        self.out.write(bracket)
+        self._first.append(True)
+
+    def _close(self, bracket: str) -> None:
+        empty = self._first.pop()
+        if not empty and self.indent is not None:
+            self.out.write("\n" + " " * (self.indent * len(self._first)))
+        self.out.write(bracket)
+
+    def begin_object(self) -> None:
+        self._open("{")
+
+    def end_object(self) -> None:
+        self._close("}")
+
+    def begin_array(self) -> None:
+        self._open("[")
+
+    def end_array(self) -> None:
+        self._close("]")
+
+    def key(self, name: str) -> None:
+        self._item()
+        self.out.write(json.dumps(name) + (": " if self.indent is not None else ":"))
+        self._after_key = True
+
+    def value(self, value) -> None:
+        self._item()
+        self.out.write(json.dumps(value))
+
+
+def write_json(out, root: str = ".", indent: int | None = 2) -> None:
+    """Writes the scan_project() document without holding it in memory."""
+    writer = JsonStreamWriter(out, indent)
+
+    def tree(dir_path: str) -> None:
+        writer.begin_object()
+        for entry in _entries(dir_path):
+            writer.key(entry.name)
+            if entry.is_dir():
+                tree(entry.path)
+            else:
+                writer.value(None)
+        writer.end_object()
+
+    writer.begin_object()
+    writer.key("apps")
+    writer.begin_object()
+    for app in _entries(os.path.join(root, "apps")):
+        if not app.is_dir():
+            continue
+        writer.key(app.name)
+        writer.begin_object()
+        writer.key("backend_tree")
+        backend = os.path.join(app.path, "backend")
+        if os.path.isdir(backend):
+            tree(backend)
+        else:
+            writer.value(None)
+        writer.key("frontends")
+        writer.begin_array()
+        for frontend in _frontends(app.path):
+            writer.begin_object()
+            writer.key("name")
+            writer.value(frontend.name)
+            writer.key("tree")
+            tree(frontend.path)
+            writer.end_object()
+        writer.end_array()
+        writer.end_object()
+    writer.end_object()
+    writer.key("backend_tree")
+    backend = os.path.join(root, "backend")
+    if os.path.isdir(backend):
+        tree(backend)
+    else:
+        writer.value(None)
+    writer.end_object()
+    out.write("\n")
+
+
+def write_ndjson(out, root: str = ".") -> None:
+    for path, is_dir in iter_nodes(root):
+        out.write(json.dumps({"path": path, "dir": is_dir}) + "\n")
+
+
+def write_msgpack(out, root: str = ".", batch_bytes: int = 65536) -> None:
+    """Writes the binary node stream to a binary file object."""
+    names: dict[str, int] = {}
+    dir_ids: list[tuple[str, int]] = []  # Stack of (path, id) for the current branch
+    next_dir_id = 0
+    buf = bytearray(msgpack_lite.pack(MSGPACK_HEADER))
+
+    for path, is_dir in iter_nodes(root):
+        parent_path, _, name = path.rpartition(os.sep)
+        while dir_ids and dir_ids[-1][0] != parent_path:
+            dir_ids.pop()
+        if dir_ids:
+            parent = dir_ids[-1][1]
+        else:
+            parent, name = -1, path  # A scan root such as "apps/<app>" keeps its full path
+
+        ref = names.get(name)
+        if ref is None:
+            names[name] = len(names)
+            ref = name
+        msgpack_lite._pack_into([parent, ref, is_dir], buf)
+
+        if is_dir:
+            dir_ids.append((path, next_dir_id))
+            next_dir_id += 1
+        if len(buf) >= batch_bytes:
+            out.write(buf)
+            buf.clear()
+    out.write(buf)
+
+
+WRITERS = {"json": write_json, "ndjson": write_ndjson, "msgpack": write_msgpack}
+
+
+# -------------------------------------------------
+# Readers
+# -------------------------------------------------
+
+def read_nodes(stream):
+    """
+    Yields (path, is_dir) from an ndjson or msgpack export.
+    `stream` must be a binary file object; the format is detected from the first byte.
+    """
+    first = stream.read(1)
+    if not first:
+        return
+    if first == b"{":
+        yield from _read_ndjson(first + stream.readline(), stream)
+    else:
+        yield from _read_msgpack(first, stream)
+
+
+def _read_ndjson(first_line: bytes, stream):
+    for line in (first_line, *iter(stream.readline, b"")):
+        if line.strip():
+            node = json.loads(line)
+            yield node["path"], node["dir"]
+
+
+def _read_msgpack(first: bytes, stream):
+    unpacker = msgpack_lite.Unpacker()
+    unpacker.feed(first)
+    names: list[str] = []
+    dirs: list[str] = []
+    header = None
+    for chunk in (b"", *iter(lambda: stream.read(65536), b"")):
+        unpacker.feed(chunk)
+        for obj in unpacker:
+            if header is None:
+                header = obj
+                if not isinstance(header, dict) or header.get("format") != MSGPACK_HEADER["format"]:
+                    raise ValueError("Not a flowtui graph export")
+                continue
+            parent, ref, is_dir = obj
+            if isinstance(ref, str):
+                names.append(ref)
+                name = ref
+            else:
+                name = names[ref]
+            path = name if parent < 0 else dirs[parent] + os.sep + name
+            if is_dir:
+                dirs.append(path)
+            yield path, is_dir
+
+
+def graph_from_nodes(nodes) -> dict:
+    """Rebuilds the scan_project() dict from (path, is_dir) pairs."""
+    graph = {"apps": {}, "backend_tree": None}
+    trees: dict[str, dict] = {}  # Directory path -> its dict in the graph
+
+    for path, is_dir in nodes:
+        parts = path.split(os.sep)
+        if parts[0] == "backend" and len(parts) == 1:
+            graph["backend_tree"] = trees[path] = {}
+            continue
+        if parts[0] == "apps" and len(parts) == 2:
+            graph["apps"][parts[1]] = {"backend_tree": None, "frontends": []}
+            continue
+        if parts[0] == "apps" and len(parts) == 3:
+            app = graph["apps"][parts[1]]
+            trees[path] = {}
+            if parts[2] == "backend":
+                app["backend_tree"] = trees[path]
+            else:
+                app["frontends"].append({"name": parts[2], "tree": trees[path]})
+            continue
+        parent, _, name = path.rpartition(os.sep)
+        trees[parent][name] = {} if is_dir else None
+        if is_dir:
+            trees[path] = trees[parent][name]
+    return graph
@@ -0,0 +1,151 @@
+import os
+import re
+import time
+from collections import deque
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values, ceiling: float | None = None) -> str:
+    """Renders values as a one-line unicode sparkline, scaled to `ceiling` (or the max)."""
+    if not values:
+        return ""
+    top = ceiling or max(values) or 1.0
+    last = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[min(last, int(v / top * last))] for v in values)
+
+
+class ProcReader:
+    """
+    Reads host counters from a /proc-style directory.
+
+    The files stay open and are re-read from offset 0 on every sample, which
+    avoids the open/close syscalls that would otherwise dominate the cost.
+    `proc_root` can point at a directory mirroring /proc of another machine
+    (e.g. synced or mounted) to stand in for a remote node without SSH.
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self._fds: dict[str, int] = {}
+
+    def _read(self, name: str) -> str:
+        fd = self._fds.get(name)
+        if fd is None:
+            fd = self._fds[name] = os.open(os.path.join(self.proc_root, name), os.O_RDONLY)
+        return os.pread(fd, 65536, 0).decode()
+
+    def close(self) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def read_counters(self) -> dict:
+        """Returns raw cumulative counters; rates are derived by the collector."""
+        counters = {}
+
+        # cpu  user nice system idle iowait irq softirq steal ...
+        cpu = [int(v) for v in self._read("stat").split("\n", 1)[0].split()[1:]]
+        counters["cpu_total"] = sum(cpu[:8])
+        counters["cpu_idle"] = cpu[3] + (cpu[4] if len(cpu) > 4 else 0)
+
+        meminfo = {}
+        for line in self._read("meminfo").splitlines():
+            key, _, rest = line.partition(":")
+            meminfo[key] = int(rest.split()[0]) if rest.split() else 0
+        counters["mem_total"] = meminfo.get("MemTotal", 0)
+        counters["mem_available"] = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+
+        counters["load1"] = float(self._read("loadavg").split()[0])
+
+        # Whole disks only: partitions (sda1, nvme0n1p1) would double count.
+        disks = {}
+        for line in self._read("diskstats").splitlines():
+            fields = line.split()
+            if len(fields) >= 10 and not fields[2].startswith(("loop", "ram")):
+                disks[fields[2]] = (int(fields[5]), int(fields[9]))
+        whole = {n: v for n, v in disks.items() if not any(re.fullmatch(re.escape(d) + r"p?\d+", n) for d in disks)}
+        counters["disk_read"] = sum(r for r, _ in whole.values()) * 512
+        counters["disk_write"] = sum(w for _, w in whole.values()) * 512
+
+        rx = tx = 0
+        for line in self._read("net/dev").splitlines()[2:]:
+            iface, _, data = line.partition(":")
+            if iface.strip() == "lo":
+                continue
+            fields = data.split()
+            rx += int(fields[0])
+            tx += int(fields[8])
+        counters["net_rx"] = rx
+        counters["net_tx"] = tx
+        return counters
+
+
+class HostMetrics:
+    """Fixed-size ring buffers of derived metrics for one node."""
+
+    METRICS = ("cpu", "mem", "load", "disk_read", "disk_write", "net_rx", "net_tx")
+
+    def __init__(self, name: str, reader: ProcReader, history: int = 30):
+        self.name = name
+        self.reader = reader
+        self.series = {metric: deque(maxlen=history) for metric in self.METRICS}
+        self.error: str | None = None
+        self._previous: dict | None = None
+        self._previous_at = 0.0
+
+    def sample(self) -> None:
+        try:
+            counters = self.reader.read_counters()
+        except (OSError, ValueError, IndexError) as e:
+            self.error = str(e)
+            return
+        self.error = None
+        now = time.monotonic()
+
+        mem_total = counters["mem_total"] or 1
+        self.series["mem"].append(100.0 * (mem_total - counters["mem_available"]) / mem_total)
+        self.series["load"].append(counters["load1"])
+
+        previous, elapsed = self._previous, now - self._previous_at
+        if previous is not None and elapsed > 0:
+            total = counters["cpu_total"] - previous["cpu_total"]
+            idle = counters["cpu_idle"] - previous["cpu_idle"]
+            self.series["cpu"].append(100.0 * (total - idle) / total if total else 0.0)
+            for metric in ("disk_read", "disk_write", "net_rx", "net_tx"):
+                self.series[metric].append(max(0, counters[metric] - previous[metric]) / elapsed)
+        self._previous, self._previous_at = counters, now
+
+    def latest(self, metric: str) -> float | None:
+        values = self.series[metric]
+        return values[-1] if values else None
+
+
+class MetricsCollector:
+    """
+    Samples the local host and any configured stand-in nodes.
+
+    Stand-ins are configured as "Name=/path/to/proc" pairs, separated by
+    commas, in the FLOWTUI_NODES environment variable.
+    """
+
+    def __init__(self, nodes: dict[str, str] | None = None, history: int = 30):
+        nodes = nodes if nodes is not None else {"localhost": "/proc"}
+        self.hosts = [HostMetrics(name, ProcReader(root), history) for name, root in nodes.items()]
+
+    @classmethod
+    def from_env(cls, history: int = 30) -> "MetricsCollector":
+        nodes = {"localhost": "/proc"}
+        for entry in os.environ.get("FLOWTUI_NODES", "").split(","):
+            name, _, root = entry.partition("=")
+            if name.strip() and root.strip():
+                nodes[name.strip()] = root.strip()
+        return cls(nodes, history)
+
+    def sample(self) -> None:
+        for host in self.hosts:
+            host.sample()
+
+    def close(self) -> None:
+        for host in self.hosts:
+            host.reader.close()
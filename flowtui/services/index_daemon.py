@@ -0,0 +1,445 @@
+"""
+A long-running index of the project, shared over a Unix socket.
+
+The daemon owns the scan graph, the parsed flow structures and a symbol index,
+keeps them fresh by watching the project (watchdog when installed, mtime
+polling otherwise), and answers queries from any number of FlowTUI instances
+or editor plugins. Opening a second TUI on a large repo then costs one socket
+round trip instead of a full scan.
+
+Protocol: each message is a 4-byte big-endian length followed by a
+MessagePack map. Requests are {"id", "method", "params"}, responses are
+{"id", "result"} or {"id", "error"}.
+
+Run from the project root:
+    python -m services.index_daemon            # serve until interrupted
+    python -m services.index_daemon --status   # query a running daemon
+"""
+import argparse
+import ast
+import asyncio
+import os
+import signal
+import socket
+import struct
+import threading
+import time
+
+from flow_system.registry import FlowRegistry
+from services import graph_export, msgpack_lite
+from services.code_scanner import CodeScannerService
+from services.flow_parser import parse_flow_structure
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional: fall back to polling mtimes
+    Observer = None
+
+SOCKET_PATH = os.environ.get("FLOWTUI_INDEX_SOCKET", os.path.join(".flowtui", "index.sock"))
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+# -------------------------------------------------
+# Indexing
+# -------------------------------------------------
+
+def parse_symbols(path: str, source: str) -> list[dict]:
+    """Classes, functions and methods in a Python file; BaseFlow subclasses are "flow" symbols."""
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError:
+        return []
+    registry = FlowRegistry()
+    symbols = []
+
+    def visit(node, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                bases = {b.id if isinstance(b, ast.Name) else getattr(b, "attr", "") for b in child.bases}
+                symbol = {"name": child.name, "qualname": prefix + child.name, "kind": "class",
+                          "path": path, "line": child.lineno}
+                if "BaseFlow" in bases:
+                    symbol["kind"] = "flow"
+                    symbol["flow"] = registry.flow_name_for(path, child.name)
+                symbols.append(symbol)
+                visit(child, f"{prefix}{child.name}.")
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbols.append({"name": child.name, "qualname": prefix + child.name,
+                                "kind": "method" if prefix else "function",
+                                "path": path, "line": child.lineno})
+    visit(tree, "")
+    return symbols
+
+
+class ProjectIndex:
+    """
+    The daemon's state. `refresh()` compares file mtimes with the last
+    snapshot and only re-parses what changed; the scan graph is rebuilt when
+    files appear or disappear. Readers take `lock`; refreshes build their
+    results first and swap them in under it.
+    """
+
+    def __init__(self, root: str = "."):
+        self.root = os.path.abspath(root)
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.graph: dict = {}
+        self.mtimes: dict[str, float] = {}
+        self.symbols: dict[str, list[dict]] = {}  # .py path -> symbols
+        self.flows: dict[str, dict] = {}  # flow file path -> parse_flow_structure()
+        self.refreshed_at = 0.0
+
+    def _snapshot(self) -> dict[str, float]:
+        mtimes = {}
+        for path, is_dir in graph_export.iter_nodes(self.root):
+            if not is_dir:
+                try:
+                    mtimes[path] = os.stat(os.path.join(self.root, path)).st_mtime
+                except OSError:
+                    pass
+        return mtimes
+
+    def _parse(self, path: str) -> tuple[list[dict], dict | None]:
+        try:
+            with open(os.path.join(self.root, path)) as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError):
+            return [], None
+        flows = None
+        if "flows" in path.split(os.sep)[:-1]:
+            flows = {name: {"routes": data["routes"], "methods": sorted(data["methods"])}
+                     for name, data in parse_flow_structure(source).items()}
+        return parse_symbols(path, source), flows
+
+    def refresh(self) -> bool:
+        """Brings the index up to date. Returns True if anything changed."""
+        mtimes = self._snapshot()
+        changed = [p for p, m in mtimes.items() if self.mtimes.get(p) != m]
+        removed = [p for p in self.mtimes if p not in mtimes]
+        if not changed and not removed and self.generation:
+            return False
+
+        parsed = {p: self._parse(p) for p in changed if p.endswith(".py")}
+        graph = self.graph
+        if removed or any(p not in self.mtimes for p in changed) or not self.generation:
+            graph = CodeScannerService().scan_project(self.root)
+
+        with self.lock:
+            for path in removed:
+                self.symbols.pop(path, None)
+                self.flows.pop(path, None)
+            for path, (symbols, flows) in parsed.items():
+                self.symbols[path] = symbols
+                if flows is None:
+                    self.flows.pop(path, None)
+                else:
+                    self.flows[path] = flows
+            self.graph = graph
+            self.mtimes = mtimes
+            self.generation += 1
+            self.refreshed_at = time.time()
+        return True
+
+    # --- Queries (called with `lock` held) ---
+
+    def tree(self, path: str = "") -> dict | None:
+        """The subtree of the scan graph at a path like "apps/sample_app_1/ext_frontend_4_htmx_spa/views"."""
+        parts = [p for p in path.split("/") if p]
+        if not parts:
+            return self.graph
+        if parts[0] == "backend":
+            node, rest = self.graph.get("backend_tree"), parts[1:]
+        elif parts[0] == "apps" and len(parts) >= 3:
+            app = self.graph.get("apps", {}).get(parts[1])
+            if app is None:
+                return None
+            if parts[2] == "backend":
+                node = app.get("backend_tree")
+            else:
+                node = next((f["tree"] for f in app.get("frontends", []) if f["name"] == parts[2]), None)
+            rest = parts[3:]
+        elif parts[0] == "apps":
+            apps = self.graph.get("apps", {})
+            return apps if len(parts) == 1 else apps.get(parts[1])
+        else:
+            return None
+        for part in rest:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(part)
+        return node
+
+    def find_symbols(self, query: str, kind: str | None = None, limit: int = 50) -> list[dict]:
+        """Case-insensitive substring match; exact and prefix matches rank first."""
+        query = query.lower()
+        ranked = []
+        for symbols in self.symbols.values():
+            for symbol in symbols:
+                if kind and symbol["kind"] != kind:
+                    continue
+                name = symbol["name"].lower()
+                position = name.find(query)
+                if position < 0:
+                    continue
+                rank = 0 if name == query else 1 if position == 0 else 2
+                ranked.append((rank, len(name), symbol["qualname"], symbol))
+        ranked.sort(key=lambda r: r[:3])
+        return [r[3] for r in ranked[:limit]]
+
+    def status(self) -> dict:
+        return {
+            "root": self.root,
+            "generation": self.generation,
+            "files": len(self.mtimes),
+            "symbols": sum(len(s) for s in self.symbols.values()),
+            "flow_files": len(self.flows),
+            "refreshed_at": self.refreshed_at,
+            "watcher": "watchdog" if Observer is not None else "polling",
+        }
+
+
+# -------------------------------------------------
+# Watching
+# -------------------------------------------------
+
+class IndexWatcher:
+    """
+    Keeps a ProjectIndex fresh from a background thread. With watchdog,
+    filesystem events wake the thread (debounced); without it the thread
+    polls mtimes every `poll_interval` seconds.
+    """
+
+    DEBOUNCE_SECONDS = 0.2
+
+    def __init__(self, index: ProjectIndex, poll_interval: float = 1.0, on_change=None):
+        self.index = index
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = threading.Thread(target=self._run, name="index-watcher", daemon=True)
+
+    def start(self) -> None:
+        if Observer is not None:
+            watcher = self
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    watcher._dirty.set()
+
+            self._observer = Observer()
+            for subdir in ("backend", "apps"):
+                path = os.path.join(self.index.root, subdir)
+                if os.path.isdir(path):
+                    self._observer.schedule(_Handler(), path, recursive=True)
+            self._observer.start()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._dirty.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._observer is not None:
+                self._dirty.wait()
+                self._stop.wait(self.DEBOUNCE_SECONDS)  # Let bursts of events settle
+                self._dirty.clear()
+            else:
+                self._stop.wait(self.poll_interval)
+            if self._stop.is_set():
+                return
+            try:
+                if self.index.refresh() and self.on_change:
+                    self.on_change()
+            except Exception as e:
+                print(f"Index refresh failed: {e}")
+
+
+# -------------------------------------------------
+# Server
+# -------------------------------------------------
+
+class IndexServer:
+    """Serves a ProjectIndex over a Unix socket."""
+
+    def __init__(self, index: ProjectIndex, socket_path: str = SOCKET_PATH):
+        self.index = index
+        self.socket_path = socket_path
+        self.methods = {
+            "status": lambda: self.index.status(),
+            "graph": lambda: self.index.graph,
+            "tree": lambda path="": self.index.tree(path),
+            "flow_structure": self._flow_structure,
+            "symbols": lambda query, kind=None, limit=50: self.index.find_symbols(query, kind, limit),
+        }
+
+    def _flow_structure(self, path: str) -> dict:
+        """A flow file's structure; `path` is absolute or relative to the indexed root."""
+        relative = os.path.relpath(os.path.join(self.index.root, path), self.index.root)
+        if relative.startswith(".."):
+            raise LookupError(f"{path} is outside {self.index.root}")
+        structure = self.index.flows.get(relative)
+        if structure is None:
+            raise LookupError(f"{path} is not an indexed flow file")
+        return structure
+
+    def _dispatch(self, request: dict) -> dict:
+        method = self.methods.get(request.get("method"))
+        if method is None:
+            return {"id": request.get("id"), "error": f"Unknown method {request.get('method')!r}"}
+        try:
+            with self.index.lock:
+                result = method(**(request.get("params") or {}))
+        except Exception as e:
+            return {"id": request.get("id"), "error": f"{type(e).__name__}: {e}"}
+        return {"id": request.get("id"), "result": result}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                if size > MAX_FRAME_BYTES:
+                    break
+                request = msgpack_lite.unpack(await reader.readexactly(size))
+                payload = msgpack_lite.pack(self._dispatch(request))
+                writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, msgpack_lite.UnpackError):
+            pass
+        finally:
+            writer.close()
+
+    def _claim_socket(self) -> None:
+        """Removes a stale socket file, or refuses to start next to a live daemon."""
+        if not os.path.exists(self.socket_path):
+            os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"An index daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def serve_forever(self) -> None:
+        """Serves until SIGINT or SIGTERM, then removes the socket file."""
+        self._claim_socket()
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+# -------------------------------------------------
+# Client
+# -------------------------------------------------
+
+class IndexClient:
+    """Blocking client for the index daemon; one request at a time per instance."""
+
+    def __init__(self, socket_path: str = SOCKET_PATH, timeout: float = 2.0):
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, socket_path: str = SOCKET_PATH) -> "IndexClient | None":
+        """Returns a client if a daemon is listening, else None."""
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+
+    def _recv_exactly(self, n: int) -> bytes:
+        chunks = []
+        while n:
+            chunk = self._sock.recv(min(n, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Index daemon closed the connection")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def call(self, method: str, **params):
+        with self._lock:
+            self._next_id += 1
+            payload = msgpack_lite.pack({"id": self._next_id, "method": method, "params": params})
+            self._sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+            (size,) = FRAME_HEADER.unpack(self._recv_exactly(FRAME_HEADER.size))
+            response = msgpack_lite.unpack(self._recv_exactly(size))
+        if "error" in response:
+            raise LookupError(response["error"])
+        return response["result"]
+
+    def status(self) -> dict:
+        return self.call("status")
+
+    def graph(self) -> dict:
+        return self.call("graph")
+
+    def tree(self, path: str = "") -> dict | None:
+        return self.call("tree", path=path)
+
+    def flow_structure(self, path: str) -> dict:
+        """Raises LookupError for a path that is not a flow file under the daemon's root."""
+        return self.call("flow_structure", path=path)
+
+    def symbols(self, query: str, kind: str | None = None, limit: int = 50) -> list[dict]:
+        return self.call("symbols", query=query, kind=kind, limit=limit)
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared FlowTUI project index.")
+    parser.add_argument("--root", default=".", help="Project root (default: current directory).")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--poll", type=float, default=1.0, help="Polling interval without watchdog.")
+    parser.add_argument("--status", action="store_true", help="Print a running daemon's status and exit.")
+    args = parser.parse_args()
+
+    if args.status:
+        client = IndexClient.connect(args.socket)
+        if client is None:
+            print(f"No index daemon on {args.socket}")
+            raise SystemExit(1)
+        print(client.status())
+        return
+
+    index = ProjectIndex(args.root)
+    started = time.perf_counter()
+    index.refresh()
+    print(f"Indexed {index.status()['files']} files in {time.perf_counter() - started:.2f}s; "
+          f"serving on {args.socket} ({index.status()['watcher']})")
+    watcher = IndexWatcher(index, args.poll)
+    watcher.start()
+    try:
+        asyncio.run(IndexServer(index, args.socket).serve_forever())
+    finally:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    main()
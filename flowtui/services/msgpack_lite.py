@@ -0,0 +1,258 @@
+"""
+A small MessagePack encoder/decoder.
+
+Covers nil, bool, int, float, str, bytes, arrays and maps, which is all
+FlowTUI's binary formats need, without depending on the msgpack package.
+The output is standard MessagePack, so any msgpack library can read it, and
+it reads anything they write within those types. Extension types (Neovim's
+buffer and window handles, for instance) are passed through as ExtType.
+"""
+import struct
+from typing import NamedTuple
+
+
+class UnpackError(ValueError):
+    """Raised on malformed or unsupported MessagePack data."""
+
+
+class ExtType(NamedTuple):
+    """An extension value, left undecoded."""
+    code: int
+    data: bytes
+
+
+# -------------------------------------------------
+# Packing
+# -------------------------------------------------
+
+def _pack_into(obj, buf: bytearray) -> None:
+    if obj is None:
+        buf.append(0xC0)
+    elif obj is True:
+        buf.append(0xC3)
+    elif obj is False:
+        buf.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            buf.append(obj)
+        elif -32 <= obj < 0:
+            buf.append(obj & 0xFF)
+        elif 0 <= obj:
+            for limit, code, fmt in ((0xFF, 0xCC, ">B"), (0xFFFF, 0xCD, ">H"),
+                                     (0xFFFFFFFF, 0xCE, ">I"), (0xFFFFFFFFFFFFFFFF, 0xCF, ">Q")):
+                if obj <= limit:
+                    buf.append(code)
+                    buf += struct.pack(fmt, obj)
+                    return
+            raise OverflowError("int too large for MessagePack")
+        else:
+            for limit, code, fmt in ((-0x80, 0xD0, ">b"), (-0x8000, 0xD1, ">h"),
+                                     (-0x80000000, 0xD2, ">i"), (-0x8000000000000000, 0xD3, ">q")):
+                if obj >= limit:
+                    buf.append(code)
+                    buf += struct.pack(fmt, obj)
+                    return
+            raise OverflowError("int too small for MessagePack")
+    elif isinstance(obj, float):
+        buf.append(0xCB)
+        buf += struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            buf.append(0xA0 | n)
+        elif n <= 0xFF:
+            buf += bytes((0xD9, n))
+        elif n <= 0xFFFF:
+            buf.append(0xDA)
+            buf += struct.pack(">H", n)
+        else:
+            buf.append(0xDB)
+            buf += struct.pack(">I", n)
+        buf += data
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        n = len(data)
+        if n <= 0xFF:
+            buf += bytes((0xC4, n))
+        elif n <= 0xFFFF:
+            buf.append(0xC5)
+            buf += struct.pack(">H", n)
+        else:
+            buf.append(0xC6)
+            buf += struct.pack(">I", n)
+        buf += data
+    elif isinstance(obj, ExtType):
+        n = len(obj.data)
+        fixed = {1: 0xD4, 2: 0xD5, 4: 0xD6, 8: 0xD7, 16: 0xD8}.get(n)
+        if fixed is not None:
+            buf.append(fixed)
+        elif n <= 0xFF:
+            buf += bytes((0xC7, n))
+        elif n <= 0xFFFF:
+            buf.append(0xC8)
+            buf += struct.pack(">H", n)
+        else:
+            buf.append(0xC9)
+            buf += struct.pack(">I", n)
+        buf += struct.pack(">b", obj.code)
+        buf += obj.data
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            buf.append(0x90 | n)
+        elif n <= 0xFFFF:
+            buf.append(0xDC)
+            buf += struct.pack(">H", n)
+        else:
+            buf.append(0xDD)
+            buf += struct.pack(">I", n)
+        for item in obj:
+            _pack_into(item, buf)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            buf.append(0x80 | n)
+        elif n <= 0xFFFF:
+            buf.append(0xDE)
+            buf += struct.pack(">H", n)
+        else:
+            buf.append(0xDF)
+            buf += struct.pack(">I", n)
+        for key, value in obj.items():
+            _pack_into(key, buf)
+            _pack_into(value, buf)
+    else:
+        raise TypeError(f"Cannot pack {type(obj).__name__}")
+
+
+def pack(obj) -> bytes:
+    buf = bytearray()
+    _pack_into(obj, buf)
+    return bytes(buf)
+
+
+# -------------------------------------------------
+# Unpacking
+# -------------------------------------------------
+
+class Unpacker:
+    """
+    Incremental decoder: `feed()` bytes as they arrive (from a socket or a
+    file) and iterate to get every complete object decoded so far.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def feed(self, data: bytes) -> None:
+        if self._pos:
+            # Drop what was already consumed so the buffer does not grow forever.
+            del self._buf[:self._pos]
+            self._pos = 0
+        self._buf += data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = self._pos
+        try:
+            return self._read()
+        except IndexError:
+            self._pos = start  # Incomplete object: wait for more data
+            raise StopIteration from None
+
+    def _take(self, n: int) -> bytes:
+        end = self._pos + n
+        if end > len(self._buf):
+            raise IndexError
+        data = bytes(self._buf[self._pos:end])
+        self._pos = end
+        return data
+
+    def _unpack(self, fmt: str, n: int):
+        return struct.unpack(fmt, self._take(n))[0]
+
+    def _read(self):
+        code = self._buf[self._pos]
+        self._pos += 1
+        if code <= 0x7F:
+            return code
+        if code >= 0xE0:
+            return code - 0x100
+        if 0x80 <= code <= 0x8F:
+            return self._read_map(code & 0x0F)
+        if 0x90 <= code <= 0x9F:
+            return [self._read() for _ in range(code & 0x0F)]
+        if 0xA0 <= code <= 0xBF:
+            return self._take(code & 0x1F).decode("utf-8")
+        if code == 0xC0:
+            return None
+        if code == 0xC2:
+            return False
+        if code == 0xC3:
+            return True
+        if 0xD4 <= code <= 0xD8:
+            return ExtType(self._unpack(">b", 1), self._take(1 << (code - 0xD4)))
+
+        sized = _SIZED.get(code)
+        if sized is not None:
+            kind, fmt, width = sized
+            if kind in ("int", "float"):
+                return self._unpack(fmt, width)
+            n = self._unpack(fmt, width)
+            if kind == "str":
+                return self._take(n).decode("utf-8")
+            if kind == "bin":
+                return self._take(n)
+            if kind == "array":
+                return [self._read() for _ in range(n)]
+            if kind == "ext":
+                return ExtType(self._unpack(">b", 1), self._take(n))
+            return self._read_map(n)
+        raise UnpackError(f"Unsupported MessagePack type 0x{code:02x}")
+
+    def _read_map(self, n: int) -> dict:
+        result = {}
+        for _ in range(n):
+            key = self._read()
+            result[key] = self._read()
+        return result
+
+
+_SIZED = {
+    0xC4: ("bin", ">B", 1), 0xC5: ("bin", ">H", 2), 0xC6: ("bin", ">I", 4),
+    0xCA: ("float", ">f", 4), 0xCB: ("float", ">d", 8),
+    0xCC: ("int", ">B", 1), 0xCD: ("int", ">H", 2), 0xCE: ("int", ">I", 4), 0xCF: ("int", ">Q", 8),
+    0xD0: ("int", ">b", 1), 0xD1: ("int", ">h", 2), 0xD2: ("int", ">i", 4), 0xD3: ("int", ">q", 8),
+    0xD9: ("str", ">B", 1), 0xDA: ("str", ">H", 2), 0xDB: ("str", ">I", 4),
+    0xDC: ("array", ">H", 2), 0xDD: ("array", ">I", 4),
+    0xDE: ("map", ">H", 2), 0xDF: ("map", ">I", 4),
+    0xC7: ("ext", ">B", 1), 0xC8: ("ext", ">H", 2), 0xC9: ("ext", ">I", 4),
+}
+
+
+def unpack(data: bytes):
+    """Decodes exactly one object."""
+    unpacker = Unpacker()
+    unpacker.feed(data)
+    for obj in unpacker:
+        if unpacker._pos != len(unpacker._buf):
+            raise UnpackError("Extra data after object")
+        return obj
+    raise UnpackError("Incomplete MessagePack data")
+
+
+def iter_stream(stream, chunk_size: int = 65536):
+    """Yields every object from a binary stream of concatenated MessagePack values."""
+    unpacker = Unpacker()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        unpacker.feed(chunk)
+        yield from unpacker
+    if unpacker._pos != len(unpacker._buf):
+        raise UnpackError("Truncated MessagePack stream")
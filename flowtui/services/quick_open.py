@@ -0,0 +1,344 @@
+"""
+Trigram index behind the Explorer's quick-open prompt.
+
+Every entry (a scanned path or a symbol such as a flow name) is indexed by
+the lowercase trigrams of its text and by the 1-2 character prefixes of its
+last segment. A query is split on whitespace into fragments; candidates are
+the intersection of the fragments' trigram postings (rarest first), which are
+then scored. If no entry contains every fragment, a relaxed pass accepts
+entries whose name shares most trigrams with each fragment, or with the
+fragment with two neighbouring letters swapped, which covers a typo or a
+transposition ("vehicels", "prodcut").
+"""
+import heapq
+import os
+import re
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+from flow_system.registry import FlowRegistry
+from services.flow_parser import parse_flow_structure
+from services.project_graph import ProjectGraph
+from services.workspace import under
+
+# Scoring more candidates than this is the only way a query gets slow. Very
+# broad queries ("a", "app", "index.html") therefore rank a sample of their
+# matches, taken from the entries whose name holds a fragment first (those
+# score highest), which is fine: the list refines with every keystroke.
+MAX_SCORED = 300
+# Candidates of the typo-tolerant pass that are scored, most shared trigrams first.
+MAX_FUZZY_SCORED = 500
+SEPARATORS = "/._-\\ "
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def typo_variants(fragment: str) -> list[str]:
+    """The fragment and every variant of it with two neighbouring letters swapped."""
+    swapped = (fragment[:i] + fragment[i + 1] + fragment[i] + fragment[i + 2:] for i in range(len(fragment) - 1))
+    return [fragment, *(variant for variant in swapped if variant != fragment)]
+
+
+class QuickOpenEntry:
+    __slots__ = ("key", "text", "lower", "tail", "kind", "data")
+
+    def __init__(self, key: str, text: str, kind: str, data: dict | None):
+        self.key = key
+        self.text = text
+        self.lower = text.lower()
+        # Basename for paths ("vehicles.py"), last part for dotted names ("status_synch").
+        self.tail = os.path.basename(self.lower) if kind == "path" else self.lower.rpartition(".")[2]
+        self.kind = kind
+        self.data = data or {}
+
+
+class TrigramIndex:
+    """
+    Incrementally maintained fuzzy index. `sync()` applies the difference
+    between the current entries and a new set, so a rescan only touches the
+    entries that actually appeared or disappeared.
+    """
+
+    def __init__(self):
+        self._entries: list[QuickOpenEntry | None] = []
+        self._ids: dict[str, int] = {}  # key -> entry id
+        self._free: list[int] = []
+        self._postings: dict[str, set[int]] = {}  # trigram -> entry ids
+        self._tail_postings: dict[str, set[int]] = {}  # trigram of the last segment -> entry ids
+        self._prefixes: dict[str, set[int]] = {}  # 1-2 char prefix of the last segment -> entry ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _grams(self, entry: QuickOpenEntry):
+        return trigrams(entry.lower), trigrams(entry.tail), {entry.tail[:1], entry.tail[:2]}
+
+    def add(self, key: str, text: str, kind: str = "path", data: dict | None = None) -> None:
+        if key in self._ids:
+            self.remove(key)
+        entry = QuickOpenEntry(key, text, kind, data)
+        entry_id = self._free.pop() if self._free else len(self._entries)
+        if entry_id == len(self._entries):
+            self._entries.append(entry)
+        else:
+            self._entries[entry_id] = entry
+        self._ids[key] = entry_id
+        grams, tail_grams, prefixes = self._grams(entry)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(entry_id)
+        for gram in tail_grams:
+            self._tail_postings.setdefault(gram, set()).add(entry_id)
+        for prefix in prefixes:
+            self._prefixes.setdefault(prefix, set()).add(entry_id)
+
+    def remove(self, key: str) -> None:
+        entry_id = self._ids.pop(key, None)
+        if entry_id is None:
+            return
+        entry = self._entries[entry_id]
+        grams, tail_grams, prefixes = self._grams(entry)
+        for table, keys in ((self._postings, grams), (self._tail_postings, tail_grams), (self._prefixes, prefixes)):
+            for gram in keys:
+                ids = table.get(gram)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del table[gram]
+        self._entries[entry_id] = None
+        self._free.append(entry_id)
+
+    def sync(self, entries: dict[str, tuple[str, str, dict | None]]) -> tuple[int, int]:
+        """
+        Makes the index hold exactly `entries` ({key: (text, kind, data)}).
+        Returns (added, removed).
+        """
+        removed = [key for key in self._ids if key not in entries]
+        for key in removed:
+            self.remove(key)
+        added = 0
+        for key, (text, kind, data) in entries.items():
+            entry_id = self._ids.get(key)
+            if entry_id is None or self._entries[entry_id].text != text:
+                self.add(key, text, kind, data)
+                added += 1
+            else:
+                self._entries[entry_id].data = data or {}
+        return added, len(removed)
+
+    # --- Querying ---
+
+    def _strict_candidates(self, fragments: list[str]) -> set[int]:
+        """Entries containing every fragment (fragments under 3 chars: as a name prefix)."""
+        size = lambda gram: len(self._postings.get(gram, ()))
+        longer = [f for f in fragments if len(f) >= 3]
+        short = [f for f in fragments if len(f) < 3]
+        if not longer:
+            result = self._prefixes.get(short[0], set())
+            for fragment in short[1:]:
+                result = result & self._prefixes.get(fragment, set())
+            return set(islice(result, MAX_SCORED))  # All of them match: no need to copy the rest
+
+        entries = self._entries
+        if len(longer) == 1 and not short:
+            fragment = longer[0]  # The usual query: one word
+            matches = lambda i: fragment in entries[i].lower
+        else:
+            matches = lambda i: (
+                all(f in entries[i].lower for f in longer) and all(entries[i].tail.startswith(f) for f in short)
+            )
+
+        # Entries with a fragment in their name score highest, and the name
+        # postings are much smaller than the whole-path ones: take matches from
+        # the smallest name posting of any fragment's trigram first. When there
+        # are MAX_SCORED of them, nothing better is left to find.
+        tail_size = lambda gram: len(self._tail_postings.get(gram, ()))
+        tail_gram = min((g for f in longer for g in trigrams(f)), key=tail_size)
+        in_name = self._tail_postings.get(tail_gram, set())
+        for fragment in longer:
+            if len(in_name) <= MAX_SCORED:
+                break
+            # Set operations are far cheaper than reading entries: narrow by
+            # each fragment's rarest trigram before checking any text.
+            gram = min(trigrams(fragment), key=size)
+            if gram != tail_gram:  # The name posting of a trigram is a subset of its path posting
+                in_name = in_name & self._postings.get(gram, set())
+        found = set(islice(filter(matches, islice(in_name, 4 * MAX_SCORED)), MAX_SCORED))
+        if len(found) >= MAX_SCORED:
+            return found
+
+        # The rarest trigram of each fragment first (they narrow the most when
+        # combined), then the remaining ones, rarest first.
+        per_fragment = [sorted(trigrams(f), key=size) for f in longer]
+        heads = sorted({grams[0] for grams in per_fragment}, key=size)
+        grams = heads + sorted({g for gs in per_fragment for g in gs[1:]} - set(heads), key=size)
+
+        result = self._postings.get(grams[0], set())
+        for gram in grams[1:]:
+            if len(result) <= MAX_SCORED // 8:
+                break  # Few enough to check the text directly
+            narrowed = result & self._postings.get(gram, set())
+            dense = len(narrowed) > len(result) // 2
+            result = narrowed
+            if dense and len(result) > MAX_SCORED:
+                # The grams keep co-occurring: matches are plentiful, so checking
+                # entries lazily reaches MAX_SCORED faster than more intersections.
+                break
+        rest = filter(matches, (i for i in result if i not in found))
+        return found.union(islice(rest, MAX_SCORED - len(found)))
+
+    def _fuzzy_candidates(self, fragment: str, within=None) -> dict[int, int]:
+        """
+        Entries whose last segment shares enough trigrams with the fragment or
+        with the fragment with two neighbouring letters swapped, with the
+        number shared: typos are nearly always in the name being looked for.
+        A typo changes at most 3 of the fragment's trigrams. Only the
+        MAX_FUZZY_SCORED entries sharing the most are returned; with `within`,
+        only those entries are considered.
+        """
+        if len(fragment) < 3:
+            prefixed = self._prefixes.get(fragment, set())
+            return dict.fromkeys(prefixed if within is None else prefixed.intersection(within), 0)
+        postings = self._tail_postings
+        count = len(fragment) - 2
+        needed = max(1, min((count + 1) // 2, count - 3))
+        variant_grams = [trigrams(variant) for variant in typo_variants(fragment)]
+        gram_postings = [postings[gram] for gram in set().union(*variant_grams) if gram in postings]
+        if within is None:
+            # Names holding every indexed trigram of a variant share the most;
+            # when there are MAX_FUZZY_SCORED of them, counting whole postings
+            # (thousands of ids for a common word) would only rank the rest.
+            whole = set()
+            for grams in variant_grams:
+                indexed = [postings[gram] for gram in grams if gram in postings]
+                if len(whole) >= MAX_FUZZY_SCORED or len(indexed) < needed:
+                    continue
+                rarest, *others = sorted(indexed, key=len)
+                holding = (i for i in rarest if all(i in ids for ids in others))
+                whole.update(islice(holding, MAX_FUZZY_SCORED - len(whole)))
+            if len(whole) >= MAX_FUZZY_SCORED:
+                within = whole
+        if within is None:
+            shared = Counter()
+            for ids in gram_postings:
+                shared.update(ids)
+        else:
+            # Few entries: look them up instead of counting whole postings.
+            shared = {entry_id: sum(entry_id in ids for ids in gram_postings) for entry_id in within}
+        shared = {entry_id: n for entry_id, n in shared.items() if n >= needed}
+        if len(shared) > MAX_FUZZY_SCORED:
+            shared = dict(heapq.nlargest(MAX_FUZZY_SCORED, shared.items(), key=itemgetter(1)))
+        return shared
+
+    def _score(self, entry: QuickOpenEntry, fragments: list[str]) -> float:
+        score = 0.0
+        for fragment in fragments:
+            position = entry.lower.find(fragment)
+            if position < 0:
+                continue  # A typo: credited with the trigrams the name shares
+            score += 2 * len(fragment)
+            if position == 0 or entry.lower[position - 1] in SEPARATORS:
+                score += 3  # Starts at a word boundary
+            if fragment in entry.tail:
+                score += 4 + (3 if entry.tail.startswith(fragment) else 0)
+        return score - 0.01 * len(entry.lower)
+
+    def search(self, query: str, limit: int = 50) -> list[QuickOpenEntry]:
+        fragments = query.lower().split()
+        if not fragments:
+            return []
+        candidates = self._strict_candidates(fragments)
+        typo_credit = {}
+        if not candidates:
+            # Every fragment must match, so the credits are summed over entries
+            # matching all of them. The longest fragment, usually the most
+            # selective, picks the candidates the others are checked against.
+            ordered = sorted(fragments, key=len, reverse=True)
+            typo_credit = self._fuzzy_candidates(ordered[0])
+            for fragment in ordered[1:]:
+                if not typo_credit:
+                    break
+                shared = self._fuzzy_candidates(fragment, within=typo_credit)
+                typo_credit = {i: n + shared[i] for i, n in typo_credit.items() if i in shared}
+            candidates = typo_credit.keys()
+        if not candidates:
+            return []
+
+        entries = self._entries
+        scored = (
+            (self._score(entries[i], fragments) + typo_credit.get(i, 0), i) for i in islice(candidates, MAX_SCORED)
+        )
+        best = heapq.nlargest(limit, scored)
+        return [entries[i] for _, i in best]
+
+
+# -------------------------------------------------
+# Entries from a scan
+# -------------------------------------------------
+
+CLASS_PATTERN = re.compile(r"^class\s+(\w+)", re.MULTILINE)
+SYMBOL_DIRS = {"flows": "flow", "contracts": "contract", "models": "model"}
+
+
+def graph_paths(graph: ProjectGraph, root: str = "."):
+    """Yields (path, is_dir) for every node of a scan graph of `root`, with the Explorer's file paths."""
+    for node, path in graph.walk():
+        if path == "apps" or os.path.dirname(path) == "apps":
+            continue  # Grouping nodes, not paths the Explorer shows
+        yield under(root, path), graph.is_dir(node)
+
+
+class EntryCollector:
+    """
+    Turns a scan graph into quick-open entries: every path, plus flows
+    ("fleet.vehicles.status_synch"), contracts and models by name. Symbol
+    files are only re-read when their mtime changes.
+    """
+
+    def __init__(self):
+        self._symbols: dict[str, tuple[float, list]] = {}  # path -> (mtime, [(key, text, kind, data)])
+        self._registry = FlowRegistry()
+
+    def _file_symbols(self, path: str, kind: str) -> list:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return []
+        cached = self._symbols.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path) as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError):
+            return []
+        data = {"file_path": path}
+        if kind == "flow":
+            names = [self._registry.flow_name_for(path, name) for name in parse_flow_structure(source)]
+        else:
+            names = CLASS_PATTERN.findall(source)
+        symbols = [(f"{kind}:{path}:{name}", name, kind, data) for name in names]
+        self._symbols[path] = (mtime, symbols)
+        return symbols
+
+    def collect(self, graphs: dict[str, ProjectGraph]) -> dict[str, tuple[str, str, dict]]:
+        """Entries for the scan graphs of a workspace ({root path: graph})."""
+        entries = {}
+        seen = set()
+        paths = (node for root, graph in graphs.items() if graph is not None for node in graph_paths(graph, root))
+        for path, is_dir in paths:
+            entries[path] = (path, "path", {"file_path": path})
+            if is_dir or not path.endswith(".py"):
+                continue
+            kind = SYMBOL_DIRS.get(os.path.basename(os.path.dirname(path)))
+            if kind is None and os.sep + "flows" + os.sep in path:
+                kind = "flow"  # Nested domains, e.g. backend/flows/fleet/vehicles.py
+            if kind:
+                seen.add(path)
+                for key, text, symbol_kind, data in self._file_symbols(path, kind):
+                    entries[key] = (text, symbol_kind, data)
+        for path in set(self._symbols) - seen:
+            del self._symbols[path]
+        return entries
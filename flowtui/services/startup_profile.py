@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+
+# Set in the child process of a --profile-startup run.
+T0_ENV = "FLOWTUI_STARTUP_T0"
+MARK_PREFIX = "flowtui-startup:"
+
+
+def profiling() -> bool:
+    return T0_ENV in os.environ
+
+
+def mark(label: str) -> None:
+    """Reports a startup milestone, in ms since the profiled process was launched."""
+    t0 = os.environ.get(T0_ENV)
+    if t0 is not None:
+        elapsed = (time.time() - float(t0)) * 1000
+        print(f"{MARK_PREFIX} {label} {elapsed:.1f}", file=sys.stderr, flush=True)
+
+
+def parse_importtime(lines: list[str]) -> list[tuple[str, int, int, int]]:
+    """
+    Parses `python -X importtime` output into (module, self_us, cumulative_us, depth).
+    Nesting is encoded by two spaces of indentation per level.
+    """
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header row
+        name = fields[2].rstrip()
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append((stripped, int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def format_report(imports: list[tuple[str, int, int, int]], marks: list[tuple[str, float]], top: int) -> str:
+    total = sum(self_us for _, self_us, _, _ in imports)
+    by_package: dict[str, int] = {}
+    for name, self_us, _, _ in imports:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    lines = ["Milestones (ms since launch):"]
+    lines += [f"  {label:<24} {ms:9.1f}" for label, ms in marks]
+    lines.append(f"\nImports: {len(imports)} modules, {total / 1000:.1f} ms")
+    textual_loaded = "textual" in by_package
+    lines.append(f"  textual imported: {'yes' if textual_loaded else 'no'}")
+
+    lines.append(f"\nTop {top} packages by self time:")
+    for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"  {us / 1000:9.1f} ms  {package}")
+
+    lines.append(f"\nTop {top} direct imports by cumulative time:")
+    first_level = [i for i in imports if i[3] == 0]
+    for name, _, cumulative, _ in sorted(first_level, key=lambda i: -i[2])[:top]:
+        lines.append(f"  {cumulative / 1000:9.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+def run_profiled(script: str, args: list[str], top: int = 15) -> int:
+    """
+    Re-runs `script` under `-X importtime` and prints where its startup time goes.
+
+    The child is told (through the environment) to report milestones and to
+    exit on its own once started, so the whole run is unattended.
+    """
+    import subprocess  # Only needed here; keeps it off every entry point's startup path
+
+    env = dict(os.environ, **{T0_ENV: repr(time.time())})
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script, *args],
+        env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    lines = result.stderr.splitlines()
+    marks = []
+    for line in lines:
+        if line.startswith(MARK_PREFIX):
+            label, _, ms = line[len(MARK_PREFIX):].strip().rpartition(" ")
+            marks.append((label, float(ms)))
+    print(format_report(parse_importtime(lines), marks, top))
+    if result.returncode:
+        errors = [l for l in lines if not l.startswith(("import time:", MARK_PREFIX))]
+        print("\nProcess failed:\n" + "\n".join(errors[-20:]), file=sys.stderr)
+    return result.returncode
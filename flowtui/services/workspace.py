@@ -0,0 +1,171 @@
+"""
+A workspace of several project roots, viewed side by side.
+
+Each root is a directory laid out like a FlowTUI project (backend/, apps/).
+It is scanned on its own and has its own flow cross-reference index, so the
+roots never mix: a flow name resolves within the root it is used in. Paths
+of the primary root "." stay relative ("backend/flows/x.py"), paths of the
+other roots are prefixed with the root ("../billing/backend/flows/x.py").
+
+`scan()` scans every root concurrently. Building a root's index for the
+first time (or after it was evicted) means parsing every file, which is
+CPU-bound, so those builds run in worker processes, one per root (as many
+as there are CPUs) and the finished indexes are sent back. The wall time
+then follows the largest root rather than the sum. Later scans only stat
+files and re-read the changed ones; they run in threads. Indexes of roots
+that have not been used for a while can be evicted.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from services.code_scanner import CodeScannerService
+from services.flow_xref import XREF_ROOTS, FlowXrefIndex
+from services.project_graph import ProjectGraph
+
+
+def under(root: str, path: str) -> str:
+    """`path` inside `root`, leaving paths of the current directory unprefixed."""
+    return path if root in ("", ".") else os.path.join(root, path)
+
+
+def build_index(root_path: str) -> tuple[ProjectGraph, FlowXrefIndex]:
+    """Scans a root and builds its index from scratch (run in a worker process)."""
+    xref = FlowXrefIndex(tuple(under(root_path, root) for root in XREF_ROOTS))
+    xref.refresh()
+    return CodeScannerService().scan_graph(root_path), xref
+
+
+class WorkspaceRoot:
+    """One project root: its latest scan graph and its cross-reference index."""
+
+    def __init__(self, path: str, name: str):
+        self.path = path
+        self.abs_path = os.path.abspath(path)
+        self.name = name
+        self.graph: ProjectGraph | None = None
+        self.scan_seconds = 0.0
+        # Empty until the first scan fills it; None once evicted.
+        self._xref: FlowXrefIndex | None = self._new_xref()
+        self.built = False  # Whether the index has been filled since it was created
+        self._lock = threading.Lock()  # Serializes scans and index rebuilds of this root
+        self.last_used = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"WorkspaceRoot({self.path!r})"
+
+    @property
+    def indexed(self) -> bool:
+        return self._xref is not None
+
+    def _new_xref(self) -> FlowXrefIndex:
+        return FlowXrefIndex(tuple(under(self.path, root) for root in XREF_ROOTS))
+
+    def contains(self, file_path: str) -> bool:
+        """Whether `file_path` (relative to the current directory, or absolute) is inside the root."""
+        file_path = os.path.abspath(file_path)
+        return file_path == self.abs_path or file_path.startswith(self.abs_path.rstrip(os.sep) + os.sep)
+
+    def scan(self, graph: ProjectGraph | None = None) -> ProjectGraph:
+        """
+        Scans the root (or takes `graph`, for instance from the index daemon)
+        and brings its cross-reference index up to date.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.graph = graph if graph is not None else CodeScannerService().scan_graph(self.path)
+            if self._xref is None:
+                self._xref = self._new_xref()
+            self._xref.refresh()
+            self.built = True
+        self.scan_seconds = time.perf_counter() - started
+        self.last_used = time.monotonic()
+        return self.graph
+
+    def xref(self) -> FlowXrefIndex:
+        """The root's cross-reference index, rebuilt if it was evicted."""
+        self.last_used = time.monotonic()
+        with self._lock:
+            if self._xref is None:
+                self._xref = self._new_xref()
+                self._xref.refresh()
+                self.built = True
+            return self._xref
+
+    def adopt(self, graph: ProjectGraph, xref: FlowXrefIndex) -> None:
+        """Takes over an index built elsewhere (see build_index())."""
+        with self._lock:
+            self.graph = graph
+            self._xref = xref
+            self.built = True
+
+    def evict(self) -> None:
+        """Drops the index. The scan graph is kept: the Explorer still shows the root."""
+        with self._lock:
+            self._xref = None
+            self.built = False
+
+
+class Workspace:
+    def __init__(self, paths: list[str] | None = None):
+        self.roots: list[WorkspaceRoot] = []
+        for path in paths or ["."]:
+            path = os.path.normpath(path)
+            if any(root.abs_path == os.path.abspath(path) for root in self.roots):
+                continue
+            name = os.path.basename(os.path.abspath(path)) or path
+            if any(root.name == name for root in self.roots):
+                name = path  # Same directory name in two places: show the path instead
+            self.roots.append(WorkspaceRoot(path, name))
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    def __iter__(self):
+        return iter(self.roots)
+
+    @property
+    def primary(self) -> WorkspaceRoot:
+        return self.roots[0]
+
+    def root_for(self, file_path: str) -> WorkspaceRoot | None:
+        """The root a path belongs to (the most specific one, since roots may nest)."""
+        # Compared as absolute paths: roots and paths may each be given either way.
+        file_path = os.path.abspath(file_path)
+        matches = [root for root in self.roots if root.contains(file_path)]
+        return max(matches, key=lambda root: len(root.abs_path), default=None)
+
+    def scan(self, graphs: dict[str, ProjectGraph] | None = None) -> dict[str, ProjectGraph]:
+        """
+        Scans every root concurrently and returns {root path: graph}. Roots
+        with a graph in `graphs` use it instead of scanning.
+        """
+        graphs = graphs or {}
+        if len(self.roots) == 1:
+            root = self.roots[0]
+            return {root.path: root.scan(graphs.get(root.path))}
+        cold = [root for root in self.roots if not root.built]
+        processes = min(len(cold), os.cpu_count() or 1)
+        if processes > 1:
+            # "spawn": forking a process that runs UI and worker threads is unsafe.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+                futures = {root: pool.submit(build_index, root.path) for root in cold}
+                for root, future in futures.items():
+                    root.adopt(*future.result())
+        # Catch up with changes made during the builds, and scan the warm roots.
+        with ThreadPoolExecutor(max_workers=len(self.roots), thread_name_prefix="workspace-scan") as pool:
+            futures = {root.path: pool.submit(root.scan, graphs.get(root.path)) for root in self.roots}
+            return {path: future.result() for path, future in futures.items()}
+
+    def evict_idle(self, idle_seconds: float, keep: WorkspaceRoot | None = None) -> list[WorkspaceRoot]:
+        """Evicts the indexes of roots unused for `idle_seconds`. Returns the evicted roots."""
+        now = time.monotonic()
+        evicted = []
+        for root in self.roots:
+            if root is not keep and root.indexed and now - root.last_used > idle_seconds:
+                root.evict()
+                evicted.append(root)
+        return evicted
@@ -0,0 +1,478 @@
+"""
+A virtualized source viewer.
+
+The file is memory-mapped and indexed by line offsets only. Rendering goes
+through Textual's line API, so each frame decodes and highlights just the
+visible lines, however long the file is.
+
+Highlighting is incremental. Pygments' regex lexers carry a state stack from
+one token to the next. LineHighlighter records that stack at the start of
+each line it lexes, and caches tokens per line. An edit keeps the states and
+tokens above it. Below it, the old entries are kept (shifted) and reused as
+soon as re-lexing reaches a line whose starting state is unchanged, so only
+the lines the edit can actually affect are lexed again.
+"""
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from pygments.lexer import RegexLexer
+from pygments.lexers import get_lexer_by_name, get_lexer_for_filename
+from pygments.token import Error, Whitespace, _TokenType
+from pygments.util import ClassNotFound
+from rich.segment import Segment
+from rich.style import Style
+from rich.syntax import PygmentsSyntaxTheme
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+TAB_SIZE = 4
+# Highlighted lines kept in memory; the lexer states (one small tuple per line) are always kept.
+MAX_CACHED_LINES = 20000
+
+
+# -------------------------------------------------
+# Line Source
+# -------------------------------------------------
+
+class LineSource:
+    """
+    Line access to a memory-mapped file (or an in-memory text). Only the line
+    offsets are computed up front; lines are decoded when asked for.
+    """
+
+    def __init__(self, data, mapping: mmap.mmap | None = None, file=None):
+        self._data = data
+        self._mapping = mapping
+        self._file = file
+        self._offsets = array("Q", [0])
+        self.max_width = 0
+        find = data.find
+        position, size = 0, len(data)
+        while True:
+            end = find(b"\n", position)
+            if end < 0:
+                break
+            self.max_width = max(self.max_width, end - position)
+            position = end + 1
+            self._offsets.append(position)
+        self.max_width = max(self.max_width, size - position)
+        if position == size and size:
+            self._offsets.pop()  # A trailing newline does not start another line
+
+    @classmethod
+    def open(cls, file_path: str) -> "LineSource":
+        f = open(file_path, "rb")
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                f.close()
+                return cls(b"")
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            raise
+        return cls(mapping, mapping, f)
+
+    @classmethod
+    def from_text(cls, text: str) -> "LineSource":
+        return cls(text.encode())
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def offset(self, index: int) -> int:
+        return self._offsets[index]
+
+    def line_at(self, offset: int) -> int:
+        """The first line starting at or after byte `offset` (len(self) past the end)."""
+        return bisect_left(self._offsets, offset)
+
+    def raw_line(self, index: int) -> bytes:
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._data)
+        return self._data[start:end]
+
+    def line(self, index: int) -> str:
+        return self.raw_line(index).decode("utf-8", errors="replace").rstrip("\r\n").expandtabs(TAB_SIZE)
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._file.close()
+            self._mapping = self._file = None
+        self._data = b""
+
+    def changed_range(self, other: "LineSource") -> tuple[int, int, int] | None:
+        """
+        The lines that differ between this source and `other` (a newer
+        version): (first line, lines removed, lines inserted), or None if equal.
+        """
+        old_count, new_count = len(self), len(other)
+        prefix = 0
+        while prefix < min(old_count, new_count) and self.raw_line(prefix) == other.raw_line(prefix):
+            prefix += 1
+        if prefix == old_count == new_count:
+            return None
+        suffix = 0
+        while (suffix < min(old_count, new_count) - prefix
+               and self.raw_line(old_count - 1 - suffix) == other.raw_line(new_count - 1 - suffix)):
+            suffix += 1
+        return prefix, old_count - prefix - suffix, new_count - prefix - suffix
+
+
+# -------------------------------------------------
+# Incremental Highlighting
+# -------------------------------------------------
+
+_UNKNOWN = object()  # Starting state of a line not lexed yet
+
+
+class LineHighlighter:
+    """
+    Per-line tokens for a LineSource, lexed on demand.
+
+    Lexing runs from a line whose starting lexer state is known, over a
+    window of text. It follows RegexLexer.get_tokens_unprocessed(), but
+    notes the state stack at every line start that falls between two tokens
+    ("clean" lines). Lines inside a multi-line token (a docstring, an HTML
+    comment) have no state of their own; they are re-lexed from the clean
+    line before them. Lexers that are not regex lexers are run on each line
+    on its own.
+
+    Lines far below everything lexed so far are lexed from the root state at
+    a nearby unindented line, outside the recorded states, so a jump to the
+    end of a large file does not lex the whole file first. Those lines are
+    exact once scrolling from above reaches them.
+    """
+
+    # Text lexed past the requested line, so multi-line tokens that continue
+    # below it are seen whole. A single token longer than this (a huge
+    # docstring) may be highlighted incorrectly.
+    WINDOW_BYTES = 64 * 1024
+    # Lines lexed past the requested one, so scrolling does not start a run per line.
+    LOOKAHEAD_LINES = 200
+    # A line further than this below the last lexed one (a jump to the end of a
+    # large file) is lexed from a guessed top-level line instead of from the
+    # top, which can take seconds. The guess can be wrong inside long strings.
+    MAX_CATCHUP_LINES = 3000
+
+    def __init__(self, lexer, source: LineSource):
+        self.lexer = lexer
+        self.source = source
+        self._incremental = isinstance(lexer, RegexLexer)
+        # Starting state stack of each line: a tuple, None inside a multi-line token, or _UNKNOWN.
+        self._states: list = [("root",)] + [_UNKNOWN] * (len(source) - 1)
+        self._valid = 1  # States (and cached tokens) of lines before this are up to date
+        self._resync_from = len(source)  # First line after the last edit
+        self._resync_valid = 0  # What _valid becomes once re-lexing after an edit resyncs
+        self._tokens: OrderedDict[int, list] = OrderedDict()  # Least recently used first
+        self._approximate: OrderedDict[int, list] = OrderedDict()  # Lines lexed from a guessed state
+        self._interned: dict[tuple, tuple] = {}
+
+    def tokens(self, index: int) -> list:
+        """The (token type, text) pairs of line `index`."""
+        tokens = self._tokens.get(index) if index < self._valid else None
+        if tokens is None:
+            if not self._incremental:
+                text = self.source.line(index)
+                tokens = [(token, value) for _, token, value in self.lexer.get_tokens_unprocessed(text)]
+                self._store(self._tokens, index, tokens)
+                return tokens
+            if index - self._valid > self.MAX_CATCHUP_LINES:
+                tokens = self._approximate.get(index)
+                if tokens is None:
+                    self._run(self._guess_clean_line(index), index, detached=True)
+                    tokens = self._approximate[index]
+                return tokens
+            first = min(index, self._valid - 1)
+            while self._states[first] is None:
+                first -= 1
+            self._run(first, index)
+            tokens = self._tokens[index]
+        self._tokens.move_to_end(index)
+        return tokens
+
+    def _store(self, cache: OrderedDict, index: int, tokens: list) -> None:
+        cache[index] = tokens
+        cache.move_to_end(index)
+        if len(cache) > MAX_CACHED_LINES:
+            cache.popitem(last=False)
+
+    def _guess_clean_line(self, index: int) -> int:
+        """A nearby line that probably starts at the top level: unindented, starting with a name or a tag."""
+        for line in range(index, max(index - 200, 0), -1):
+            first_byte = self.source.raw_line(line)[:1]
+            if first_byte.isalpha() or first_byte in (b"<", b"@"):
+                return line
+        return max(index - 200, 0)
+
+    def _run(self, first: int, target: int, detached: bool = False) -> None:
+        """
+        Lexes from clean line `first` through line `target`, recording line
+        states on the way. A detached run starts from the root state instead,
+        records nothing and fills the approximate cache.
+        """
+        source, states = self.source, self._states
+        line_count = len(source)
+        stop_after = target + self.LOOKAHEAD_LINES
+        end = min(max(stop_after + 2, source.line_at(source.offset(first) + self.WINDOW_BYTES)), line_count)
+        # The window's last line may be cut short by the window, so it is only
+        # trusted at the end of the file.
+        commit_end = end if end == line_count else end - 1
+        text = "".join(source.line(i) + "\n" for i in range(first, end))
+
+        tokendefs = self.lexer._tokens
+        statestack = ["root"] if detached else list(states[first])
+        statetokens = tokendefs[statestack[-1]]
+        flat = []  # (token type, text) for the whole run
+        line = first  # Line that `pos` is on
+        next_line_at = text.find("\n") + 1  # Offset in `text` where line + 1 starts
+        pos = 0
+        clean = True  # Whether `line` starts between two tokens
+        while True:
+            while 0 < next_line_at <= pos:
+                line += 1
+                clean = pos == next_line_at
+                if not detached and self._valid <= line < len(states):
+                    state = None
+                    if clean:
+                        state = tuple(statestack)
+                        state = self._interned.setdefault(state, state)
+                    if state is not None and line >= self._resync_from and states[line] == state:
+                        # Same state as before the edit: what was known below it is still right.
+                        self._valid = max(line + 1, self._resync_valid)
+                        self._resync_from = len(states)
+                    else:
+                        states[line] = state
+                        self._valid = line + 1
+                next_line_at = text.find("\n", next_line_at) + 1
+            if line >= commit_end or (line > stop_after and clean):
+                break
+            for rexmatch, action, new_state in statetokens:
+                m = rexmatch(text, pos)
+                if not m:
+                    continue
+                if action is not None:
+                    if type(action) is _TokenType:
+                        flat.append((action, m.group()))
+                    else:
+                        flat.extend((token, value) for _, token, value in action(self.lexer, m))
+                pos = m.end()
+                if new_state is not None:
+                    if isinstance(new_state, tuple):
+                        for state in new_state:
+                            if state == "#pop":
+                                if len(statestack) > 1:
+                                    statestack.pop()
+                            elif state == "#push":
+                                statestack.append(statestack[-1])
+                            else:
+                                statestack.append(state)
+                    elif isinstance(new_state, int):
+                        if abs(new_state) >= len(statestack):
+                            del statestack[1:]
+                        else:
+                            del statestack[new_state:]
+                    elif new_state == "#push":
+                        statestack.append(statestack[-1])
+                    statetokens = tokendefs[statestack[-1]]
+                break
+            else:
+                if pos >= len(text):
+                    break
+                if text[pos] == "\n":
+                    statestack = ["root"]  # Pygments resets at an unmatched end of line
+                    statetokens = tokendefs["root"]
+                    flat.append((Whitespace, "\n"))
+                else:
+                    flat.append((Error, text[pos]))
+                pos += 1
+
+        # Split the run's tokens into lines; `line` itself may be incomplete.
+        cache = self._approximate if detached else self._tokens
+        # `line` counts as lexed now, but its tokens are not stored: drop any
+        # left over (shifted) from before an edit.
+        cache.pop(line, None)
+        current, index = [], first
+        for token, value in flat:
+            while "\n" in value:
+                head, _, value = value.partition("\n")
+                if head:
+                    current.append((token, head))
+                self._store(cache, index, current)
+                current, index = [], index + 1
+                if index >= line:
+                    return
+            if value:
+                current.append((token, value))
+
+    def edit(self, source: LineSource, start: int, removed: int, inserted: int) -> None:
+        """
+        Switches to a new version of the source in which `removed` lines at
+        `start` were replaced by `inserted` lines.
+        """
+        self.source = source
+        states = self._states
+        # A multi-line token that began above the edit may end differently now,
+        # and so may a construct opened at the top level above it (an
+        # unterminated docstring the edit closes): restart from the last
+        # top-level line before the edit. Line `start` is re-lexed as well:
+        # when nothing was inserted, its slot now holds the old state of the
+        # first line after the edit, which re-lexing resyncs against.
+        clean = max(min(start - 1, self._valid - 1), 0)
+        while states[clean] is None or len(states[clean]) > 1:
+            clean -= 1
+        delta = inserted - removed
+        self._states = states[:start] + [_UNKNOWN] * inserted + states[start + removed:]
+        if start == 0 or not self._states:
+            self._states[:1] = [("root",)]
+        self._resync_valid = self._valid + delta if self._valid > start + removed else 0
+        self._valid = min(self._valid, clean + 1)
+        self._resync_from = start + inserted
+
+        tokens = OrderedDict()
+        for line, line_tokens in self._tokens.items():
+            if line < clean:
+                tokens[line] = line_tokens
+            elif line >= start + removed and line + delta >= self._valid:
+                # Valid again once the states resync. Not when one lands on line 0
+                # (an edit at the top): line 0's root state is always trusted, so
+                # _valid never drops below 1 and its tokens would never be re-lexed.
+                tokens[line + delta] = line_tokens
+        self._tokens = tokens
+        self._approximate.clear()
+
+
+# -------------------------------------------------
+# Widget
+# -------------------------------------------------
+
+class CodeViewer(ScrollView, can_focus=True):
+    """
+    Read-only, syntax-highlighted view of a file (or of a piece of text) that
+    only ever renders the lines on screen.
+    """
+
+    DEFAULT_CSS = """
+    CodeViewer { background: #1e1e1e; }
+    """
+
+    THEME = "monokai"
+    GUTTER_STYLE = Style(color="#6e6e6e")
+    CURRENT_LINE_STYLE = Style(bgcolor="#2f2f3f")
+
+    def __init__(self, file_path: str | None = None, *, text: str | None = None, language: str = "text",
+                 start_line: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.file_path = file_path
+        self.source: LineSource | None = None
+        self.highlighter: LineHighlighter | None = None
+        self.current_line: int | None = None  # 1-based line to mark, e.g. a method definition
+        self._theme = PygmentsSyntaxTheme(self.THEME)
+        self._styles: dict = {}
+        self._mtime = None
+        if file_path is not None:
+            self.load(file_path, start_line)
+        elif text is not None:
+            self.load_text(text, language, start_line)
+
+    # --- Loading ---
+
+    def load(self, file_path: str, start_line: int | None = None) -> None:
+        """Shows `file_path`, optionally scrolled to (and marking) 1-based `start_line`."""
+        try:
+            source = LineSource.open(file_path)
+            self._mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            source = LineSource.from_text(f"Could not read {file_path}")
+        try:
+            lexer = get_lexer_for_filename(file_path, stripnl=False)
+        except ClassNotFound:
+            lexer = get_lexer_by_name("text")
+        self.file_path = file_path
+        self._show(source, lexer, start_line)
+
+    def load_text(self, text: str, language: str = "text", start_line: int | None = None) -> None:
+        try:
+            lexer = get_lexer_by_name(language, stripnl=False)
+        except ClassNotFound:
+            lexer = get_lexer_by_name("text")
+        self.file_path = None
+        self._show(LineSource.from_text(text), lexer, start_line)
+
+    def _show(self, source: LineSource, lexer, start_line: int | None) -> None:
+        if self.source is not None:
+            self.source.close()
+        self.source = source
+        self.highlighter = LineHighlighter(lexer, source)
+        self.current_line = start_line
+        self._update_virtual_size()
+        if start_line is not None:
+            self.call_after_refresh(self.scroll_to_line, start_line)
+        else:
+            self.scroll_to(0, 0, animate=False)
+        self.refresh()
+
+    def reload(self) -> bool:
+        """
+        Re-maps the file if it changed on disk; only the highlighting of the
+        changed lines (and of the lines after them whose lexer state changed)
+        is redone. Returns True if anything changed.
+        """
+        if self.file_path is None or self.source is None:
+            return False
+        try:
+            mtime = os.stat(self.file_path).st_mtime_ns
+            if mtime == self._mtime:
+                return False
+            source = LineSource.open(self.file_path)
+        except OSError:
+            return False
+        self._mtime = mtime
+        changed = self.source.changed_range(source)
+        if changed is None:
+            source.close()
+            return False
+        old = self.source
+        self.highlighter.edit(source, *changed)
+        self.source = source
+        old.close()
+        self._update_virtual_size()
+        self.refresh()
+        return True
+
+    def _update_virtual_size(self) -> None:
+        self._gutter = len(str(len(self.source))) + 2
+        self.virtual_size = Size(self._gutter + self.source.max_width + 1, len(self.source))
+
+    def scroll_to_line(self, line: int) -> None:
+        """Scrolls so 1-based `line` is about a third of the way down."""
+        self.scroll_to(y=max(line - 1 - self.size.height // 3, 0), animate=False)
+
+    # --- Rendering ---
+
+    def _style_for(self, token_type) -> Style:
+        style = self._styles.get(token_type)
+        if style is None:
+            style = self._styles[token_type] = self._theme.get_style_for_token(token_type)
+        return style
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        if self.source is None or index >= len(self.source):
+            return Strip.blank(width, self.rich_style)
+
+        base = self.rich_style
+        if self.current_line == index + 1:
+            base = base + self.CURRENT_LINE_STYLE
+        gutter = Segment(f"{index + 1:>{self._gutter - 1}} ", base + self.GUTTER_STYLE)
+        code = Strip(
+            [Segment(value, base + self._style_for(token)) for token, value in self.highlighter.tokens(index)]
+        )
+        code = code.crop_extend(scroll_x, scroll_x + max(width - self._gutter, 0), base)
+        return Strip([gutter, *code], width)
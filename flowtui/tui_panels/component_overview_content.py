@@ -5,6 +5,14 @@ from textual.containers import Vertical
 from textual.widgets import Tree, Static
 from textual.widgets.tree import TreeNode
 from textual.message import Message
+from rich.markup import escape
+
+from flow_system.profiler import load_folded, profile_path
+from flow_system.registry import FlowRegistry
+from services.flow_parser import parse_flow_structure
+from services.flow_xref import FlowXrefIndex
+from services.workspace import under
+from tui_panels.code_viewer import CodeViewer
 
 # Import the message from the explorer panel
 from tui_panels.explorer_content import ExplorerContent
@@ -33,6 +41,13 @@ class ComponentOverviewContent(Vertical):
             self.verb = verb
             self.is_implemented = is_implemented
             self.file_path = file_path
+
+    # Set by the app when an index daemon is running (services.index_daemon.IndexClient).
+    index_client = None
+    # View <-> flow cross-references (services.flow_xref), shared with and refreshed by the app.
+    flow_xref: FlowXrefIndex | None = None
+    # Workspace root of the current selection; contract imports resolve inside it.
+    project_root = "."
     
     HTML_TAG_EMOJIS = {
         "div": "📦", "p": "¶", "span": "📄", "a": "🔗", "img": "🖼️",
@@ -71,12 +86,18 @@ class ComponentOverviewContent(Vertical):
 
     def _populate_html_tree(self, parent_node: TreeNode, file_path: str):
         node_stack = [(parent_node, -1)]
+        xref = self.flow_xref
         try:
             with open(file_path, 'r') as f:
-                for line in f:
+                for line_number, line in enumerate(f, 1):
                     if not line.strip().startswith("<"): continue
                     indent, data = self._parse_html_line(line)
                     data["file_path"] = file_path
+                    if xref is not None:
+                        # What this element calls, flagged when the flow or verb does not exist.
+                        for reference in xref.calls_from(file_path, line_number):
+                            dangling = " [red]⚠️[/]" if xref.problem(reference) else ""
+                            data["display"] += f" [magenta]→ {reference.target}[/]{dangling}"
                     last_node, last_indent = node_stack[-1]
                     if indent > last_indent:
                         new_node = last_node.add(data["display"])
@@ -432,66 +453,26 @@ class ComponentOverviewContent(Vertical):
     def _get_flow_structure(self, file_path: str) -> dict[str, dict[str, list[str] | set[str]]]:
         """
         Parses a flow file to find BaseFlow subclasses (flows), their routes from
-        docstrings, and their public methods.
-        Returns a dict like:
-        {
-            "flow_name": {
-                "routes": ["ROUTE1", "ROUTE2"],
-                "methods": {"get", "post"}
-            },
-            ...
-        }
+        docstrings, and their public methods (see services.flow_parser).
+        Asks the index daemon first when connected, since it already holds the result.
         """
-        flow_data = {}
+        if self.index_client is not None:
+            try:
+                structure = self.index_client.flow_structure(os.path.abspath(file_path))
+                return {name: {"routes": data["routes"], "methods": set(data["methods"])}
+                        for name, data in structure.items()}
+            except LookupError:
+                pass  # Not indexed there (another workspace root): parse it here
+            except OSError as e:
+                print(f"Index daemon unavailable, parsing locally: {e}")
+                self.index_client = None
         try:
             with open(file_path, 'r') as f:
-                content = f.read()
-
-            # Regex to find inner classes inheriting from BaseFlow.
-            # It captures: 
-            # Group 1: flow_name (the name of the inner class)
-            # Group 3/4: docstring content (optional)
-            # Group 5: class body
-            # The lookahead `(?=\n\s*class\s+\w+|\Z)` ensures it stops before the next class definition or at the end of the file.
-            flow_class_pattern = re.compile(
-                r"class\s+(\w+)\s*\(\s*BaseFlow\s*\)\s*:\s*(?:(?:\"\"\"(.*?)\"\"\")|(?:\'\'\'(.*?)\'\'\'))?([\s\S]*?)(?=\n\s*class\s+\w+|\Z)",
-                re.MULTILINE
-            )
-            
-            for match in flow_class_pattern.finditer(content):
-                flow_name = match.group(1)
-                # Extract docstring content, handling both triple double-quotes and triple single-quotes
-                docstring = match.group(2) or match.group(3) or "" 
-                class_body = match.group(4)
-
-                current_flow_routes = []
-                if docstring:
-                    # Search for 'Routes:' within the extracted docstring
-                    routes_match = re.search(r'Routes:\s*([A-Z0-9_, ]+)', docstring, re.IGNORECASE)
-                    if routes_match:
-                        routes_str = routes_match.group(1)
-                        current_flow_routes = [route.strip() for route in routes_str.split(',')]
-
-                current_flow_methods = set()
-                if class_body:
-                    # Find all public methods defined directly within this flow class's body
-                    # We look for 'def ' followed by a method name and an opening parenthesis.
-                    found_methods = re.findall(r'^\s*def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', class_body, re.MULTILINE)
-                    # Convert method names to lowercase and exclude private methods (starting with '_')
-                    current_flow_methods = {m.lower() for m in found_methods if not m.startswith('_')}
-                
-                # Only add to flow_data if routes or methods were found, indicating a valid flow definition
-                if current_flow_routes or current_flow_methods:
-                    flow_data[flow_name] = {
-                        "routes": current_flow_routes,
-                        "methods": current_flow_methods
-                    }
-
+                return parse_flow_structure(f.read())
         except Exception as e:
             # Log any parsing errors for debugging purposes.
             print(f"Error parsing flow file {file_path}: {e}")
-            pass # Continue processing other files if an error occurs
-        return flow_data
+            return {}
 
     def _update_tree_for_flow(self, selected_flow_full_path: str, flow_file_path: str) -> None:
         """Clear and rebuild the tree to show the implementation of backend Flows in a file."""
@@ -550,13 +531,16 @@ class ComponentOverviewContent(Vertical):
                         "file_path": flow_file_path
                     }
 
-        # --- Views (Hardcoded for now) ---
+        # --- Views: every frontend element that calls one of these flows ---
         views_root = tree.root.add("🖼️ [b]Associated Views[/b]")
-        self._find_and_populate_views(views_root)
-        
-        # --- Contracts (Hardcoded for now) ---
+        registry = self._xref().registry
+        self._find_and_populate_views(
+            views_root, [registry.flow_name_for(flow_file_path, name) for name in sorted_flow_names]
+        )
+
+        # --- Contracts: the ones the flow file imports ---
         contracts_root = tree.root.add("📜 [b]Associated Contracts[/b]")
-        self._find_and_populate_contracts(contracts_root)
+        self._find_and_populate_contracts(contracts_root, flow_file_path)
         
         tree.root.expand_all()
 
@@ -568,37 +552,70 @@ class ComponentOverviewContent(Vertical):
         self._populate_html_tree(tree.root, view_file_path)
         tree.root.expand_all()
 
-    def _update_tree_for_model(self, model_name: str, model_file_path: str) -> None:
-        """Clear and rebuild the tree to show the content of a Model file."""
+    def _show_source(self, file_path: str | None) -> None:
+        """Shows `file_path` in the code viewer instead of the tree (None: back to the tree)."""
+        viewer = self.query_one(CodeViewer)
         tree = self.query_one(Tree)
-        tree.clear()
-        tree.root.label = f"🔹 {model_name}"
+        viewer.display = file_path is not None
+        tree.display = file_path is None
+        if file_path is not None:
+            viewer.load(file_path)
+
+    def _update_tree_for_model(self, model_name: str, model_file_path: str) -> None:
+        """Show a Model file's source (virtualized, so large files stay fast)."""
+        self._show_source(model_file_path)
+
+    def _xref(self) -> FlowXrefIndex:
+        """The cross-reference index; built on first use when the app has not provided one."""
+        if self.flow_xref is None:
+            self.flow_xref = FlowXrefIndex()
+            self.flow_xref.refresh()
+        return self.flow_xref
+
+    def _find_and_populate_views(self, parent_node: TreeNode, flow_names: list[str]):
+        """
+        Lists the frontend files (HTML, JS, Blender) that call any of `flow_names`,
+        plus dangling calls into the same domain (e.g. a flow that was renamed).
+        """
+        xref = self._xref()
+        callers_by_file: dict[str, list] = {}
+        for flow_name in flow_names:
+            for reference in xref.callers(flow_name):
+                callers_by_file.setdefault(reference.file_path, []).append(reference)
+        domains = {xref.registry.domain_of(flow_name) for flow_name in flow_names}
+        for reference, _ in xref.dangling():
+            if reference.flow_name not in flow_names and xref.registry.domain_of(reference.flow_name) in domains:
+                callers_by_file.setdefault(reference.file_path, []).append(reference)
+        if not callers_by_file:
+            parent_node.add("[gray]No frontend calls these flows.[/]")
+            return
+
+        for file_path, references in sorted(callers_by_file.items()):
+            view_node = parent_node.add(f"📄 [blue]{file_path}[/blue]")
+            if file_path.endswith(".html"):
+                self._populate_html_tree(view_node, file_path)  # Calling elements are marked with →
+                continue
+            for reference in sorted(references, key=lambda r: r.line):
+                problem = xref.problem(reference)
+                label = f"[gray]{reference.line}:[/] {escape(reference.element)} [magenta]→ {reference.target}[/]"
+                if problem:
+                    label += f" [red]⚠️ {escape(problem)}[/]"
+                view_node.add_leaf(label)
+
+    def _find_and_populate_contracts(self, parent_node: TreeNode, flow_file_path: str):
+        """Lists the contract modules a flow file imports."""
         try:
-            with open(model_file_path, 'r') as f:
+            with open(flow_file_path, 'r') as f:
                 content = f.read()
-            # Simple display for now, could be enhanced with syntax highlighting
-            tree.root.add(content)
-        except Exception:
-            tree.root.add("⚠️ [red]Could not read file.[/]")
-
-    def _find_and_populate_views(self, parent_node: TreeNode):
-        """Helper to find and populate associated views (currently hardcoded)."""
-        WEB_APP_PATH = "app_templates/web_app_template" # This should come from app_graph
-        views_dir = os.path.join(WEB_APP_PATH, "views")
-        if os.path.isdir(views_dir):
-            for file in sorted(os.listdir(views_dir)):
-                if file.endswith(".html") and not file.startswith("_"):
-                    view_node = parent_node.add(f"📄 [blue]{file}[/blue]")
-                    self._populate_html_tree(view_node, os.path.join(views_dir, file))
-
-    def _find_and_populate_contracts(self, parent_node: TreeNode):
-        """Helper to find and populate associated contracts (currently hardcoded)."""
-        BACKEND_PATH = "backend" # This should come from app_graph
-        contracts_dir = os.path.join(BACKEND_PATH, "contracts")
-        if os.path.isdir(contracts_dir):
-            for file in sorted(os.listdir(contracts_dir)):
-                if file.endswith(".py") and not file.startswith("__"):
-                    parent_node.add(f"📄 [yellow]{file}[/yellow]")
+        except OSError:
+            return
+        modules = re.findall(r"^\s*from\s+backend\.contracts\.([\w.]+)\s+import", content, re.MULTILINE)
+        for module in sorted(set(modules)):
+            contract_path = under(self.project_root, os.path.join("backend", "contracts", *module.split(".")) + ".py")
+            if os.path.exists(contract_path):
+                parent_node.add(f"📄 [yellow]{contract_path}[/yellow]")
+            else:
+                parent_node.add(f"📄 [red]{contract_path} (missing)[/red]")
 
     FOLDER_DESCRIPTIONS = {
         "contracts": """[b]📦 Contracts[/b]
@@ -657,9 +674,14 @@ Services contain shared, reusable business logic that doesn't fit neatly into a
         tree.root.add_leaf(description)
         tree.root.expand()
 
+    # Explorer selections shown as source code.
+    SOURCE_TYPES = {"model", "contract", "service", "provider", "file"}
+
     def on_explorer_content_flow_selected(self, message: ExplorerContent.FlowSelected) -> None:
         """Listen for messages from the explorer and update this panel based on target type."""
         target_type = message.target_type
+        if target_type not in self.SOURCE_TYPES:
+            self._show_source(None)
         
         if target_type == "flow":
             self._update_tree_for_flow(message.name, message.file_path)
@@ -667,6 +689,8 @@ Services contain shared, reusable business logic that doesn't fit neatly into a
             self._update_tree_for_view(message.name, message.file_path)
         elif target_type == "model":
             self._update_tree_for_model(message.name, message.file_path)
+        elif target_type in self.SOURCE_TYPES:
+            self._show_source(message.file_path)
         elif target_type == "directory":
             self._update_tree_for_directory(message.file_path)
         else:
@@ -674,6 +698,47 @@ Services contain shared, reusable business logic that doesn't fit neatly into a
             self.query_one(Tree).clear()
             self.query_one(Tree).root.label = "Unsupported selection"
 
+    # Frames below this share of the samples are left out of the profile tree.
+    PROFILE_MIN_PERCENT = 1.0
+
+    def _populate_profile_tree(self, verb_node: TreeNode, data: dict) -> None:
+        """
+        Shows the sampling profile recorded for a verb (see flow_system.profiler)
+        as a call tree under the verb node, heaviest paths first.
+        """
+        verb_node.remove_children()
+        flow_class_name = data["flow_name"].rpartition(".")[2]
+        runtime_name = FlowRegistry().flow_name_for(data["file_path"], flow_class_name)
+        stacks = load_folded(profile_path(runtime_name, data["verb"]))
+        if not stacks:
+            return
+
+        # Fold the collapsed stacks into a call tree: frame -> [samples, children]
+        call_tree: dict = {}
+        for stack, count in stacks.items():
+            level = call_tree
+            for frame in stack.split(";"):
+                entry = level.setdefault(frame, [0, {}])
+                entry[0] += count
+                level = entry[1]
+
+        total = sum(stacks.values())
+        profile_node = verb_node.add(f"🔥 [b]Profile[/b] [gray]({total} samples)[/]")
+
+        def _add_frames(parent: TreeNode, level: dict) -> None:
+            for frame, (count, children) in sorted(level.items(), key=lambda item: -item[1][0]):
+                percent = 100 * count / total
+                if percent < self.PROFILE_MIN_PERCENT:
+                    continue
+                file_name, _, func = frame.rpartition(":")
+                color = "red" if percent >= 50 else "yellow" if percent >= 10 else "gray"
+                node = parent.add(f"[{color}]{percent:5.1f}%[/] {func} [gray]{file_name}[/]", expand=percent >= 10)
+                _add_frames(node, children)
+
+        _add_frames(profile_node, call_tree)
+        verb_node.expand()
+        profile_node.expand()
+
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         """Post a message when a verb or an HTML element is selected."""
         self._on_tree_node_selected(event)
@@ -692,6 +757,8 @@ Services contain shared, reusable business logic that doesn't fit neatly into a
                 is_implemented=data["is_implemented"],
                 file_path=data["file_path"]
             ))
+            if data["is_implemented"]:
+                self._populate_profile_tree(event.node, data)
         
         # Case 2: An HTML element was selected
         elif "tag" in event.node.data:
@@ -703,5 +770,8 @@ Services contain shared, reusable business logic that doesn't fit neatly into a
             ))
 
     def compose(self) -> ComposeResult:
-        """Compose the initial empty tree."""
+        """Compose the initial empty tree, and the source viewer shown instead of it for plain files."""
         yield Tree("⬅️ [i]Select a target from the Explorer[/i]")
+        viewer = CodeViewer()
+        viewer.display = False
+        yield viewer
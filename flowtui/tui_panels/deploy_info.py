@@ -1,7 +1,9 @@
-import random
+import os
 from textual.app import ComposeResult
 from textual.widgets import Static, Button, Tree
 
+from services.host_metrics import MetricsCollector, sparkline
+
 # -------------------------------------------------
 # Deploy Info Widget
 # -------------------------------------------------
@@ -9,25 +11,88 @@ from textual.widgets import Static, Button, Tree
 class DeployInfo(Static):
     """A static widget to display deployment info with a retro-tech aesthetic."""
 
+    # Seconds between samples; override with FLOWTUI_METRICS_INTERVAL.
+    REFRESH_SECONDS = float(os.environ.get("FLOWTUI_METRICS_INTERVAL", "2.0"))
+    HISTORY = 20
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.collector = MetricsCollector.from_env(history=self.HISTORY)
+        # (host name, row key) -> tree node, and the last label rendered into it.
+        self._rows: dict = {}
+        self._labels: dict = {}
+
     def _get_status_color(self, val: int) -> str:
         if val > 80: return "red"
         if val > 50: return "yellow"
         return "green"
 
+    def _format_rate(self, bytes_per_second: float | None) -> str:
+        if bytes_per_second is None:
+            return "   -  "
+        for unit in ("B", "K", "M", "G"):
+            if bytes_per_second < 1024:
+                return f"{bytes_per_second:5.0f}{unit}"
+            bytes_per_second /= 1024
+        return f"{bytes_per_second:5.0f}T"
+
+    def _row_labels(self, host) -> dict[str, str]:
+        """Builds the label of every metric row for one host."""
+        if host.error:
+            # Every row, so none keeps showing the last good sample as current.
+            return {
+                "cpu": f"├─ [red]{host.error}[/]",
+                "mem": "├─ MEM:  [dim]unavailable[/]",
+                "load": "├─ LOAD: [dim]unavailable[/]",
+                "disk": "├─ DISK: [dim]unavailable[/]",
+                "net": "└─ NET : [dim]unavailable[/]",
+            }
+        labels = {}
+        for key, name in (("cpu", "CPU"), ("mem", "MEM")):
+            value = host.latest(key)
+            if value is None:
+                labels[key] = f"├─ {name}:  ...  "
+                continue
+            color = self._get_status_color(int(value))
+            labels[key] = f"├─ {name}:[{color}] {value:>3.0f}% [/]{sparkline(host.series[key], 100)}"
+        load = host.latest("load")
+        labels["load"] = f"├─ LOAD: {load if load is not None else 0:>4.2f} {sparkline(host.series['load'])}"
+        labels["disk"] = (f"├─ DISK: r{self._format_rate(host.latest('disk_read'))}/s"
+                          f" w{self._format_rate(host.latest('disk_write'))}/s")
+        labels["net"] = (f"└─ NET : ↓{self._format_rate(host.latest('net_rx'))}/s"
+                         f" ↑{self._format_rate(host.latest('net_tx'))}/s")
+        return labels
+
+    def _refresh_metrics(self) -> None:
+        """Samples every node and relabels only the rows whose text changed."""
+        self.collector.sample()
+        for host in self.collector.hosts:
+            for key, label in self._row_labels(host).items():
+                row = (host.name, key)
+                if self._labels.get(row) == label:
+                    continue
+                self._labels[row] = label
+                node = self._rows.get(row)
+                if node is None:
+                    self._rows[row] = self._rows[(host.name, None)].add_leaf(label)
+                else:
+                    node.set_label(label)
+
+    def on_mount(self) -> None:
+        self._refresh_metrics()
+        self.set_interval(self.REFRESH_SECONDS, self._refresh_metrics)
+
+    def on_unmount(self) -> None:
+        self.collector.close()
+
     def compose(self) -> ComposeResult:
         yield Static("🚀 [bold cyan]INFRASTRUCTURE STATUS[/]")
         server_tree = Tree("")
         server_tree.show_root = False
-        servers = {
-            "Hetzner-1": (random.randint(75, 95), random.randint(40, 60)),
-            "DO-Try-12": (random.randint(10, 30), random.randint(20, 40)),
-        }
-        for name, (cpu, mem) in servers.items():
-            cpu_color = self._get_status_color(cpu)
-            mem_color = self._get_status_color(mem)
-            server_node = server_tree.root.add(f"🛰️ [white]{name}[/]")
-            server_node.add(f"└─ CPU:[{cpu_color}] {cpu:>3}% [/] MEM:[{mem_color}] {mem:>3}% [/]")
-        server_tree.root.expand_all()
+        for host in self.collector.hosts:
+            server_node = server_tree.root.add(f"🛰️ [white]{host.name}[/]", expand=True)
+            self._rows[(host.name, None)] = server_node
+        server_tree.root.expand()
         yield server_tree
 
         yield Static("\n🕹️ [bold cyan]DEPLOYMENT CONTROL[/]")
@@ -1,18 +1,47 @@
 import os
 import json
+import threading
+from textual import events
 from textual.app import ComposeResult
 from textual.containers import Vertical
-from textual.widgets import Tree
+from textual.widgets import Input, OptionList, Tree
+from textual.widgets.option_list import Option
 from textual.message import Message
 from textual.widgets.tree import TreeNode
 
+from services.project_graph import NO_NODE, ROOT, ProjectGraph
+from services.quick_open import EntryCollector, TrigramIndex
+from services.workspace import under
+
+QUICK_OPEN_ICONS = {"path": "📄", "flow": "▶️", "contract": "📜", "model": "🔹"}
+
 
 class ExplorerContent(Vertical):
     """
     A file explorer that visualizes the entire application graph from app_graph.json
-    in a single, unified tree structure.
+    in a single, unified tree structure. Ctrl+O (bound by the app) opens a quick-open prompt that
+    fuzzy-matches paths, flows, contracts and models and jumps to them in the tree.
+    """
+
+    DEFAULT_CSS = """
+    ExplorerContent > #quick-open { border: none; background: #2a2a2a; height: 1; padding: 0 1; }
+    ExplorerContent > #quick-open-results { border: none; max-height: 12; background: #1e1e1e; }
     """
 
+    # Entries shown for a query.
+    QUICK_OPEN_LIMIT = 50
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.app_graphs: dict[str, ProjectGraph] = {}  # Root path -> graph, for every root shown
+        self.root_names: dict[str, str] = {}
+        self._nodes_by_path: dict[str, TreeNode] = {}
+        self._quick_open_index = TrigramIndex()
+        self._quick_open_entries = EntryCollector()
+        # Held while the index syncs in a worker thread; queries never wait on it.
+        self._quick_open_lock = threading.Lock()
+        self._quick_open_results = []
+
     class FlowSelected(Message):
         """Posted when a selectable file/node is chosen in the explorer."""
         def __init__(self, name: str, file_path: str, target_type: str) -> None:
@@ -26,18 +55,44 @@ class ExplorerContent(Vertical):
         pass
 
     def refresh_tree(self, app_graph: dict) -> None:
-        """Receives a new app graph and rebuilds the tree."""
-        self.app_graph = app_graph
+        """Receives a new app graph (a scan_project() dict) and rebuilds the tree."""
+        self.refresh_workspace({".": ProjectGraph.from_app_graph(app_graph)})
+
+    def refresh_workspace(self, app_graphs: dict[str, ProjectGraph], root_names: dict[str, str] | None = None) -> None:
+        """
+        Receives the graphs of every workspace root ({root path: graph}) and
+        rebuilds the tree. Several roots are shown side by side, one top-level
+        node each; a single root looks exactly like a plain project.
+        """
+        self.app_graphs = app_graphs
+        self.root_names = root_names or {}
         tree = self.query_one(Tree)
         tree.clear()
         self._populate_unified_tree(tree.root)
+        self.run_worker(lambda: self._sync_quick_open(app_graphs), thread=True, group="quick-open")
 
     def _populate_unified_tree(self, root: TreeNode) -> None:
         """Populates the tree based on the simple file tree from the CodeScannerService."""
         scan_node = root.add("🔄 [bold cyan]Rescan Project[/]")
         scan_node.data = {"action": "scan"}
+        self._nodes_by_path = {}
 
-        if not self.app_graph:
+        if len(self.app_graphs) == 1:
+            root_path, app_graph = next(iter(self.app_graphs.items()))
+            self._populate_project(root, app_graph, root_path)
+        else:
+            for root_path, app_graph in self.app_graphs.items():
+                name = self.root_names.get(root_path, root_path)
+                root_node = root.add(f"🗂️ [b]{name}[/b] [dim]{root_path}[/]")
+                root_node.data = {"type": "directory", "file_path": root_path, "name": name}
+                self._nodes_by_path[root_path] = root_node
+                self._populate_project(root_node, app_graph, root_path)
+
+        root.expand_all()
+
+    def _populate_project(self, root: TreeNode, graph: ProjectGraph | None, root_path: str) -> None:
+        """Adds the backend and apps of one project root under `root`."""
+        if graph is None:
             root.add("⚠️ [red]No apps found or scan failed.[/]")
             return
 
@@ -61,11 +116,12 @@ class ExplorerContent(Vertical):
             
             return {"type": "file", "icon": "📄"}
 
-        def _add_nodes_recursively(parent_node: TreeNode, node_data: dict, current_path: str):
-            """Helper function to recursively add nodes from a simple file tree."""
-            for name, content in sorted(node_data.items()):
-                new_path = os.path.join(current_path, name)
-                is_dir = isinstance(content, dict)
+        def _add_nodes_recursively(parent_node: TreeNode, graph_node: int, current_path: str):
+            """Helper function to recursively add the children of a graph node."""
+            children = sorted((graph.name(child), child) for child in graph.children(graph_node))
+            for name, child in children:
+                new_path = f"{current_path}{os.sep}{name}"
+                is_dir = graph.is_dir(child)
                 
                 meta = _get_node_meta(new_path, is_dir)
                 node_type = meta["type"]
@@ -73,43 +129,49 @@ class ExplorerContent(Vertical):
 
                 node = parent_node.add(f"{icon} {name}")
                 node.data = {"type": node_type, "file_path": new_path, "name": name}
+                self._nodes_by_path[new_path] = node
 
                 if is_dir:
-                    _add_nodes_recursively(node, content, new_path)
+                    _add_nodes_recursively(node, child, new_path)
 
         # Add the core backend at the root level
-        if self.app_graph.get("backend_tree"):
+        backend = graph.child(ROOT, "backend")
+        if backend != NO_NODE and graph.first_child(backend) != NO_NODE:
             backend_node = root.add("📦 [b]Backend[/b]")
-            backend_base_path = "backend"
+            backend_base_path = under(root_path, "backend")
             backend_node.data = {"type": "directory", "file_path": backend_base_path}
-            _add_nodes_recursively(backend_node, self.app_graph["backend_tree"], backend_base_path)
+            self._nodes_by_path[backend_base_path] = backend_node
+            _add_nodes_recursively(backend_node, backend, backend_base_path)
 
         # Add the apps
-        apps_data = self.app_graph.get("apps", {})
-        if not apps_data:
+        apps = graph.child(ROOT, "apps")
+        if apps == NO_NODE or graph.first_child(apps) == NO_NODE:
             return # No apps to show
 
         apps_root_node = root.add("🚀 [b]Apps[/b]")
-        for app_name, app_data in apps_data.items():
+        for app in graph.children(apps):
+            app_name = graph.name(app)
             app_node = apps_root_node.add(f"📱 {app_name}")
-            app_path = os.path.join("apps", app_name) # Base path for the app
+            app_path = under(root_path, os.path.join("apps", app_name)) # Base path for the app
 
-            if app_data.get("backend_tree"):
+            app_backend = graph.child(app, "backend")
+            if app_backend != NO_NODE and graph.first_child(app_backend) != NO_NODE:
                 backend_base_path = os.path.join(app_path, "backend")
                 backend_node = app_node.add("📦 Backend")
                 backend_node.data = {"type": "directory", "file_path": backend_base_path}
-                _add_nodes_recursively(backend_node, app_data["backend_tree"], backend_base_path)
+                self._nodes_by_path[backend_base_path] = backend_node
+                _add_nodes_recursively(backend_node, app_backend, backend_base_path)
 
-            if app_data.get("frontends"):
+            frontends = [child for child in graph.children(app) if graph.name(child).startswith("ext_frontend_")]
+            if frontends:
                 frontends_node = app_node.add("🖥️ Frontends")
-                for frontend in app_data["frontends"]:
-                    fe_node = frontends_node.add(f"🌐 {frontend['name']}")
-                    frontend_path = os.path.join(app_path, frontend['name'])
+                for frontend in frontends:
+                    frontend_name = graph.name(frontend)
+                    fe_node = frontends_node.add(f"🌐 {frontend_name}")
+                    frontend_path = os.path.join(app_path, frontend_name)
                     fe_node.data = {"type": "directory", "file_path": frontend_path}
-                    if frontend.get("tree"):
-                        _add_nodes_recursively(fe_node, frontend["tree"], frontend_path)
-        
-        root.expand_all()
+                    self._nodes_by_path[frontend_path] = fe_node
+                    _add_nodes_recursively(fe_node, frontend, frontend_path)
 
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         """Post a message when any node (file or directory) is selected."""
@@ -135,4 +197,108 @@ class ExplorerContent(Vertical):
 
     def compose(self) -> ComposeResult:
         """Render the explorer with a single, unified tree."""
+        quick_open = Input(placeholder="Go to file, flow, contract…", id="quick-open")
+        results = OptionList(id="quick-open-results")
+        quick_open.display = results.display = False
+        yield quick_open
+        yield results
         yield Tree("🌐 [b]Project[/b]")
+
+    # -------------------------------------------------
+    # Quick open
+    # -------------------------------------------------
+
+    def _sync_quick_open(self, app_graphs: dict[str, ProjectGraph]) -> None:
+        """Runs in a worker thread: brings the index up to date with the new scan."""
+        with self._quick_open_lock:
+            entries = self._quick_open_entries.collect(app_graphs)
+            added, removed = self._quick_open_index.sync(entries)
+        if added or removed:
+            self.app.call_from_thread(self._refresh_open_quick_open)
+
+    def _refresh_open_quick_open(self) -> None:
+        if self.query_one("#quick-open", Input).display:
+            self._update_quick_open()
+
+    def action_quick_open(self) -> None:
+        quick_open = self.query_one("#quick-open", Input)
+        quick_open.display = True
+        quick_open.focus()
+        self._update_quick_open()
+
+    def _close_quick_open(self) -> None:
+        quick_open = self.query_one("#quick-open", Input)
+        quick_open.display = False
+        quick_open.value = ""
+        self.query_one("#quick-open-results", OptionList).display = False
+        self.query_one(Tree).focus()
+
+    def _update_quick_open(self) -> None:
+        query = self.query_one("#quick-open", Input).value
+        results = self.query_one("#quick-open-results", OptionList)
+        results.clear_options()
+        if not self._quick_open_lock.acquire(blocking=False):
+            # The first build of a large project takes a moment; never block the UI on it.
+            results.add_option(Option("[dim]Indexing…[/]", disabled=True))
+            self._quick_open_results = []
+        else:
+            try:
+                self._quick_open_results = self._quick_open_index.search(query, self.QUICK_OPEN_LIMIT)
+            finally:
+                self._quick_open_lock.release()
+            results.add_options(
+                Option(f"{QUICK_OPEN_ICONS.get(entry.kind, '📄')} {entry.text}")
+                for entry in self._quick_open_results
+            )
+            if self._quick_open_results:
+                results.highlighted = 0
+        results.display = bool(query)
+
+    def _open_result(self, index: int | None) -> None:
+        if index is None or not 0 <= index < len(self._quick_open_results):
+            return
+        file_path = self._quick_open_results[index].data.get("file_path")
+        self._close_quick_open()
+        self.reveal(file_path)
+
+    def reveal(self, file_path: str | None) -> bool:
+        """Expands the tree down to `file_path` and selects it. Returns False if it is not in the tree."""
+        node = self._nodes_by_path.get(file_path)
+        if node is None:
+            return False
+        parent = node.parent
+        while parent is not None:
+            parent.expand()
+            parent = parent.parent
+        tree = self.query_one(Tree)
+        tree.select_node(node)
+        tree.scroll_to_node(node)
+        return True
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "quick-open":
+            self._update_quick_open()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id == "quick-open":
+            self._open_result(self.query_one("#quick-open-results", OptionList).highlighted)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        if event.option_list.id == "quick-open-results":
+            self._open_result(event.option_index)
+
+    def on_key(self, event: events.Key) -> None:
+        """Escape closes the prompt; up/down move through the results without leaving the input."""
+        quick_open = self.query_one("#quick-open", Input)
+        if not quick_open.display:
+            return
+        results = self.query_one("#quick-open-results", OptionList)
+        if event.key == "escape":
+            self._close_quick_open()
+        elif event.key == "down" and quick_open.has_focus:
+            results.action_cursor_down()
+        elif event.key == "up" and quick_open.has_focus:
+            results.action_cursor_up()
+        else:
+            return
+        event.stop()
@@ -1,15 +1,18 @@
 import os
 import re
-import subprocess
 import tempfile
 from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal, VerticalScroll
 from textual.widgets import Static, Input, Button, Label
 from textual.binding import Binding
 
+from flow_system.metrics import load_flow_stats
+from flow_system.registry import FlowRegistry
+
 # Import the message classes from the other panels
 from tui_panels.component_overview_content import ComponentOverviewContent
 from tui_panels.explorer_content import ExplorerContent
+from tui_panels.code_viewer import CodeViewer
 
 class InspectorContent(VerticalScroll):
     """
@@ -44,28 +47,30 @@ class InspectorContent(VerticalScroll):
 
     # --- Method Inspector ---
 
-    def _get_method_snippet(self, content: str, route_name: str, verb: str) -> str:
-        """Extracts a snippet of a method's source code."""
-        method_name = f"{route_name.lower()}_{verb.lower()}"
-        
-        # First, try the full routeName_verb convention
-        pattern = re.compile(fr"^\s*(async def|def)\s+{method_name}\s*\(.*?\):\s*\n(?:(?!\s*(async def|def)\s).*\n?)*", re.MULTILINE)
-        match = re.search(pattern, content)
-
-        if not match and verb.lower() == 'get':
-            # Second, try the special case where GET is just the route name
-            method_name = route_name.lower()
-            pattern = re.compile(fr"^\s*(async def|def)\s+{method_name}\s*\(.*?\):\s*\n(?:(?!\s*(async def|def)\s).*\n?)*", re.MULTILINE)
-            match = re.search(pattern, content)
+    def _format_latency(self, micros: float) -> str:
+        if micros >= 1_000_000:
+            return f"{micros / 1_000_000:.2f}s"
+        if micros >= 1_000:
+            return f"{micros / 1_000:.1f}ms"
+        return f"{micros:.0f}µs"
+
+    def _mount_flow_stats(self, container: Vertical, data: dict) -> None:
+        """Shows the runtime latency percentiles and throughput recorded for this verb."""
+        flow_class_name = data.get("flow_name", "").rpartition(".")[2]
+        runtime_name = FlowRegistry().flow_name_for(self.file_path, flow_class_name)
+        stats = load_flow_stats().get((runtime_name, data.get("verb", "").lower()))
+
+        container.mount(Label("\n[b]Performance[/b]"))
+        if stats is None:
+            container.mount(Horizontal(Static("Calls:", classes="label"), Static("[gray]No calls recorded yet[/]"), classes="prop-row"))
+            return
 
-        if match:
-            snippet = match.group(0).strip()
-            lines = snippet.split('\n')
-            if len(lines) > 5:
-                # Show first 4 lines and an ellipsis
-                return "\n".join(lines[:4]) + "\n    ..."
-            return "\n".join(lines)
-        return ""
+        h = stats.histogram
+        error_color = "red" if stats.errors else "green"
+        latencies = " / ".join(self._format_latency(h.percentile(p)) for p in (50, 95, 99))
+        container.mount(Horizontal(Static("Calls:", classes="label"), Static(f"[cyan]{stats.calls}[/] ([{error_color}]{stats.errors} errors[/])"), classes="prop-row"))
+        container.mount(Horizontal(Static("p50/95/99:", classes="label"), Static(f"[cyan]{latencies}[/]"), classes="prop-row"))
+        container.mount(Horizontal(Static("Throughput:", classes="label"), Static(f"[cyan]{stats.throughput:.1f} req/s[/]"), classes="prop-row"))
 
     def update_method_inspector(self, data: dict) -> None:
         """Renders the inspector for a controller method."""
@@ -86,6 +91,8 @@ class InspectorContent(VerticalScroll):
         container.mount(Horizontal(Static("Route:", classes="label"), Static(f"[cyan]{data.get('route_name', 'N/A')}[/]"), classes="prop-row"))
         container.mount(Horizontal(Static("Verb :", classes="label"), Static(f"[cyan]{data.get('verb', 'N/A').upper()}[/]"), classes="prop-row"))
         container.mount(Horizontal(Static("Status:", classes="label"), Static(f"[{color}]{status}[/{color}]"), classes="prop-row"))
+        if is_implemented:
+            self._mount_flow_stats(container, data)
         
         container.mount(Label("\n[b]Details[/b]"))
 
@@ -96,10 +103,11 @@ class InspectorContent(VerticalScroll):
             content = ""
 
         if is_implemented and content:
-            snippet = self._get_method_snippet(content, data['route_name'], data['verb'])
-            if snippet:
-                container.mount(Label("Code Snippet:", classes="label"))
-                container.mount(Static(snippet, classes="code-preview"))
+            line_number = self._find_method_line_number(content, data['route_name'], data['verb'])
+            if line_number > 0:
+                # The whole file, scrolled to the method: the viewer only renders what is visible.
+                container.mount(Label("Code:", classes="label"))
+                container.mount(CodeViewer(self.file_path, start_line=line_number, classes="code-preview"))
         elif not is_implemented:
             expected_method = f"{data['route_name'].lower()}_{data['verb'].lower()}"
             container.mount(Horizontal(
@@ -124,7 +132,7 @@ class InspectorContent(VerticalScroll):
         # Core Triggers
         "flow:click", "flow:submit", "flow:change",
         # Real-time & Polling
-        "flow:trigger", "flow:poll",
+        "flow:subscribe", "flow:trigger", "flow:poll",
         # UX & Polish
         "flow:loading-class", "flow:transition", "flow:push-url",
         # Advanced Control Flow
@@ -291,9 +299,7 @@ class InspectorContent(VerticalScroll):
                 self.app.log("Could not find target line in file.")
                 return
 
-            self.app.action_suspend_process()
-            subprocess.run(["nvim", f"+{line_number}", self.file_path])
-            self.app.log("Resumed TUI. Note: Manual refresh may be needed to see changes.")
+            self.app.open_in_editor(self.file_path, line_number)
 
         except Exception as e:
             self.app.log(f"Error opening editor: {e}")
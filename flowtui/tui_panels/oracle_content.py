@@ -1,55 +1,185 @@
+import os
+import re
+import time
+
+from rich.text import Text
 from textual.app import ComposeResult
-from textual.containers import Vertical, VerticalScroll, Horizontal
-from textual.widgets import Static, Button, Input, Label, ListView, ListItem
+from textual.containers import Vertical
+from textual.message import Message
+from textual.widgets import Input, OptionList, Static
+from textual.widgets.option_list import Option
+from textual.worker import get_current_worker
+
+from services.code_search import SEARCH_EXTENSIONS, CodeSearchIndex
+
 
-class OracleContent(Static):
+class OracleContent(Vertical):
     """
-    A mock UI for The Oracle panel, demonstrating a command-driven workflow.
+    Project-wide search over source and template files. Plain queries match
+    words (the last one as you type it); /pattern/ is a regular expression.
+    Results stream in as files are matched, and typing again cancels the
+    running search.
     """
 
+    DEFAULT_CSS = """
+    OracleContent > #oracle-input { border: none; background: #2a2a2a; height: 1; padding: 0 1; }
+    OracleContent > #oracle-status { color: gray; height: 1; padding: 0 1; }
+    OracleContent > #oracle-results { border: none; height: 1fr; background: #1e1e1e; }
+    """
+
+    # Hits shown for a query.
+    MAX_HITS = 1000
+    # Streamed hits are handed to the UI at most this often (seconds).
+    BATCH_SECONDS = 0.05
+
+    class ResultSelected(Message):
+        """Posted when a search hit is chosen."""
+        def __init__(self, file_path: str, line_number: int) -> None:
+            super().__init__()
+            self.file_path = file_path
+            self.line_number = line_number
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.index = CodeSearchIndex()
+        self._hits = []
+        self._generation = 0  # Bumped per query, so batches of a cancelled search are dropped
+        self._indexing = False
+
     def compose(self) -> ComposeResult:
         """Create the Oracle's UI."""
-        with Vertical(id="oracle-container"):
-            # The main chat log area
-            with VerticalScroll(id="oracle-log"):
-                yield Static(
-                    "Create a new flow to handle product reviews.", classes="user-prompt"
-                )
-                yield Static(
-                    """
-[b]ORACLE:[/] I will execute the following command:
-[b cyan]/create domain reviews flow:index verb:get verb:post[/b cyan]
-
-This will create `reviews/index.py` with an `IndexFlow` class.
-Do you want to proceed?
-
-  1. [Execute]
-  2. [Cancel]
-""",
-                    classes="oracle-response",
-                )
-                yield Static("1", classes="user-prompt-action")
-                yield Static(
-                    """
-[b]ORACLE:[/] Command executed.
-Now, what is the next command?
-""",
-                    classes="oracle-response",
-                )
-
-            # The list of chats
-            with Vertical(id="oracle-chat-list-container"):
-                yield Label("[b]Chat History[/b]")
-                with VerticalScroll():
-                    yield ListView(
-                        ListItem(Label("Chat 1: Product Reviews"), id="active-chat"),
-                        ListItem(Label("Chat 2: User Auth")),
-                        ListItem(Label("Chat 3: Refactoring DB")),
-                    )
-                yield Button("[+] New Chat", variant="default", id="new-chat-btn")
-
-            # The input area at the bottom
-            with Horizontal(id="oracle-input-bar"):
-                yield Input(
-                    placeholder="Ask Oracle a question or type a /command...", id="oracle-input"
-                )
\ No newline at end of file
+        yield Input(placeholder="Search the project… (/regex/)", id="oracle-input")
+        yield Static("", id="oracle-status")
+        yield OptionList(id="oracle-results")
+
+    def on_mount(self) -> None:
+        self.refresh_index()
+
+    # -------------------------------------------------
+    # Indexing
+    # -------------------------------------------------
+
+    def refresh_index(self) -> None:
+        """Brings the index up to date in a worker thread (only changed files are re-read)."""
+        if self._indexing:
+            return
+        self._indexing = True
+        self._set_status("Indexing…")
+        self.run_worker(self._refresh_index, thread=True, group="oracle-index")
+
+    def _refresh_index(self) -> None:
+        started = time.perf_counter()
+        try:
+            indexed, removed = self.index.refresh()
+        finally:
+            self._indexing = False
+        elapsed = time.perf_counter() - started
+        self.app.call_from_thread(self._index_refreshed, indexed, removed, elapsed)
+
+    def _index_refreshed(self, indexed: int, removed: int, elapsed: float) -> None:
+        query = self.query_one("#oracle-input", Input).value
+        if query and (indexed or removed):
+            self._search(query)  # Results may have changed
+        else:
+            self._set_status(f"{len(self.index)} files indexed ({indexed} updated, {removed} removed, {elapsed:.1f}s)")
+
+    def file_written(self, file_path: str) -> None:
+        """Re-indexes one file saved in the editor and re-runs the current query."""
+        if file_path.startswith("..") or os.path.splitext(file_path)[1] not in SEARCH_EXTENSIONS:
+            return
+        self.index.update_file(file_path)
+        query = self.query_one("#oracle-input", Input).value
+        if query:
+            self._search(query)
+
+    # -------------------------------------------------
+    # Searching
+    # -------------------------------------------------
+
+    def _set_status(self, status: str) -> None:
+        self.query_one("#oracle-status", Static).update(status)
+
+    def _search(self, query: str) -> None:
+        """Cancels the running search and starts streaming results for `query`."""
+        self._generation += 1
+        self._hits = []
+        self.query_one("#oracle-results", OptionList).clear_options()
+        if not query.strip():
+            self.workers.cancel_group(self, "oracle-search")
+            self._set_status(f"{len(self.index)} files indexed")
+            return
+        regex = len(query) > 1 and query.startswith("/") and query.endswith("/")
+        pattern = query[1:-1] if regex else query
+        try:
+            self.index.compile(pattern, regex)
+        except re.error as e:
+            self.workers.cancel_group(self, "oracle-search")
+            self._set_status(f"Invalid regex: {e}")
+            return
+        self._set_status("Searching…")
+        generation = self._generation
+        self.run_worker(
+            lambda: self._stream_hits(pattern, regex, generation),
+            thread=True, group="oracle-search", exclusive=True,
+        )
+
+    def _stream_hits(self, pattern: str, regex: bool, generation: int) -> None:
+        """Runs in a worker thread; stops as soon as a newer query cancels it."""
+        worker = get_current_worker()
+        batch = []
+        flushed_at = time.perf_counter()
+        for hit in self.index.search(pattern, regex, self.MAX_HITS):
+            if worker.is_cancelled:
+                return
+            batch.append(hit)
+            if time.perf_counter() - flushed_at >= self.BATCH_SECONDS:
+                self.app.call_from_thread(self._add_hits, generation, batch, False)
+                batch = []
+                flushed_at = time.perf_counter()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._add_hits, generation, batch, True)
+
+    def _add_hits(self, generation: int, hits: list, done: bool) -> None:
+        if generation != self._generation:
+            return  # From a search that has been replaced
+        self._hits.extend(hits)
+        results = self.query_one("#oracle-results", OptionList)
+        results.add_options(self._render_hit(hit) for hit in hits)
+        if results.highlighted is None and self._hits:
+            results.highlighted = 0
+        count = len(self._hits)
+        if not done:
+            self._set_status(f"Searching… {count} results")
+        elif count >= self.MAX_HITS:
+            self._set_status(f"First {count} results")
+        else:
+            self._set_status(f"{count} result{'s' if count != 1 else ''}")
+
+    def _render_hit(self, hit) -> Option:
+        location = f"{hit.path}:{hit.line_number} "
+        line = hit.line.lstrip()
+        indent = len(hit.line) - len(line)
+        label = Text()
+        label.append(location, style="dim")
+        label.append(line)
+        for start, end in hit.spans:
+            if end > indent:
+                label.stylize("bold yellow", len(location) + max(start - indent, 0), len(location) + end - indent)
+        return Option(label)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "oracle-input":
+            self._search(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Enter in the search box opens the highlighted (by default the first) hit."""
+        self._open_hit(self.query_one("#oracle-results", OptionList).highlighted)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.stop()
+        self._open_hit(event.option_index)
+
+    def _open_hit(self, index: int | None) -> None:
+        if index is not None and index < len(self._hits):
+            hit = self._hits[index]
+            self.post_message(self.ResultSelected(hit.path, hit.line_number))
@@ -1,5 +1,10 @@
+import asyncio
+import importlib
+
 from textual.app import ComposeResult
 from textual.containers import Vertical
+from textual.message import Message
+from textual.widget import Widget
 from textual.widgets import Static
 
 # -------------------------------------------------
@@ -14,3 +19,57 @@ class Panel(Vertical):
 
     def compose(self) -> ComposeResult:
         yield Static(f"{self.icon} {self.title}", classes="panel-title")
+
+
+# -------------------------------------------------
+# Lazily Loaded Panel Content
+# -------------------------------------------------
+
+class LazyContent(Vertical):
+    """
+    Stands in for a panel's content widget until `load()` is called.
+
+    The content's module is only imported (in a worker thread, so the UI stays
+    responsive) and the widget only constructed when the app asks for it,
+    typically once the first frame is on screen, so heavy panels and whatever
+    they import stay off the startup path. `kwargs` are passed to the content widget.
+    """
+
+    DEFAULT_CSS = """
+    LazyContent { height: 1fr; }
+    """
+
+    class Loaded(Message):
+        """Posted once the content widget is mounted."""
+        def __init__(self, lazy: "LazyContent", content: Widget) -> None:
+            super().__init__()
+            self.lazy = lazy
+            self.content = content
+
+        @property
+        def control(self) -> "LazyContent":
+            return self.lazy
+
+    def __init__(self, module_path: str, class_name: str, *, id: str | None = None, **kwargs):
+        super().__init__(id=id)
+        self.module_path = module_path
+        self.class_name = class_name
+        self.content_kwargs = kwargs
+        # Set once the content widget is mounted (its children composed), so
+        # callers can query it as soon as it is not None.
+        self.content: Widget | None = None
+        self._loading = False
+
+    def compose(self) -> ComposeResult:
+        yield Static("Loading…", classes="lazy-placeholder")
+
+    async def load(self) -> None:
+        if self.content is not None or self._loading:
+            return
+        self._loading = True
+        module = await asyncio.to_thread(importlib.import_module, self.module_path)
+        content = getattr(module, self.class_name)(**self.content_kwargs)
+        await self.query(".lazy-placeholder").remove()
+        await self.mount(content)
+        self.content = content
+        self.post_message(self.Loaded(self, content))
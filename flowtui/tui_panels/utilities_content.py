@@ -1,16 +1,31 @@
 import os
 import ast
-import json
+import inspect
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.widgets import Tree
 
+from flow_system.health import HealthMonitor, discover_components
+
 class UtilitiesContent(Vertical):
     """
     A panel that discovers and displays the status of core services and external providers.
-    It combines static analysis (.py files) with runtime analysis (manifest.json).
+    Live status comes from each component's `health_check()` probe, run concurrently
+    in the background; components without one show their STATUS attribute, and files
+    that cannot be imported fall back to static analysis.
     """
 
+    PROBE_INTERVAL_SECONDS = 10.0
+    PROBE_TIMEOUT_SECONDS = 2.0
+    STATUS_COLORS = {"ok": "green", "down": "red", "timeout": "yellow"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.monitor = HealthMonitor(timeout=self.PROBE_TIMEOUT_SECONDS)
+        # Probe name -> (tree node, display name), for in-place label updates.
+        self._probe_nodes: dict = {}
+        self._labels: dict[str, str] = {}
+
     def _parse_service_file(self, source_code: str) -> tuple[str, list[str]]:
         """
         Parses a service/provider file to find its fallback STATUS and public methods.
@@ -38,51 +53,87 @@ class UtilitiesContent(Vertical):
             return "⚠️ [red]Parse Error[/]", []
         return status, methods
 
-    def _build_tree(self, tree: Tree, root_path: str, manifest: dict, manifest_key: str):
+    def _describe_component(self, classes: list[type]) -> tuple[type | None, str, list[str]]:
+        """
+        Picks the component class of a module and returns (probe_class, static_status, methods).
+        probe_class is None when the component has no health_check().
+        """
+        cls = next((c for c in classes if hasattr(c, "health_check")), classes[0])
+        methods = [
+            f"- {name}" for name, _ in inspect.getmembers(cls, inspect.isfunction)
+            if not name.startswith("_") and name != "health_check"
+        ]
+        static_status = getattr(cls, "STATUS", "[gray]Unknown[/]")
+        return (cls if hasattr(cls, "health_check") else None), static_status, methods
+
+    def _label(self, service_name: str, status: str, color: str, latency_ms: float | None = None) -> str:
+        latency = f" [gray]({latency_ms:.0f} ms)[/]" if latency_ms is not None else ""
+        return f"🔌 [b white]{service_name.capitalize()}[/]: [{color}]{status}[/]{latency}"
+
+    def _build_tree(self, tree: Tree, root_path: str):
         """
-        Helper to scan a directory and populate a tree, using the manifest for status.
+        Helper to discover the components in a directory and populate a tree.
+        Components with a health_check() are registered with the monitor.
         """
         if not os.path.isdir(root_path):
             tree.root.add(f"⚠️ [red]Directory not found[/]")
             return
 
-        for filename in sorted(os.listdir(root_path)):
-            if filename.endswith(".py") and not filename.startswith("__"):
-                service_name = filename.replace(".py", "")
-                try:
-                    with open(os.path.join(root_path, filename), "r") as f:
-                        source = f.read()
-                    
-                    static_status, methods = self._parse_service_file(source)
-                    
-                    runtime_status = manifest.get(manifest_key, {}).get(service_name, {}).get("status")
-                    display_status = runtime_status or static_status
-                    
-                    color = "green" if display_status == "Connected" else "yellow"
-                    
-                    node = tree.root.add(f"🔌 [b white]{service_name.capitalize()}[/]: [{color}]{display_status}[/]")
-                    for method in methods:
-                        node.add(f"  [cyan]{method}[/]")
-                except Exception:
-                    tree.root.add(f"⚠️ [red]Error reading {filename}[/]")
+        for service_name, classes in discover_components(root_path).items():
+            try:
+                probe_cls = None
+                if classes:
+                    probe_cls, static_status, methods = self._describe_component(classes)
+                else:
+                    # Import failed: fall back to reading the source.
+                    with open(os.path.join(root_path, f"{service_name}.py"), "r") as f:
+                        static_status, methods = self._parse_service_file(f.read())
+
+                if probe_cls is not None:
+                    node = tree.root.add(self._label(service_name, "Probing...", "gray"))
+                    probe_name = f"{root_path}/{service_name}"
+                    self.monitor.register(probe_name, probe_cls().health_check)
+                    self._probe_nodes[probe_name] = (node, service_name)
+                else:
+                    node = tree.root.add(self._label(service_name, static_status, "yellow"))
+                for method in methods:
+                    node.add(f"  [cyan]{method}[/]")
+            except Exception:
+                tree.root.add(f"⚠️ [red]Error reading {service_name}.py[/]")
+
+    def on_mount(self) -> None:
+        """Start probing in the background; rendering never waits on a probe."""
+        self._schedule_probes()
+        self.set_interval(self.PROBE_INTERVAL_SECONDS, self._schedule_probes)
+
+    def _schedule_probes(self) -> None:
+        if self.monitor.probes:
+            self.run_worker(self._run_probes(), group="health-probes")
 
+    async def _run_probes(self) -> None:
+        results = await self.monitor.run_once()
+        for probe_name, result in results.items():
+            node, service_name = self._probe_nodes[probe_name]
+            color = self.STATUS_COLORS.get(result.status, "yellow")
+            label = self._label(service_name, result.detail, color, result.latency_ms)
+            # Only touch nodes whose text actually changed.
+            if self._labels.get(probe_name) != label:
+                self._labels[probe_name] = label
+                node.set_label(label)
 
     def compose(self) -> ComposeResult:
         BACKEND_PATH = "backend"
         services_path = os.path.join(BACKEND_PATH, "services")
         providers_path = os.path.join(BACKEND_PATH, "providers")
-        
-        # Manifest data is not available in this simplified version, so we pass empty dicts
-        manifest_data = {}
 
         # Core Services
         services_tree = Tree("🚀 Core Services")
         services_tree.root.expand()
-        self._build_tree(services_tree, services_path, manifest_data, "services")
+        self._build_tree(services_tree, services_path)
         yield services_tree
 
         # External Providers
         providers_tree = Tree("🛰️ External Providers")
         providers_tree.root.expand()
-        self._build_tree(providers_tree, providers_path, manifest_data, "providers")
+        self._build_tree(providers_tree, providers_path)
         yield providers_tree
\ No newline at end of file